@@ -0,0 +1,226 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.anim_pool`
+================================================================================
+
+Pool of animation TileGrids that flip digits borrow while they are flipping
+instead of each digit owning its own pair.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+try:
+    from typing import Optional, Tuple
+    from displayio import Bitmap, Palette
+except ImportError:
+    pass
+
+from displayio import TileGrid  # pylint: disable=ungrouped-imports
+
+
+class AnimationTileGridPool:
+    """
+    A fixed number of (top animation, bottom animation) TileGrid pairs shared by
+    several FlipDigits. A digit acquires a pair when its transition starts, the
+    pair is moved over the digit and it is released again once the transition
+    is complete. Free pairs are hidden.
+
+    All of the `tilegrids` must be appended to the Group that contains the digits,
+    after the digits so that they are drawn on top of the static sprites.
+
+    :param Bitmap top_anim_spritesheet: Spritesheet image of top half animation sprites.
+    :param Palette top_anim_palette: Palette to use with the top half animation sprites.
+    :param Bitmap bottom_anim_spritesheet: Spritesheet image of bottom half animation sprites.
+    :param Palette bottom_anim_palette: Palette to use with the bottom half animation sprites.
+    :param int tile_width: Width in pixels of the animation sprite tiles.
+    :param int tile_height: Height in pixels of the animation sprite tiles.
+    :param int size: Number of TileGrid pairs, which is the number of digits that
+      can flip at the same time. Default is 1.
+    :param int blank_tile: Index of a fully transparent animation sprite. If set,
+      acquired pairs are shown right away with it, otherwise the digit shows each
+      TileGrid when it needs it.
+    """
+
+    # pylint: disable=too-many-arguments
+
+    def __init__(
+        self,
+        top_anim_spritesheet: Bitmap,
+        top_anim_palette: Palette,
+        bottom_anim_spritesheet: Bitmap,
+        bottom_anim_palette: Palette,
+        tile_width: int,
+        tile_height: int,
+        size: int = 1,
+        blank_tile: Optional[int] = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Animation pool size must be at least 1")
+
+        self.size = size
+        self.tile_height = tile_height
+        self.blank_tile = blank_tile
+
+        tilegrids = []
+        self._free = []
+        for _ in range(size):
+            pair = []
+            for spritesheet, palette in (
+                (top_anim_spritesheet, top_anim_palette),
+                (bottom_anim_spritesheet, bottom_anim_palette),
+            ):
+                tilegrid = TileGrid(
+                    spritesheet,
+                    pixel_shader=palette,
+                    height=1,
+                    width=1,
+                    tile_width=tile_width,
+                    tile_height=tile_height,
+                    default_tile=blank_tile if blank_tile is not None else 0,
+                )
+                tilegrid.hidden = True
+                pair.append(tilegrid)
+                tilegrids.append(tilegrid)
+            self._free.append(tuple(pair))
+
+        # every TileGrid of the pool, for adding to the parent Group
+        self.tilegrids = tuple(tilegrids)
+        # (digit, new value) transitions waiting for a free pair, oldest first
+        self.waiting = []
+
+    @property
+    def available(self) -> int:
+        """
+        Number of TileGrid pairs that are not in use.
+        """
+        return len(self._free)
+
+    def rounds(self, count: int) -> int:
+        """
+        Number of flips one after another that changing several digits takes,
+        when every pair starts a waiting digit as soon as it is released.
+
+        :param int count: The number of digits that change
+        """
+        return -(-count // self.size)
+
+    def acquire(self, x: int, y: int) -> Optional[Tuple[TileGrid, TileGrid]]:
+        """
+        Take a free pair of animation TileGrids and move it over a digit.
+
+        :param int x: x position of the digit within the parent Group.
+        :param int y: y position of the top half of the digit within the parent Group.
+
+        :return: Tuple of (top animation, bottom animation) TileGrids, or None if
+          all of them are in use.
+        """
+        if not self._free:
+            return None
+
+        top_tilegrid, bottom_tilegrid = pair = self._free.pop()
+        top_tilegrid.x = x
+        top_tilegrid.y = y
+        bottom_tilegrid.x = x
+        bottom_tilegrid.y = y + self.tile_height
+
+        # the blank sprite is showing already
+        if self.blank_tile is not None:
+            top_tilegrid.hidden = False
+            bottom_tilegrid.hidden = False
+        return pair
+
+    def release(self, pair: Tuple[TileGrid, TileGrid]) -> None:
+        """
+        Hide a pair of animation TileGrids and return it to the pool.
+
+        :param tuple pair: The (top animation, bottom animation) TileGrids
+          returned by `acquire()`.
+        """
+        for tilegrid in pair:
+            tilegrid.hidden = True
+        self._free.append(pair)
+
+    def start_transition(self, digit: "FlipDigit", new_value: int, now: int) -> None:
+        """
+        Start the transition of a digit, or queue it until a pair is released
+        if the digit doesn't hold one already and none are free.
+
+        :param FlipDigit digit: The digit to change
+        :param int new_value: The new value for the digit
+        :param int now: The ``time.monotonic_ns()`` value that the transition starts at
+        """
+        if not digit.animating and not self._free:
+            self.waiting.append((digit, new_value))
+        else:
+            digit.start_transition(new_value, now)
+
+    def cancel(self, digit: "FlipDigit") -> None:
+        """
+        Drop the transitions that a digit is waiting to start, so a newer value
+        can replace them.
+
+        :param FlipDigit digit: The digit whose transitions are dropped
+        """
+        self.waiting[:] = [
+            waiting for waiting in self.waiting if waiting[0] is not digit
+        ]
+
+    def start_waiting(self, now: int) -> bool:
+        """
+        Start the waiting transitions that pairs have been released for, in the
+        order they were requested.
+
+        :param int now: The current ``time.monotonic_ns()`` value
+
+        :return: True if any transition was started
+        """
+        started = False
+        while self.waiting and self._free:
+            digit, new_value = self.waiting.pop(0)
+            digit.start_transition(new_value, now)
+            started = True
+        return started
+
+    def set_palettes(
+        self, top_anim_palette: Palette, bottom_anim_palette: Palette
+    ) -> None:
+        """
+        Switch every TileGrid of the pool to different palettes.
+
+        :param Palette top_anim_palette: Palette for the top half animation sprites.
+        :param Palette bottom_anim_palette: Palette for the bottom half animation sprites.
+        """
+        for index, tilegrid in enumerate(self.tilegrids):
+            tilegrid.pixel_shader = (
+                bottom_anim_palette if index % 2 else top_anim_palette
+            )
+
+    def set_bitmaps(
+        self,
+        top_anim_spritesheet: Optional[Bitmap] = None,
+        bottom_anim_spritesheet: Optional[Bitmap] = None,
+    ) -> None:
+        """
+        Switch every TileGrid of the pool to different spritesheets with the
+        same layout.
+
+        :param Bitmap top_anim_spritesheet: Spritesheet for the top half animation
+          sprites. None keeps the current one.
+        :param Bitmap bottom_anim_spritesheet: Spritesheet for the bottom half
+          animation sprites. None keeps the current one.
+        """
+        for index, tilegrid in enumerate(self.tilegrids):
+            spritesheet = bottom_anim_spritesheet if index % 2 else top_anim_spritesheet
+            if spritesheet is not None:
+                tilegrid.bitmap = spritesheet
@@ -0,0 +1,382 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.asset_registry`
+================================================================================
+
+Registry that loads each set of flip clock spritesheets once by name and hands
+the same Bitmap and Palette objects to every widget that asks for them. Sets that
+are no longer used are evicted, least recently used first, to stay within a
+memory budget.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* Adafruit's ImageLoad library, unless a custom loader is used:
+  https://github.com/adafruit/Adafruit_CircuitPython_ImageLoad
+"""
+
+import gc
+import sys
+
+try:
+    from typing import Callable, Optional, Sequence, Tuple, Union
+except ImportError:
+    pass
+
+from displayio import Bitmap, Palette
+from adafruit_displayio_flipclock.sprite_atlas import SpriteAtlas
+
+
+def _sheet_bytes(spritesheet: Bitmap, palette: Palette) -> int:
+    """
+    Estimate the heap used by a loaded spritesheet and its palette.
+    Bitmap rows are stored in whole 32 bit words.
+
+    :param Bitmap spritesheet: The spritesheet
+    :param Palette palette: Its palette
+    """
+    bits = getattr(spritesheet, "bits_per_value", None)
+    if bits is None:
+        # smallest power of two number of bits that holds every palette index
+        bits = 1
+        while 1 << bits < len(palette):
+            bits *= 2
+    row_bytes = (spritesheet.width * bits + 31) // 32 * 4
+    return row_bytes * spritesheet.height + len(palette) * 4
+
+
+class SpriteSet:
+    """
+    The spritesheets and palettes of one loaded set, with the transparent
+    indexes already applied. They are shared, so don't modify them except
+    through `FlipClock.set_colors()`.
+
+    `sheets` can be passed straight to `FlipClock`, `FlipDigit` or
+    `FlipClock.set_theme()`.
+
+    :param str name: The name the set was registered with.
+    :param tuple sheets: (static spritesheet, static palette, top animation spritesheet,
+      top animation palette, bottom animation spritesheet, bottom animation palette)
+    :param int tile_width: Width in pixels of the sprite tiles.
+    :param int tile_height: Height in pixels of the sprite tiles.
+    :param SpriteAtlas atlas: The atlas describing the sheets, if there is one.
+    """
+
+    # pylint: disable=too-many-instance-attributes, too-many-arguments
+
+    def __init__(
+        self,
+        name: str,
+        sheets: Tuple[Bitmap, Palette, Bitmap, Palette, Bitmap, Palette],
+        tile_width: int,
+        tile_height: int,
+        atlas: Optional[SpriteAtlas] = None,
+    ) -> None:
+        self.name = name
+        (
+            self.static_spritesheet,
+            self.static_spritesheet_palette,
+            self.top_anim_spritesheet,
+            self.top_anim_palette,
+            self.bottom_anim_spritesheet,
+            self.bottom_anim_palette,
+        ) = sheets
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.atlas = atlas
+
+        # estimated heap used by the set
+        self.size = sum(
+            _sheet_bytes(sheets[index], sheets[index + 1]) for index in (0, 2, 4)
+        )
+        # number of get() calls that have not been released yet
+        self.users = 0
+
+    @property
+    def sheets(self) -> Tuple[Bitmap, Palette, Bitmap, Palette, Bitmap, Palette]:
+        """
+        The spritesheets and palettes in the argument order of the widgets.
+        """
+        return (
+            self.static_spritesheet,
+            self.static_spritesheet_palette,
+            self.top_anim_spritesheet,
+            self.top_anim_palette,
+            self.bottom_anim_spritesheet,
+            self.bottom_anim_palette,
+        )
+
+
+class AssetRegistry:
+    """
+    Loads sets of spritesheets by name, once, and shares them. `get()` returns
+    the loaded `SpriteSet` and counts it as in use until `release()` is called.
+    Sets that are not in use stay loaded for the next `get()`, until they have
+    to be evicted to stay within ``memory_budget``.
+
+    :param int memory_budget: Maximum estimated bytes of loaded sets. The least
+      recently used sets that are not in use are evicted to stay under it. Sets
+      that are in use are never evicted, so it can be exceeded while they are.
+      Default is None, which never evicts.
+    :param loader: Function that loads a BMP file and returns a (Bitmap, Palette)
+      tuple. Default is ``adafruit_imageload.load()``.
+    """
+
+    def __init__(
+        self,
+        memory_budget: Optional[int] = None,
+        loader: Optional[Callable[[str], Tuple[Bitmap, Palette]]] = None,
+    ) -> None:
+        self.memory_budget = memory_budget
+        self._loader = loader
+
+        # how to load each set, keyed by name
+        self._registered = {}
+        # loaded sets, least recently used first
+        self._loaded = []
+        # size of every set that has been loaded before, to make room up front
+        self._sizes = {}
+
+    def register(
+        self,
+        name: str,
+        static_file: str,
+        top_anim_file: str,
+        bottom_anim_file: str,
+        tile_width: Optional[int] = None,
+        tile_height: Optional[int] = None,
+        atlas: Optional[SpriteAtlas] = None,
+        static_transparent_indexes: Sequence[int] = (0,),
+        top_transparent_indexes: Sequence[int] = (0,),
+        bottom_transparent_indexes: Sequence[int] = (0,),
+    ) -> None:
+        """
+        Describe a set of spritesheets so it can be loaded by name. Nothing
+        is loaded until the set is first used.
+
+        :param str name: The name to load the set with.
+        :param str static_file: Path of the static numbers spritesheet BMP.
+        :param str top_anim_file: Path of the top half animation spritesheet BMP.
+        :param str bottom_anim_file: Path of the bottom half animation spritesheet BMP.
+        :param int tile_width: Width in pixels of the sprite tiles. Taken from the
+          atlas if there is one, otherwise from the static spritesheet once it is
+          loaded, which has 3 columns of digits.
+        :param int tile_height: Height in pixels of the sprite tiles, half a digit.
+          Taken from the atlas if there is one, otherwise from the static spritesheet
+          once it is loaded, which has 4 rows of digits.
+        :param SpriteAtlas atlas: Optional description of the sheets. They are checked
+          against it and its transparent indexes are used.
+        :param Sequence[int] static_transparent_indexes: Palette indexes to make
+          transparent in the static palette when there is no atlas.
+        :param Sequence[int] top_transparent_indexes: Palette indexes to make
+          transparent in the top half animation palette when there is no atlas.
+        :param Sequence[int] bottom_transparent_indexes: Palette indexes to make
+          transparent in the bottom half animation palette when there is no atlas.
+        """
+        # pylint: disable=too-many-arguments
+        if atlas is not None:
+            tile_width = atlas.tile_width
+            tile_height = atlas.tile_height
+
+        self._registered[name] = (
+            (static_file, top_anim_file, bottom_anim_file),
+            tile_width,
+            tile_height,
+            atlas,
+            (
+                tuple(static_transparent_indexes),
+                tuple(top_transparent_indexes),
+                tuple(bottom_transparent_indexes),
+            ),
+        )
+
+    def register_atlas(self, name: str, atlas_file: str) -> None:
+        """
+        Register the set of spritesheets described by a sprite atlas JSON file
+        written by the spritesheet generator. The sheet files are looked up in
+        the same directory as the atlas file.
+
+        :param str name: The name to load the set with.
+        :param str atlas_file: Path of the sprite atlas JSON file.
+        """
+        atlas = SpriteAtlas.from_file(atlas_file)
+        if not all(sheet in atlas.files for sheet in ("static", "top", "bottom")):
+            raise ValueError("The sprite atlas doesn't list the spritesheet files")
+
+        directory = atlas_file[: atlas_file.rfind("/") + 1]
+        self.register(
+            name,
+            directory + atlas.files["static"],
+            directory + atlas.files["top"],
+            directory + atlas.files["bottom"],
+            atlas=atlas,
+        )
+
+    @property
+    def memory_used(self) -> int:
+        """
+        Estimated bytes used by all of the loaded sets.
+        """
+        return sum(sprite_set.size for sprite_set in self._loaded)
+
+    def loaded(self, name: str) -> bool:
+        """
+        Whether a set is loaded right now.
+
+        :param str name: The name of the set
+        """
+        for sprite_set in self._loaded:
+            if sprite_set.name == name:
+                return True
+        return False
+
+    def get(self, name: str) -> SpriteSet:
+        """
+        Get a set of spritesheets, loading it if it isn't loaded yet. It counts as
+        in use, and is never evicted, until `release()` is called for it.
+
+        :param str name: The name the set was registered with.
+
+        :return: The shared SpriteSet
+        """
+        for sprite_set in self._loaded:
+            if sprite_set.name == name:
+                # most recently used is kept at the end
+                self._loaded.remove(sprite_set)
+                self._loaded.append(sprite_set)
+                sprite_set.users += 1
+                return sprite_set
+
+        if name not in self._registered:
+            raise ValueError(f"No sprite set is registered as {name}")
+
+        # make room before loading if the size is known from an earlier load
+        self._evict(self._sizes.get(name, 0))
+
+        sprite_set = self._load(name)
+        sprite_set.users = 1
+        self._sizes[name] = sprite_set.size
+        self._loaded.append(sprite_set)
+
+        # the size wasn't known before the first load
+        self._evict(0)
+        return sprite_set
+
+    def release(self, sprite_set: Union[SpriteSet, str]) -> None:
+        """
+        Stop using a set that was returned by `get()`, for example after
+        switching to another theme. Once no user is left it can be evicted.
+
+        :param sprite_set: The SpriteSet or its name.
+        """
+        name = sprite_set if isinstance(sprite_set, str) else sprite_set.name
+        for loaded_set in self._loaded:
+            if loaded_set.name == name:
+                if loaded_set.users > 0:
+                    loaded_set.users -= 1
+                break
+        self._evict(0)
+
+    def clear(self) -> None:
+        """
+        Evict every loaded set that is not in use.
+        """
+        self._evict(None)
+
+    def _load(self, name: str) -> SpriteSet:
+        """
+        Load the spritesheets of a registered set and apply its transparent indexes.
+
+        :param str name: The name the set was registered with.
+        """
+        files, tile_width, tile_height, atlas, transparent_indexes = self._registered[
+            name
+        ]
+
+        sheets = []
+        for filename in files:
+            sheets.extend(self._load_file(filename))
+        static_palette, top_palette, bottom_palette = sheets[1], sheets[3], sheets[5]
+
+        # the static sheet has 3 columns and 4 rows of whole digits
+        if tile_width is None:
+            tile_width = sheets[0].width // 3
+        if tile_height is None:
+            tile_height = (sheets[0].height // 4) // 2
+
+        if atlas is not None:
+            atlas.validate(sheets[0], sheets[2], sheets[4])
+            atlas.apply_transparency(static_palette, top_palette, bottom_palette)
+        else:
+            for palette, indexes in zip(
+                (static_palette, top_palette, bottom_palette), transparent_indexes
+            ):
+                for index in indexes:
+                    palette.make_transparent(index)
+
+        return SpriteSet(name, tuple(sheets), tile_width, tile_height, atlas)
+
+    def _load_file(self, filename: str) -> Tuple[Bitmap, Palette]:
+        """
+        Load one BMP file with the loader.
+
+        :param str filename: Path of the file
+        """
+        if self._loader is not None:
+            return self._loader(filename)
+
+        # pylint: disable=import-outside-toplevel
+        import adafruit_imageload
+
+        return adafruit_imageload.load(filename, bitmap=Bitmap, palette=Palette)
+
+    def _evict(self, needed: Optional[int]) -> None:
+        """
+        Evict the least recently used sets that are not in use until ``needed``
+        more bytes fit in the memory budget. None evicts all of them.
+
+        :param int needed: The number of bytes to make room for
+        """
+        if needed is not None and self.memory_budget is None:
+            return
+
+        evicted = False
+        index = 0
+        while index < len(self._loaded):
+            if needed is not None and self.memory_used + needed <= self.memory_budget:
+                break
+            sprite_set = self._loaded[index]
+            if sprite_set.users:
+                index += 1
+                continue
+
+            del self._loaded[index]
+            self._release_faded_palettes(sprite_set)
+            evicted = True
+
+        if evicted:
+            gc.collect()
+
+    @staticmethod
+    def _release_faded_palettes(sprite_set: SpriteSet) -> None:
+        """
+        Drop the cached faded palettes of an evicted set, if fading was used
+        and no widget still holds them.
+
+        :param SpriteSet sprite_set: The evicted set
+        """
+        # the palette cache is only loaded when a widget used dynamic fading
+        palette_cache = sys.modules.get("adafruit_displayio_flipclock.palette_cache")
+        if palette_cache is not None:
+            for palette in sprite_set.sheets[1::2]:
+                palette_cache.discard_palette(palette)
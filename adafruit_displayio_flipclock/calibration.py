@@ -0,0 +1,184 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.calibration`
+================================================================================
+
+Frame cost measurements for `FlipClock.calibrate()`, and the animation timing
+that fits a flip into a target duration.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+try:
+    from typing import Optional, Sequence, Tuple
+    from busdisplay import BusDisplay
+    from displayio import Group
+    from adafruit_displayio_flipclock.flip_digit import FlipDigit
+    from adafruit_displayio_flipclock.frame_adapter import FrameAdapter
+except ImportError:
+    pass
+
+import time
+from adafruit_displayio_flipclock.display_refresh import DisplayRefresher
+
+
+def time_frames(
+    digits: Sequence["FlipDigit"],
+    display: Optional["BusDisplay"] = None,
+    hide: Optional["Group"] = None,
+) -> Tuple[int, int]:
+    """
+    Play one flip on each digit, to the value it already shows, and time the
+    tile writes and display refreshes of every frame. Every frame is played
+    whatever the frame stride of the digits is.
+
+    :param Sequence[FlipDigit] digits: The digits to flip together
+    :param BusDisplay display: Optional display to refresh once per frame. Without
+      one only the tile writes are timed.
+    :param Group hide: Optional Group holding the digits, hidden while the frames
+      are played so the flips are not seen. The refresh time is then that of
+      redrawing the Group once it is shown again, more than a single frame needs.
+
+    :return: Tuple of the average (write time, refresh time) of a frame in nanoseconds
+    """
+    refresher = DisplayRefresher(display) if display is not None else None
+    if refresher is not None:
+        refresher.begin()
+    if hide is not None:
+        hide.hidden = True
+        # clear the hidden area before timing anything
+        _timed_refresh(refresher)
+
+    write_time = 0
+    refresh_time = 0
+    frames = 0
+    now = time.monotonic_ns()
+    for digit in digits:
+        digit.start_transition(digit.value, now)
+    while True:
+        frame_start = time.monotonic_ns()
+        animating = False
+        for digit in digits:
+            if digit.advance():
+                animating = True
+        # the last call only finishes the transitions
+        if not animating:
+            break
+        write_time += time.monotonic_ns() - frame_start
+        if hide is None:
+            refresh_time += _timed_refresh(refresher)
+        frames += 1
+
+    for digit in digits:
+        digit.needs_refresh = False
+    if hide is not None:
+        hide.hidden = False
+        refresh_time = _timed_refresh(refresher) * frames
+    if refresher is not None:
+        refresher.end()
+    return write_time // frames, refresh_time // frames
+
+
+def _timed_refresh(refresher: Optional[DisplayRefresher]) -> int:
+    """
+    Refresh the display and measure how long it took.
+
+    :param DisplayRefresher refresher: The refresher of the display, or None to skip
+
+    :return: The time taken in nanoseconds, 0 without a display
+    """
+    if refresher is None:
+        return 0
+    refresh_start = time.monotonic_ns()
+    refresher.refresh()
+    return time.monotonic_ns() - refresh_start
+
+
+def fitting_frame_stride(anim_frame_count: int, frame_time: int, target: int) -> int:
+    """
+    The smallest frame stride whose frames all fit in a flip of the target
+    duration. Each half always shows its last frame.
+
+    :param int anim_frame_count: The number of frames in each animation half
+    :param int frame_time: Time in nanoseconds that one frame takes
+    :param int target: Duration of the whole flip in nanoseconds
+
+    :return: The frame stride, ``anim_frame_count`` if even that doesn't fit
+    """
+    for frame_stride in range(1, anim_frame_count + 1):
+        steps = 2 * ((anim_frame_count + frame_stride - 1) // frame_stride)
+        if steps * frame_time <= target:
+            return frame_stride
+    return anim_frame_count
+
+
+def calibrate_digits(
+    digits: Sequence["FlipDigit"],
+    measured: Sequence["FlipDigit"],
+    display: Optional["BusDisplay"],
+    target_flip_duration: float,
+    frame_adapter: Optional["FrameAdapter"] = None,
+    hide: Optional["Group"] = None,
+) -> dict:
+    """
+    Time the frames of some digits with `time_frames()` and set the animation
+    timing of all of them to fit flips into ``target_flip_duration``.
+
+    :param Sequence[FlipDigit] digits: The digits whose timing is set
+    :param Sequence[FlipDigit] measured: The digits that are flipped and timed
+    :param BusDisplay display: Optional display to refresh once per frame
+    :param float target_flip_duration: Total time in seconds that a flip should take
+    :param FrameAdapter frame_adapter: Optional adapter shared by the digits. It is
+      reset and starts out from the measured frame time.
+    :param Group hide: Optional Group to hide while the frames are timed, see
+      `time_frames()`.
+
+    :return: A dict with ``write_time``, ``refresh_time`` and ``frame_time`` in
+      seconds per frame, and the chosen ``anim_delay``, ``frame_stride`` and
+      ``flip_duration``.
+    """
+    # pylint: disable=too-many-arguments
+    anim_frame_count = digits[0].anim_frame_count
+
+    # time every frame, not a plan based on earlier measurements
+    if frame_adapter is not None:
+        frame_adapter.reset()
+        frame_adapter.min_stride = 1
+    for digit in measured:
+        digit.frame_stride = 1
+    write_time, refresh_time = time_frames(measured, display, hide)
+
+    frame_time = write_time + refresh_time
+    frame_stride = fitting_frame_stride(
+        anim_frame_count, frame_time, int(target_flip_duration * 1_000_000_000)
+    )
+
+    anim_delay = target_flip_duration / (anim_frame_count * 2)
+    for digit in digits:
+        digit.anim_delay = anim_delay
+        digit.flip_duration = target_flip_duration
+        digit.frame_stride = frame_stride
+    if frame_adapter is not None:
+        frame_adapter.reset()
+        frame_adapter.min_stride = frame_stride
+        frame_adapter.note_frame(frame_time)
+
+    return {
+        "write_time": write_time / 1_000_000_000,
+        "refresh_time": refresh_time / 1_000_000_000,
+        "frame_time": frame_time / 1_000_000_000,
+        "anim_delay": anim_delay,
+        "frame_stride": frame_stride,
+        "flip_duration": target_flip_duration,
+    }
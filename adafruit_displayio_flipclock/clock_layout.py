@@ -0,0 +1,319 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.clock_layout`
+================================================================================
+
+Layout strings of a `FlipClock`, and the sprites that the separators between
+its groups of digits are drawn with.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+try:
+    from typing import Optional, Tuple, Union
+    from displayio import Group
+except ImportError:
+    pass
+
+from displayio import Bitmap, Palette, TileGrid  # pylint: disable=ungrouped-imports
+
+# Gap in pixels that the colon will be shown in between the two pairs
+COLON_SPACE = 12
+
+# Radius in pixels of the colon dots
+COLON_RADIUS = 4
+
+# Layout characters that are drawn as separators instead of digits
+SEPARATORS = ":. "
+
+# separator sprite bitmaps keyed by digit height
+_separator_bitmaps = {}
+
+
+def _draw_dot(bitmap: Bitmap, center_x: int, center_y: int) -> None:
+    """
+    Draw one separator dot of ``COLON_RADIUS`` into a sprite bitmap with index 0.
+
+    :param Bitmap bitmap: The bitmap to draw into
+    :param int center_x: x position of the center of the dot
+    :param int center_y: y position of the center of the dot
+    """
+    for offset_y in range(-COLON_RADIUS, COLON_RADIUS + 1):
+        for offset_x in range(-COLON_RADIUS, COLON_RADIUS + 1):
+            if offset_x * offset_x + offset_y * offset_y <= COLON_RADIUS * COLON_RADIUS:
+                bitmap[center_x + offset_x, center_y + offset_y] = 0
+
+
+def separator_bitmap(height: int) -> Bitmap:
+    """
+    Get the shared sprite bitmap that separators are drawn with. Tile 0 is
+    a colon and tile 1 a dot, each ``COLON_SPACE`` wide. Index 0 is the dots
+    and index 1 the background. The dots are drawn into it once instead of
+    being rasterised on every display refresh.
+
+    :param int height: Height in pixels of a full digit
+
+    :return: The shared 1 bit Bitmap
+    """
+    bitmap = _separator_bitmaps.get(height)
+    if bitmap is None:
+        bitmap = Bitmap(COLON_SPACE * 2, height, 2)
+        bitmap.fill(1)
+        top_dot_y = height // 2 * 2 // 3
+        center_x = COLON_SPACE // 2
+        # the colon has both dots, the dot only the bottom one
+        for tile, dot_ys in ((0, (top_dot_y, top_dot_y * 2)), (1, (top_dot_y * 2,))):
+            for dot_y in dot_ys:
+                _draw_dot(bitmap, tile * COLON_SPACE + center_x, dot_y)
+        _separator_bitmaps[height] = bitmap
+    return bitmap
+
+
+def parse_layout(layout: str) -> Tuple[Tuple[int, ...], Tuple[Tuple[int, str], ...]]:
+    """
+    Split a layout string such as ``"HH:MM:SS"`` or ``"DD.MM HH:MM"`` into groups
+    of digits and separators. Every character other than ``:``, ``.`` and space
+    is a digit, consecutive digits form a group. ``:`` is drawn as a colon, ``.``
+    as a dot and a space is left empty. Every separator is ``COLON_SPACE`` wide.
+
+    :param str layout: The layout string
+
+    :return: Tuple of (number of digits in each group, (position, character) of each
+      separator). The position is the number of digits before the separator.
+    """
+    groups = []
+    separators = []
+    digit_count = 0
+    group_size = 0
+    for char in layout:
+        if char in SEPARATORS:
+            if group_size:
+                groups.append(group_size)
+                group_size = 0
+            separators.append((digit_count, char))
+        else:
+            group_size += 1
+            digit_count += 1
+    if group_size:
+        groups.append(group_size)
+
+    if not groups:
+        raise ValueError("layout must contain at least one digit")
+    return tuple(groups), tuple(separators)
+
+
+def layout_positions(
+    group_sizes: Tuple[int, ...],
+    separators: Tuple[Tuple[int, str], ...],
+    x: int,
+    tile_width: int,
+) -> Tuple[list, list]:
+    """
+    The x position of each digit and separator of a layout. Each separator
+    moves the digits after it over by ``COLON_SPACE``.
+
+    :param tuple group_sizes: Number of digits in each group
+    :param tuple separators: (position, character) of each separator
+    :param int x: x position of the first digit or separator
+    :param int tile_width: Width in pixels of a digit
+
+    :return: Tuple of (digit x positions, (x, character) of each separator)
+    """
+    digit_count = sum(group_sizes)
+    digit_x = []
+    separator_x = []
+    separator_index = 0
+    for i in range(digit_count + 1):
+        while separator_index < len(separators) and separators[separator_index][0] == i:
+            separator_x.append((x, separators[separator_index][1]))
+            separator_index += 1
+            x += COLON_SPACE
+        if i < digit_count:
+            digit_x.append(x)
+            x += tile_width
+    return digit_x, separator_x
+
+
+def group_digits(new_value: Union[str, int], size: int, limit: int) -> list:
+    """
+    Split a new value for a group of digits into the value of each digit.
+    Integers are split with ``divmod()`` and don't allocate any strings.
+
+    :param new_value: A non-negative int below ``limit``, or a str of up to one
+      character per digit, zero padded on the left
+    :param int size: The number of digits in the group
+    :param int limit: The number of values the group can show, ``10 ** size``
+    """
+    if isinstance(new_value, int):
+        if not 0 <= new_value < limit:
+            raise ValueError(f"Group value must be int 0-{limit - 1}")
+        digits = [0] * size
+        for position in range(size - 1, -1, -1):
+            new_value, digits[position] = divmod(new_value, 10)
+        return digits
+
+    # validate type and length
+    if not isinstance(new_value, str) or not 1 <= len(new_value) <= size:
+        raise ValueError(f"Group value must be str with length {size}")
+
+    # zero pad on the left
+    return [int(char) for char in "0" * (size - len(new_value)) + new_value]
+
+
+def validate_values(values: tuple, group_limits: Tuple[int, ...]) -> None:
+    """
+    Check that there is a valid integer value for every group of digits.
+
+    :param tuple values: The new value of each group of digits
+    :param tuple group_limits: The number of values each group can show
+    """
+    if len(values) != len(group_limits):
+        raise ValueError(f"Expected {len(group_limits)} values for the layout")
+    for new_value, limit in zip(values, group_limits):
+        if not isinstance(new_value, int) or not 0 <= new_value < limit:
+            raise ValueError(f"Group value must be int 0-{limit - 1}")
+
+
+def changed_digits(groups: tuple, values: tuple) -> int:
+    """
+    Count the digits that integer values for every group would change.
+
+    :param tuple groups: The digits of each group, see `group_digits()`
+    :param tuple values: The new value of each group of digits, already validated
+    """
+    count = 0
+    for group, new_value in zip(groups, values):
+        for position in range(len(group) - 1, -1, -1):
+            new_value, digit_value = divmod(new_value, 10)
+            if group[position].value != digit_value:
+                count += 1
+    return count
+
+
+class ClockSeparators:
+    """
+    The separators between the groups of digits of a `FlipClock`. They are
+    tiles of one small sprite bitmap that share a single colon palette, so
+    showing, hiding and blinking them is a single palette write.
+
+    :param Group group: The Group to add the separator TileGrids to
+    :param list separator_x: (x, character) of each separator, see `layout_positions()`
+    :param int height: Height in pixels of a full digit
+    :param int y: y position of the separators
+    :param Palette colon_palette: Optional Palette shared with other clocks. It is
+      left to its owner, only blinking makes index 0 transparent and opaque.
+    :param int colon_color: Hex color value for a colon palette of our own
+    :param Bitmap colon_spritesheet: Optional sprites to draw the separators with.
+      Default is drawn by `separator_bitmap()`.
+    """
+
+    # pylint: disable=too-many-arguments
+
+    def __init__(
+        self,
+        group: Group,
+        separator_x: list,
+        height: int,
+        y: int,
+        colon_palette: Optional[Palette] = None,
+        colon_color: int = 0xFFFFFF,
+        colon_spritesheet: Optional[Bitmap] = None,
+    ) -> None:
+        # set colon color, index 1 is the background of the separator sprites
+        if colon_palette is None:
+            colon_palette = Palette(2)
+            colon_palette[0] = colon_color
+            colon_palette.make_transparent(1)
+        elif len(colon_palette) < 2:
+            raise ValueError("colon_palette needs the color at index 0 and index 1")
+        self.palette = colon_palette
+
+        # separators are tiles of one small shared sprite bitmap
+        if colon_spritesheet is None:
+            colon_spritesheet = separator_bitmap(height)
+        elif (colon_spritesheet.width, colon_spritesheet.height) != (
+            COLON_SPACE * 2,
+            height,
+        ):
+            raise ValueError(f"colon_spritesheet must be {COLON_SPACE * 2}x{height}")
+        tilegrids = []
+        for x, char in separator_x:
+            # a space is left empty
+            if char in ":.":
+                tilegrid = TileGrid(
+                    colon_spritesheet,
+                    pixel_shader=colon_palette,
+                    tile_width=COLON_SPACE,
+                    tile_height=height,
+                    default_tile=0 if char == ":" else 1,
+                    x=x,
+                    y=y,
+                )
+                group.append(tilegrid)
+                tilegrids.append(tilegrid)
+        self.tilegrids = tuple(tilegrids)
+
+        # blink period in nanoseconds, None if they don't blink
+        self._blink_ns = None
+
+    @property
+    def visible(self) -> bool:
+        """
+        Whether the separators are showing. Changing it only makes the color
+        index of the colon palette transparent or opaque, so blinking the colon,
+        for example as a seconds indicator, is a single palette write.
+        """
+        return not self.palette.is_transparent(0)
+
+    @visible.setter
+    def visible(self, visible: bool) -> None:
+        if visible:
+            self.palette.make_opaque(0)
+        else:
+            self.palette.make_transparent(0)
+
+    @property
+    def blink(self) -> Optional[float]:
+        """
+        Blink period of the separators in seconds, None if they don't blink.
+        The separators are shown for the first half of every period.
+        """
+        if self._blink_ns is None:
+            return None
+        return self._blink_ns / 1_000_000_000
+
+    @blink.setter
+    def blink(self, period: Optional[float]) -> None:
+        if period is None:
+            # show the separators again only if blinking may have hidden them,
+            # a colon palette passed in is otherwise left as it was
+            if self._blink_ns is not None:
+                self.visible = True
+            self._blink_ns = None
+            return
+        if period <= 0:
+            raise ValueError("colon_blink must be greater than 0")
+        self._blink_ns = int(period * 1_000_000_000)
+
+    def update(self, now: int) -> None:
+        """
+        Show or hide the separators for the current part of the blink period.
+        The palette is only written when the blink state changes.
+
+        :param int now: The current ``time.monotonic_ns()`` value
+        """
+        if self._blink_ns is not None:
+            visible = now % self._blink_ns < self._blink_ns // 2
+            if visible != self.visible:
+                self.visible = visible
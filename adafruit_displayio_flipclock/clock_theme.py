@@ -0,0 +1,448 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.clock_theme`
+================================================================================
+
+Palettes and spritesheets of a FlipClock. Creates the faded and dimmed palette
+sets, applies them to the TileGrids of the clock and swaps them for new themes,
+colors and brightness levels.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+try:
+    from typing import Optional, Sequence, Tuple
+    from displayio import Bitmap, Palette
+    from adafruit_displayio_flipclock.sprite_atlas import SpriteAtlas
+except ImportError:
+    pass
+
+import gc
+
+
+class ClockTheme:
+    """
+    The look of a `FlipClock`: the palette sets of its brightness levels and the
+    colon color. `FlipClock.set_brightness()`, `FlipClock.set_theme()` and
+    `FlipClock.set_colors()` are done by it. The spritesheets and palettes in use,
+    the fading levels and the brightness are kept on the clock.
+
+    The source palettes are held in the palette cache while the clock fades them,
+    so their faded palettes are only released once no other widget uses them.
+
+    :param FlipClock clock: The clock whose TileGrids are themed. Its spritesheets,
+      palettes and fading settings must be set.
+    :param int colon_color: Hex color value of the colon, None if the clock was
+      given a shared ``colon_palette`` that is left to its owner.
+    :param Sequence[float] brightness_levels: Overall brightness levels whose
+      palette sets are created up front.
+    """
+
+    def __init__(
+        self,
+        clock: "FlipClock",
+        colon_color: Optional[int] = None,
+        brightness_levels: Optional[Sequence[float]] = None,
+    ) -> None:
+        self._clock = clock
+        self.colon_color = colon_color
+
+        # TileGrids that the clock owns instead of its digits, set once created
+        self.group_tilegrids = None
+        self.anim_pool = None
+
+        # palette sets for set_brightness(), created up front
+        self._brightness_sets = {}
+        # (level, palettes) sets created when first needed, most recently used last
+        self._brightness_cache = []
+
+        # only palettes that are faded through the cache need to be held
+        self._holding = clock.dynamic_fading or bool(brightness_levels)
+        if self._holding:
+            # pylint: disable=import-outside-toplevel
+            from adafruit_displayio_flipclock.palette_cache import retain_palette
+
+            for palette in self.source_palettes:
+                retain_palette(palette)
+
+        if brightness_levels:
+            for level in (1.0, *brightness_levels):
+                self._brightness_sets[level] = self._make_brightness_palettes(level)
+
+    @property
+    def source_palettes(self) -> Tuple[Palette, Palette, Palette]:
+        """
+        The (static, top animation, bottom animation) palettes of the clock.
+        """
+        clock = self._clock
+        return (
+            clock.static_spritesheet_palette,
+            clock.top_anim_palette,
+            clock.bottom_anim_palette,
+        )
+
+    def layer_palettes(self) -> Tuple[Palette, Palette, Palette]:
+        """
+        Palettes for the static, top animation and bottom animation layers of
+        TileGrids that the clock creates itself instead of its digits.
+
+        :return: Tuple of (static, top animation, bottom animation) palettes
+        """
+        clock = self._clock
+        if not clock.dynamic_fading:
+            return self.source_palettes
+
+        # pylint: disable=import-outside-toplevel
+        from adafruit_displayio_flipclock.palette_cache import digit_palettes
+
+        static_palette, _, top_palette, bottom_palette = digit_palettes(
+            *self.source_palettes,
+            clock.brighter_level,
+            clock.darker_level,
+            clock.medium_level,
+        )
+        return static_palette, top_palette, bottom_palette
+
+    def _make_brightness_palettes(self, level: float, cached: bool = True) -> tuple:
+        """
+        Create the set of digit palettes for an overall brightness level.
+
+        :param float level: The brightness level
+        :param bool cached: Whether to share the palettes through the palette cache
+        """
+        # pylint: disable=import-outside-toplevel
+        from adafruit_displayio_flipclock.palette_cache import brightness_palettes
+
+        clock = self._clock
+        return brightness_palettes(
+            *self.source_palettes,
+            clock.brighter_level,
+            clock.darker_level,
+            clock.medium_level,
+            level,
+            dynamic_fading=clock.dynamic_fading,
+            frame_count=clock.anim_frame_count,
+            shading_steps=clock.shading_steps,
+            cached=cached,
+        )
+
+    def brightness_palettes(self, level: float) -> tuple:
+        """
+        Get the set of digit palettes for an overall brightness level from the
+        precomputed sets or the LRU cache, creating it if allowed.
+
+        :param float level: The brightness level
+        """
+        palettes = self._brightness_sets.get(level)
+        if palettes is not None:
+            return palettes
+
+        # full brightness uses the palettes the digits were created with
+        if level == 1.0:
+            palettes = self._make_brightness_palettes(level)
+            self._brightness_sets[level] = palettes
+            return palettes
+
+        for entry in self._brightness_cache:
+            if entry[0] == level:
+                # most recently used is kept at the end
+                self._brightness_cache.remove(entry)
+                self._brightness_cache.append(entry)
+                return entry[1]
+
+        cache_size = self._clock.brightness_cache_size
+        if cache_size < 1:
+            raise ValueError(
+                f"Brightness level {level} was not in brightness_levels "
+                "and brightness_cache_size is 0"
+            )
+        if not 0.0 <= level <= 1.0:
+            raise ValueError("Brightness level must be in the range 0.0 - 1.0")
+
+        # drop the least recently used sets to make room
+        while len(self._brightness_cache) >= cache_size:
+            self._brightness_cache.pop(0)
+        gc.collect()
+
+        palettes = self._make_brightness_palettes(level, cached=False)
+        self._brightness_cache.append((level, palettes))
+        return palettes
+
+    def set_brightness(self, level: float) -> None:
+        """
+        Switch every TileGrid of the clock to the palette set for an overall
+        brightness level and dim the colon color to it.
+
+        :param float level: Overall brightness, 1.0 for full brightness.
+        """
+        self.set_palettes(self.brightness_palettes(level))
+        self._clock.brightness = level
+        if self.colon_color is not None:
+            self.set_colon_color(self.colon_color)
+
+    def set_palettes(self, palettes: tuple) -> None:
+        """
+        Switch the digits and the TileGrids that the clock owns instead of its
+        digits to a set of digit palettes.
+
+        :param tuple palettes: The palettes, as returned by `brightness_palettes()`
+        """
+        clock = self._clock
+        static_palette, _, top_palette, bottom_palette, _, _ = palettes
+
+        for digit in clock.digits:
+            digit.set_palettes(*palettes)
+        if self.group_tilegrids is not None:
+            for tilegrids in self.group_tilegrids:
+                tilegrids[0].pixel_shader = static_palette
+                tilegrids[1].pixel_shader = static_palette
+                tilegrids[2].pixel_shader = top_palette
+                tilegrids[3].pixel_shader = bottom_palette
+        if self.anim_pool is not None:
+            self.anim_pool.set_palettes(top_palette, bottom_palette)
+
+    def set_bitmaps(
+        self,
+        static_spritesheet: Optional[Bitmap] = None,
+        top_anim_spritesheet: Optional[Bitmap] = None,
+        bottom_anim_spritesheet: Optional[Bitmap] = None,
+    ) -> None:
+        """
+        Switch the digits and the TileGrids that the clock owns instead of its
+        digits to different spritesheets with the same layout.
+
+        :param Bitmap static_spritesheet: Spritesheet for the static sprites.
+        :param Bitmap top_anim_spritesheet: Spritesheet for the top half animation sprites.
+        :param Bitmap bottom_anim_spritesheet: Spritesheet for the bottom half
+          animation sprites.
+
+        Any argument that is None keeps the current spritesheet.
+        """
+        clock = self._clock
+        spritesheets = (
+            static_spritesheet,
+            static_spritesheet,
+            top_anim_spritesheet,
+            bottom_anim_spritesheet,
+        )
+        for digit in clock.digits:
+            digit.set_bitmaps(*spritesheets[1:])
+        if self.group_tilegrids is not None:
+            for tilegrids in self.group_tilegrids:
+                for tilegrid, spritesheet in zip(tilegrids, spritesheets):
+                    if spritesheet is not None:
+                        tilegrid.bitmap = spritesheet
+        if self.anim_pool is not None:
+            self.anim_pool.set_bitmaps(top_anim_spritesheet, bottom_anim_spritesheet)
+
+        for name, spritesheet in zip(
+            ("static_spritesheet", "top_anim_spritesheet", "bottom_anim_spritesheet"),
+            spritesheets[1:],
+        ):
+            if spritesheet is not None:
+                setattr(clock, name, spritesheet)
+
+    def set_theme(
+        self,
+        spritesheets: Tuple[Optional[Bitmap], ...],
+        palettes: Tuple[Optional[Palette], ...],
+        atlas: Optional[SpriteAtlas] = None,
+        colon_color: Optional[int] = None,
+    ) -> None:
+        """
+        Switch the clock to different spritesheets and palettes, see
+        `FlipClock.set_theme()`. Everything is checked before anything changes.
+
+        :param tuple spritesheets: The new (static, top animation, bottom animation)
+          spritesheets.
+        :param tuple palettes: The new (static, top animation, bottom animation)
+          palettes.
+        :param SpriteAtlas atlas: Optional description of the new spritesheets.
+        :param int colon_color: New hex color value for the colon.
+
+        Any spritesheet, palette or color that is None keeps the current one.
+        """
+        self._check_spritesheets(spritesheets, atlas)
+        self.set_bitmaps(*spritesheets)
+        if colon_color is not None:
+            self.set_colon_color(colon_color)
+
+        old_palettes = self.source_palettes
+        new_palettes = tuple(
+            old if new is None else new for old, new in zip(old_palettes, palettes)
+        )
+        if new_palettes == old_palettes:
+            return
+
+        clock = self._clock
+        (
+            clock.static_spritesheet_palette,
+            clock.top_anim_palette,
+            clock.bottom_anim_palette,
+        ) = new_palettes
+
+        # use the faded palettes baked by the spritesheet generator
+        if clock.dynamic_fading and atlas is not None:
+            atlas.load_baked_palettes(*new_palettes)
+
+        # recreate the palette sets of the brightness levels for the new palettes
+        levels = tuple(self._brightness_sets)
+        self._brightness_sets = {}
+        self._brightness_cache = []
+        for level in levels:
+            self._brightness_sets[level] = self._make_brightness_palettes(level)
+        self.set_brightness(clock.brightness)
+
+        self._swap_held_palettes(old_palettes, new_palettes)
+        gc.collect()
+
+    def _check_spritesheets(
+        self, spritesheets: Tuple[Optional[Bitmap], ...], atlas: Optional[SpriteAtlas]
+    ) -> None:
+        """
+        Check that new spritesheets match the size and layout of the current ones,
+        and the atlas if one is given. Raises ValueError if they don't.
+
+        :param tuple spritesheets: The new (static, top animation, bottom animation)
+          spritesheets, None keeps the current one.
+        :param SpriteAtlas atlas: Optional description of the new spritesheets.
+        """
+        clock = self._clock
+        current = (
+            clock.static_spritesheet,
+            clock.top_anim_spritesheet,
+            clock.bottom_anim_spritesheet,
+        )
+        for old, new in zip(current, spritesheets):
+            if new is not None and (new.width, new.height) != (old.width, old.height):
+                raise ValueError(
+                    "Theme spritesheets must be the same size as the current ones"
+                )
+
+        if atlas is not None:
+            if (clock.tile_width, clock.tile_height, clock.anim_frame_count) != (
+                atlas.tile_width,
+                atlas.tile_height,
+                atlas.anim_frame_count,
+            ):
+                raise ValueError(
+                    "The sprite atlas doesn't match the tile size "
+                    "and frame count of the clock"
+                )
+            atlas.validate(
+                *(
+                    old if new is None else new
+                    for old, new in zip(current, spritesheets)
+                )
+            )
+
+    def _swap_held_palettes(
+        self, old_palettes: Tuple[Palette, ...], new_palettes: Tuple[Palette, ...]
+    ) -> None:
+        """
+        Hold the new source palettes in the palette cache and release the replaced
+        ones. Their faded palettes are dropped once no other widget holds them.
+
+        :param tuple old_palettes: The replaced source palettes
+        :param tuple new_palettes: The source palettes in use now
+        """
+        if not self._holding:
+            return
+
+        # pylint: disable=import-outside-toplevel
+        from adafruit_displayio_flipclock.palette_cache import (
+            release_palette,
+            retain_palette,
+        )
+
+        for old_palette, new_palette in zip(old_palettes, new_palettes):
+            if new_palette is not old_palette:
+                retain_palette(new_palette)
+                release_palette(old_palette)
+
+    def set_colors(
+        self,
+        static_colors: Optional[Sequence[int]] = None,
+        top_anim_colors: Optional[Sequence[int]] = None,
+        bottom_anim_colors: Optional[Sequence[int]] = None,
+        colon_color: Optional[int] = None,
+    ) -> None:
+        """
+        Write new colors into the source palettes of the clock in place and
+        recompute their faded palettes, see `FlipClock.set_colors()`.
+
+        :param static_colors: New colors for the static sprite palette.
+        :param top_anim_colors: New colors for the top half animation palette.
+        :param bottom_anim_colors: New colors for the bottom half animation palette.
+        :param int colon_color: New hex color value for the colon.
+
+        Any argument that is None keeps the current colors.
+        """
+        changes = []
+        for palette, colors in zip(
+            self.source_palettes, (static_colors, top_anim_colors, bottom_anim_colors)
+        ):
+            if colors is not None:
+                if len(colors) != len(palette):
+                    raise ValueError("New colors don't match the size of the palette")
+                changes.append((palette, colors))
+
+        for palette, colors in changes:
+            for index, color in enumerate(colors):
+                palette[index] = color
+
+        clock = self._clock
+        if changes and (clock.dynamic_fading or clock.brightness != 1.0):
+            # pylint: disable=import-outside-toplevel
+            from adafruit_displayio_flipclock.palette_cache import (
+                update_faded_palettes,
+            )
+
+            for palette, _ in changes:
+                update_faded_palettes(palette)
+            self.colors_changed()
+
+        if colon_color is not None:
+            self.set_colon_color(colon_color)
+
+    def colors_changed(self) -> None:
+        """
+        Update the palettes that aren't shared through the palette cache after the
+        colors of the source palettes were changed in place.
+        """
+        # the uncached brightness sets are recreated when next used
+        self._brightness_cache = []
+        brightness = self._clock.brightness
+        if brightness != 1.0 and brightness not in self._brightness_sets:
+            self.set_brightness(brightness)
+
+    def set_colon_color(self, colon_color: int) -> None:
+        """
+        Change the color of the colon, dimmed to the current brightness.
+        A shared colon palette is left to its owner.
+
+        :param int colon_color: The new hex color value
+        """
+        if self.colon_color is None:
+            return
+
+        self.colon_color = colon_color
+        brightness = self._clock.brightness
+        if brightness == 1.0:
+            self._clock.colon_palette[0] = colon_color
+        else:
+            # pylint: disable=import-outside-toplevel
+            from adafruit_displayio_flipclock.palette_fade import fade_color
+
+            self._clock.colon_palette[0] = fade_color(colon_color, brightness)
@@ -0,0 +1,330 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.dashboard`
+================================================================================
+
+DisplayIO Group that shows several FlipClocks, such as one per time zone, that
+share their spritesheets and palettes and are animated by one frame loop.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Hardware:**
+
+* `ESP32-S2 Feather TFT <https://www.adafruit.com/product/5300>`_
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+try:
+    from typing import Optional, Sequence
+    from displayio import Bitmap
+    from adafruit_displayio_flipclock.sprite_atlas import SpriteAtlas
+    from busdisplay import BusDisplay
+except ImportError:
+    pass
+
+import time
+from displayio import Group, Palette  # pylint: disable=ungrouped-imports
+from adafruit_displayio_flipclock.display_refresh import (  # pylint: disable=ungrouped-imports
+    DisplayRefresher,
+)
+from adafruit_displayio_flipclock.flip_clock import FlipClock
+
+
+class FlipClockDashboard(Group):
+    """
+    A Group of FlipClocks that all use the same spritesheet Bitmaps, faded
+    palettes and colon palette. The transitions of every clock are started
+    with one shared start time and played by one `update()` loop, so flips
+    on different clocks happen in the same frames and cost one display
+    refresh per frame instead of one per clock.
+
+    :param Bitmap static_spritesheet: Spritesheet image of static numbers sprites.
+    :param Palette static_spritesheet_palette: Palette to use with the static sprite sheet.
+    :param Bitmap top_anim_spritesheet: Spritesheet image of top half animation sprites.
+    :param Palette top_anim_palette: Palette to use with the top half animation sprites.
+    :param Bitmap bottom_anim_spritesheet: Spritesheet image of bottom half animation sprites.
+    :param Palette bottom_anim_palette: Palette to use with the bottom half animation sprites.
+    :param int tile_width: Width in pixels of the animation sprite tiles.
+    :param int tile_height: Height in pixels of the animation sprite tiles.
+    :param int colon_color: Hex color value to draw the colons of all clocks with.
+      Default is white 0xffffff.
+    :param bool non_blocking: When True `set_times()` only starts the transitions
+      and `update()` must be called to play the animation frames. Default is False.
+    :param BusDisplay display: Optional display to refresh explicitly, once per
+      animation frame for all of the clocks.
+    :param int target_frames_per_second: Frame rate cap for the explicit refreshes.
+      Only used with ``display``.
+
+    Any other keyword arguments are passed on to every `FlipClock` that is created
+    with `add_clock()`.
+    """
+
+    # pylint: disable=too-many-arguments
+
+    def __init__(
+        self,
+        static_spritesheet: Bitmap,
+        static_spritesheet_palette: Palette,
+        top_anim_spritesheet: Bitmap,
+        top_anim_palette: Palette,
+        bottom_anim_spritesheet: Bitmap,
+        bottom_anim_palette: Palette,
+        tile_width: int,
+        tile_height: int,
+        colon_color: int = 0xFFFFFF,
+        non_blocking: bool = False,
+        display: Optional["BusDisplay"] = None,
+        target_frames_per_second: Optional[int] = None,
+        **clock_kwargs,
+    ) -> None:
+        super().__init__()
+
+        # assets shared by every clock
+        self._sheets = (
+            static_spritesheet,
+            static_spritesheet_palette,
+            top_anim_spritesheet,
+            top_anim_palette,
+            bottom_anim_spritesheet,
+            bottom_anim_palette,
+            tile_width,
+            tile_height,
+        )
+        self.colon_palette = Palette(2)
+        self.colon_palette[0] = colon_color
+        self.colon_palette.make_transparent(1)
+        self._colon_color = colon_color
+        self._clock_kwargs = clock_kwargs
+        self.non_blocking = non_blocking
+
+        # one explicit refresh per frame for all of the clocks
+        self._refresher = (
+            DisplayRefresher(display, target_frames_per_second)
+            if display is not None
+            else None
+        )
+
+        # the clocks in the order they were added
+        self.clocks = []
+
+    def add_clock(self, x: int = 0, y: int = 0, **kwargs) -> FlipClock:
+        """
+        Create a FlipClock that uses the shared spritesheets and palettes
+        and add it to the dashboard.
+
+        :param int x: x position of the clock within the dashboard.
+        :param int y: y position of the clock within the dashboard.
+
+        Any other keyword arguments are passed on to the `FlipClock` constructor,
+        overriding the ones given to the dashboard.
+
+        :return: The new FlipClock
+        """
+        clock_kwargs = dict(self._clock_kwargs)
+        clock_kwargs.update(kwargs)
+        # the dashboard plays the frames and refreshes the display
+        clock_kwargs["non_blocking"] = True
+        clock_kwargs["display"] = None
+        clock_kwargs["colon_palette"] = self.colon_palette
+
+        clock = FlipClock(*self._sheets, **clock_kwargs)
+        clock.x = x
+        clock.y = y
+        self.append(clock)
+        self.clocks.append(clock)
+        return clock
+
+    def set_times(self, times: Sequence[Optional[Sequence[int]]]) -> None:
+        """
+        Change the integer values shown by the clocks, see `FlipClock.set_time()`.
+        Every transition starts at the same time so all of the clocks flip in
+        the same frames.
+
+        If ``non_blocking`` is enabled this only starts the transitions,
+        call `update()` to play the animation frames.
+
+        :param times: The group values for each clock in the order they were
+          added, for example ``((12, 30), (18, 30))``. None leaves a clock unchanged.
+        """
+        if len(times) > len(self.clocks):
+            raise ValueError(f"The dashboard only has {len(self.clocks)} clocks")
+
+        now = time.monotonic_ns()
+        for clock, values in zip(self.clocks, times):
+            if values is not None:
+                clock.set_time(*values, now=now)
+
+        if self.animating:
+            # stop auto refresh while the transitions run
+            if self._refresher is not None:
+                self._refresher.begin()
+
+            # in blocking mode play all of the frames right away
+            if not self.non_blocking:
+                while self.update():
+                    # sleep until the next frame is due
+                    time.sleep(self.time_until_next_frame())
+
+    def set_brightness(self, level: float) -> None:
+        """
+        Dim or brighten every clock and the shared colon palette,
+        see `FlipClock.set_brightness()`.
+
+        :param float level: Overall brightness, 1.0 for full brightness.
+        """
+        for clock in self.clocks:
+            clock.set_brightness(level)
+
+        # pylint: disable=import-outside-toplevel
+        from adafruit_displayio_flipclock.palette_fade import fade_color
+
+        self.colon_palette[0] = fade_color(self._colon_color, level)
+
+    def set_theme(
+        self,
+        static_spritesheet: Optional[Bitmap] = None,
+        static_spritesheet_palette: Optional[Palette] = None,
+        top_anim_spritesheet: Optional[Bitmap] = None,
+        top_anim_palette: Optional[Palette] = None,
+        bottom_anim_spritesheet: Optional[Bitmap] = None,
+        bottom_anim_palette: Optional[Palette] = None,
+        atlas: Optional[SpriteAtlas] = None,
+        colon_color: Optional[int] = None,
+    ) -> None:
+        """
+        Switch every clock to different spritesheets and palettes in place,
+        see `FlipClock.set_theme()`. Clocks added later use the new ones too.
+
+        Any argument that is None keeps the current value.
+        """
+        # pylint: disable=too-many-arguments
+        new_assets = (
+            static_spritesheet,
+            static_spritesheet_palette,
+            top_anim_spritesheet,
+            top_anim_palette,
+            bottom_anim_spritesheet,
+            bottom_anim_palette,
+        )
+        for clock in self.clocks:
+            clock.set_theme(*new_assets, atlas=atlas)
+
+        self._sheets = tuple(
+            old if new is None else new
+            for old, new in zip(self._sheets, new_assets + (None, None))
+        )
+        if colon_color is not None:
+            self._set_colon_color(colon_color)
+
+    def set_colors(
+        self,
+        static_colors: Optional[Sequence[int]] = None,
+        top_anim_colors: Optional[Sequence[int]] = None,
+        bottom_anim_colors: Optional[Sequence[int]] = None,
+        colon_color: Optional[int] = None,
+    ) -> None:
+        """
+        Change the colors of the shared palettes in place, see `FlipClock.set_colors()`.
+
+        Any argument that is None keeps the current colors.
+        """
+        if self.clocks:
+            # the palettes are shared, so they are only written once
+            self.clocks[0].set_colors(
+                static_colors, top_anim_colors, bottom_anim_colors
+            )
+            for clock in self.clocks[1:]:
+                clock.colors_changed()
+        if colon_color is not None:
+            self._set_colon_color(colon_color)
+
+    def _set_colon_color(self, colon_color: int) -> None:
+        """
+        Change the color of the shared colon palette, dimmed to the
+        current brightness.
+
+        :param int colon_color: The new hex color value
+        """
+        self._colon_color = colon_color
+        brightness = self.clocks[0].brightness if self.clocks else 1.0
+        if brightness == 1.0:
+            self.colon_palette[0] = colon_color
+        else:
+            # pylint: disable=import-outside-toplevel
+            from adafruit_displayio_flipclock.palette_fade import fade_color
+
+            self.colon_palette[0] = fade_color(colon_color, brightness)
+
+    @property
+    def animating(self) -> bool:
+        """
+        True while any of the clocks has a digit in a transition.
+        """
+        for clock in self.clocks:
+            if clock.animating:
+                return True
+        return False
+
+    def update(self, now: Optional[int] = None) -> bool:
+        """
+        Show the frames that are due for every clock, with at most one
+        display refresh. Call this regularly from the main loop when
+        using ``non_blocking``.
+
+        :param int now: The current ``time.monotonic_ns()`` value. It will be
+          read if not passed in.
+
+        :return: True if any clock is still animating.
+        """
+        if now is None:
+            now = time.monotonic_ns()
+
+        animating = False
+        changed = False
+        for clock in self.clocks:
+            if clock.update(now):
+                animating = True
+            if clock.needs_refresh:
+                clock.needs_refresh = False
+                changed = True
+
+        # one refresh for all of the clocks that changed in this frame
+        if changed and self._refresher is not None:
+            if animating:
+                self._refresher.refresh()
+            else:
+                self._refresher.end()
+        return animating
+
+    def time_until_next_frame(self, now: Optional[int] = None) -> float:
+        """
+        Seconds remaining until the next frame of any clock is due,
+        0 if one is already due or no clock is animating.
+
+        :param int now: The current ``time.monotonic_ns()`` value. It will be
+          read if not passed in.
+        """
+        if now is None:
+            now = time.monotonic_ns()
+
+        next_frame = None
+        for clock in self.clocks:
+            clock_next_frame = clock.next_frame_time()
+            if clock_next_frame is not None and (
+                next_frame is None or clock_next_frame < next_frame
+            ):
+                next_frame = clock_next_frame
+
+        if next_frame is None or next_frame <= now:
+            return 0
+        return (next_frame - now) / 1_000_000_000
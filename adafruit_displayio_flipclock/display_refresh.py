@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.display_refresh`
+================================================================================
+
+Helper that turns off a display's auto refresh while flip animations run and
+refreshes it exactly once per animation frame.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+try:
+    from typing import Optional
+    from busdisplay import BusDisplay
+except ImportError:
+    pass
+
+
+class DisplayRefresher:
+    """
+    Batches display refreshes for flip animations. `begin()` turns auto refresh
+    off, `refresh()` is called once after all of the tiles of a frame have been
+    updated and `end()` shows the final state and restores auto refresh.
+
+    :param BusDisplay display: The display that the widgets are shown on.
+    :param int target_frames_per_second: Frame rate cap passed to ``display.refresh()``.
+      Refreshes that fall too far behind it are skipped by the display. Default is
+      None, which refreshes as fast as possible.
+    """
+
+    def __init__(
+        self, display: "BusDisplay", target_frames_per_second: Optional[int] = None
+    ) -> None:
+        self.display = display
+        self.target_frames_per_second = target_frames_per_second
+        self.active = False
+        self._auto_refresh = display.auto_refresh
+
+    def begin(self) -> None:
+        """
+        Turn off auto refresh for the duration of a transition.
+        Does nothing if it is already off for a transition.
+        """
+        if not self.active:
+            self._auto_refresh = self.display.auto_refresh
+            self.display.auto_refresh = False
+            self.active = True
+
+    def refresh(self) -> None:
+        """
+        Refresh the display once, after all layers of a frame have been updated.
+        """
+        self.display.refresh(target_frames_per_second=self.target_frames_per_second)
+
+    def end(self) -> None:
+        """
+        Refresh the final state of a transition and restore auto refresh.
+        """
+        if self.active:
+            self.display.refresh()
+            self.display.auto_refresh = self._auto_refresh
+            self.active = False
@@ -24,23 +24,39 @@ Implementation Notes
   https://circuitpython.org/downloads
 """
 try:
-    from typing import Optional
-    from displayio import Bitmap
+    from typing import Optional, Sequence, Tuple, Union
+    from adafruit_displayio_flipclock.sprite_atlas import SpriteAtlas
+    from busdisplay import BusDisplay
 except ImportError:
     pass
 
+import time
 from adafruit_displayio_layout.widgets.widget import Widget
-from displayio import Palette  # pylint: disable=ungrouped-imports
-from vectorio import Circle
+from displayio import Bitmap, Palette  # pylint: disable=ungrouped-imports
+from adafruit_displayio_flipclock.anim_pool import (  # pylint: disable=ungrouped-imports
+    AnimationTileGridPool,
+)
+from adafruit_displayio_flipclock.calibration import calibrate_digits
+from adafruit_displayio_flipclock.clock_layout import (
+    COLON_SPACE,
+    ClockSeparators,
+    changed_digits,
+    group_digits,
+    layout_positions,
+    parse_layout,
+    validate_values,
+)
+from adafruit_displayio_flipclock.clock_theme import ClockTheme
+from adafruit_displayio_flipclock.display_refresh import DisplayRefresher
 from adafruit_displayio_flipclock.flip_digit import FlipDigit
-
-# Gap in pixels that the colon will be shown in between the two pairs
-COLON_SPACE = 12
+from adafruit_displayio_flipclock.frame_adapter import FrameAdapter
+from adafruit_displayio_flipclock.layer_tilegrids import make_group_tilegrids
 
 
 class FlipClock(Widget):
     """A FlipClock displayio widget that shows two pairs of digits and uses
-    flip clock style animations to change between them.
+    flip clock style animations to change between them. Other arrangements of
+    digits, such as hours, minutes and seconds, can be set with ``layout``.
 
     :param Bitmap static_spritesheet: Spritesheet image of static numbers sprites.
     :param Palette static_spritesheet_palette: Palette to use with the static sprite sheet.
@@ -62,13 +78,67 @@ class FlipClock(Widget):
       Default value is 0.02 seconds
     :param int colon_color: Hex color value to draw the colon between pairs of digits.
       Default is white 0xffffff.
-    :param bool dynamic_fading: Whether to use PaleteFadder to dynamically adjust brightness.
+    :param bool dynamic_fading: Whether to use faded palettes to dynamically adjust brightness.
     :param float brighter_level: Brightness modifier value to use for the brightest portion
       of the aniatmions. Valid range is 0.0 - 1.0.
     :param float medium_level: Brightness modifier value to use for the standard
       portion of the aniatmions. Valid range is 0.0 - 1.0.
     :param float darker_level: Brightness modifier value to use for the darkest "shadow" portion
       of the aniatmions. Valid range is 0.0 - 1.0.
+    :param bool non_blocking: When True setting the pairs only starts the digit
+      transitions and `update()` must be called to play the animation frames.
+      Default is False.
+    :param float flip_duration: Total time in seconds for a digit transition, both
+      halves included. Frames are skipped when rendering falls behind so the
+      transition still ends on time. Default is ``anim_delay * anim_frame_count * 2``.
+    :param SpriteAtlas atlas: Optional description of the spritesheet layout written by
+      the spritesheet generator. See `from_atlas()`.
+    :param bool compact: Draw each pair of digits with one 2 tile wide TileGrid per
+      layer instead of four TileGrids per digit, which cuts the number of objects
+      the display walks on each refresh. Requires a blank animation sprite, from
+      ``blank_tile`` or the atlas. The bottom static half is not shaded during
+      flips in this mode. Default is False.
+    :param int blank_tile: Index of a fully transparent sprite in the animation sheets.
+      It is shown instead of hiding the animation TileGrids.
+    :param BusDisplay display: Optional display to refresh explicitly. Auto refresh is
+      turned off during transitions and the display is refreshed exactly once per
+      animation frame, after the tiles of all flipping digits have been updated.
+    :param int target_frames_per_second: Frame rate cap for the explicit refreshes.
+      Only used with ``display``.
+    :param int anim_pool_size: Number of animation TileGrid pairs shared by all of the
+      digits, see `AnimationTileGridPool`. 1 flips the changed digits one after
+      another, 4 lets them all flip together. Default is None, which gives every
+      digit its own animation TileGrids. Can't be used with ``compact``.
+    :param str layout: Arrangement of the digits and separators, see `parse_layout()`.
+      For example ``"HH:MM:SS"`` or ``"DD.MM HH:MM"``. Each group of digits is set
+      with one value. Default is ``"HH:MM"``, two pairs of digits with a colon
+      between them.
+    :param Palette colon_palette: Optional Palette to draw the separators with, so it
+      can be shared with other clocks. Index 0 is the color and index 1 must be
+      transparent. ``colon_color`` is ignored if it is given.
+    :param int shading_steps: Number of brightness levels in an optional shading ramp
+      for each animation half, see `FlipDigit`. Requires ``dynamic_fading``.
+      Default is None.
+    :param Sequence[float] brightness_levels: Overall brightness levels, such as a
+      night mode, whose palette sets are created up front for `set_brightness()`.
+      Full brightness 1.0 is always available.
+    :param int brightness_cache_size: Number of palette sets for other brightness
+      levels that `set_brightness()` creates when first needed and keeps, least
+      recently used first out. Default is 0, which only allows ``brightness_levels``.
+    :param Bitmap colon_spritesheet: Optional sprites to draw the separators with, such
+      as the colon sheet written by the spritesheet generator. Tile 0 is the colon and
+      tile 1 the dot, each ``COLON_SPACE`` wide and a full digit high, with index 0 for
+      the dots and 1 for the background. Default is drawn by `separator_bitmap()`.
+    :param float colon_blink: Blink period in seconds. `update()` shows the separators
+      for the first half of every period and hides them for the second half. Call
+      `update()` regularly for it. Default is None, which doesn't blink.
+    :param bool adaptive: Show fewer frames of each flip, down to an instant swap,
+      when new values arrive faster than a full flip takes, and go back to full
+      flips when they slow down. All of the digits share one `FrameAdapter`,
+      available as ``frame_adapter``. Default is False.
+    :param easing: Timing of the frames within a flip, see `FlipDigit`. For example
+      ``"gravity"`` for a flap that falls faster and faster. Default is None, which
+      spaces the frames evenly.
     """
 
     # pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
@@ -92,11 +162,30 @@ class FlipClock(Widget):
         medium_level: float = 0.8,
         h_pos: int = 0,
         v_pos: int = 0,
+        non_blocking: bool = False,
+        flip_duration: Optional[float] = None,
+        atlas: Optional[SpriteAtlas] = None,
+        compact: bool = False,
+        blank_tile: Optional[int] = None,
+        display: Optional["BusDisplay"] = None,
+        target_frames_per_second: Optional[int] = None,
+        anim_pool_size: Optional[int] = None,
+        layout: str = "HH:MM",
+        colon_palette: Optional[Palette] = None,
+        shading_steps: Optional[int] = None,
+        brightness_levels: Optional[Sequence[float]] = None,
+        brightness_cache_size: int = 0,
+        colon_spritesheet: Optional[Bitmap] = None,
+        colon_blink: Optional[float] = None,
+        adaptive: bool = False,
+        easing: Optional[Union[str, Sequence[float]]] = None,
     ) -> None:
 
+        group_sizes, separators = parse_layout(layout)
+
         # initialize parent Widget object
         super().__init__(
-            width=tile_width * 4 + COLON_SPACE,
+            width=tile_width * sum(group_sizes) + COLON_SPACE * len(separators),
             height=tile_height * 2,
         )
 
@@ -114,187 +203,798 @@ class FlipClock(Widget):
         self.brighter_level = brighter_level
         self.darker_level = darker_level
         self.medium_level = medium_level
+        self.dynamic_fading = dynamic_fading
+        self.shading_steps = shading_steps
+        self.non_blocking = non_blocking
+
+        # use the faded palettes baked by the spritesheet generator
+        if dynamic_fading and atlas is not None:
+            atlas.load_baked_palettes(
+                static_spritesheet_palette, top_anim_palette, bottom_anim_palette
+            )
+
+        # palette sets and colors, only a colon palette of our own is dimmed
+        self.brightness = 1.0
+        self.brightness_cache_size = brightness_cache_size
+        self._theme = ClockTheme(
+            self, colon_color if colon_palette is None else None, brightness_levels
+        )
         self.h_pos = h_pos
         self.v_pos = v_pos
 
-        # Create first digit of first pair
-        self.digit_0 = FlipDigit(
-            self.static_spritesheet,
-            self.static_spritesheet_palette,
-            self.top_anim_spritesheet,
-            self.top_anim_palette,
-            self.bottom_anim_spritesheet,
-            self.bottom_anim_palette,
-            self.tile_width,
-            self.tile_height,
-            anim_delay=self.anim_delay,
-            dynamic_fading=dynamic_fading,
-            brighter_level=self.brighter_level,
-            darker_level=self.darker_level,
-            medium_level=self.medium_level,
-            h_pos = self.h_pos,
-            v_pos = self.v_pos
+        # explicit display refreshes, one per animation frame for all digits
+        self._refresher = (
+            DisplayRefresher(display, target_frames_per_second)
+            if display is not None
+            else None
         )
-        self.digit_0.x = self.h_pos
-        # append it to parent Group
-        self.append(self.digit_0)
-
-        # Create second digit of first pair
-        self.digit_1 = FlipDigit(
-            self.static_spritesheet,
-            self.static_spritesheet_palette,
-            self.top_anim_spritesheet,
-            self.top_anim_palette,
-            self.bottom_anim_spritesheet,
-            self.bottom_anim_palette,
-            self.tile_width,
-            self.tile_height,
-            anim_delay=self.anim_delay,
-            dynamic_fading=dynamic_fading,
-            brighter_level=self.brighter_level,
-            darker_level=self.darker_level,
-            medium_level=self.medium_level,
-            h_pos = self.h_pos,
-            v_pos = self.v_pos,
+        # True when tiles have changed and there is no display to refresh
+        self.needs_refresh = False
+
+        digit_x, separator_x = layout_positions(
+            group_sizes, separators, h_pos, tile_width
         )
-        self.digit_1.x = self.h_pos + self.tile_width
-        # append it to parent Group
-        self.append(self.digit_1)
-
-        # Create first digit of second pair
-        self.digit_2 = FlipDigit(
-            self.static_spritesheet,
-            self.static_spritesheet_palette,
-            self.top_anim_spritesheet,
-            self.top_anim_palette,
-            self.bottom_anim_spritesheet,
-            self.bottom_anim_palette,
-            self.tile_width,
-            self.tile_height,
-            anim_delay=self.anim_delay,
-            dynamic_fading=dynamic_fading,
-            brighter_level=self.brighter_level,
-            darker_level=self.darker_level,
-            medium_level=self.medium_level,
-            h_pos = self.h_pos,
-            v_pos = self.v_pos,
+        if blank_tile is None and atlas is not None:
+            blank_tile = atlas.blank_tile
+
+        # compact mode draws each group with one multi-tile TileGrid per layer
+        self.compact = compact
+        self._group_tilegrids = None
+        if compact:
+            self._group_tilegrids = self._make_group_tilegrids(
+                digit_x, group_sizes, atlas, blank_tile
+            )
+        self._theme.group_tilegrids = self._group_tilegrids
+
+        self._setup_anim_pool(anim_pool_size, blank_tile)
+        # one flip plan for all of the digits, measured by update()
+        self.frame_adapter = FrameAdapter() if adaptive else None
+
+        self._make_digits(
+            digit_x,
+            group_sizes,
+            non_blocking=non_blocking,
+            flip_duration=flip_duration,
+            atlas=atlas,
+            blank_tile=blank_tile,
+            shading_steps=shading_steps,
+            easing=easing,
+        )
+
+        # pool tilegrids are drawn over the static sprites of the digits
+        if self._anim_pool is not None:
+            for tilegrid in self._anim_pool.tilegrids:
+                self.append(tilegrid)
+
+        # the separators between the groups and their blinking
+        self._separators = ClockSeparators(
+            self,
+            separator_x,
+            tile_height * 2,
+            v_pos,
+            colon_palette=colon_palette,
+            colon_color=colon_color,
+            colon_spritesheet=colon_spritesheet,
         )
+        self.colon_palette = self._separators.palette
+        self.separator_tilegrids = self._separators.tilegrids
+        self.colon_blink = colon_blink
 
-        self.digit_2.x = self.h_pos + (self.tile_width) * 2 + COLON_SPACE
-        # append it to parent Group
-        self.append(self.digit_2)
+        # frame costs measured by calibrate(), None until it is called
+        self.calibration = None
+        # (start time, values) of a flip waiting for schedule_time()
+        self._scheduled = None
 
-        # Create second digit of second pair
-        self.digit_3 = FlipDigit(
-            self.static_spritesheet,
-            self.static_spritesheet_palette,
+    def _setup_anim_pool(
+        self, anim_pool_size: Optional[int], blank_tile: Optional[int]
+    ) -> None:
+        """
+        Create the pool of animation TileGrids that the digits share while they
+        flip, if ``anim_pool_size`` is set.
+
+        :param int anim_pool_size: Number of animation TileGrid pairs, or None
+        :param int blank_tile: Index of a fully transparent animation sprite
+        """
+        self._anim_pool = None
+        # (digit, new value) transitions waiting for free animation tilegrids
+        self._waiting = ()
+        if anim_pool_size is None:
+            return
+        if self.compact:
+            raise ValueError("anim_pool_size can't be used with compact mode")
+
+        _, top_palette, bottom_palette = self._theme.layer_palettes()
+        self._anim_pool = AnimationTileGridPool(
             self.top_anim_spritesheet,
-            self.top_anim_palette,
+            top_palette,
             self.bottom_anim_spritesheet,
-            self.bottom_anim_palette,
+            bottom_palette,
             self.tile_width,
             self.tile_height,
-            anim_delay=self.anim_delay,
-            dynamic_fading=dynamic_fading,
-            brighter_level=self.brighter_level,
-            darker_level=self.darker_level,
-            medium_level=self.medium_level,
-            h_pos = self.h_pos,
-            v_pos = self.v_pos,
+            size=anim_pool_size,
+            blank_tile=blank_tile,
         )
+        self._theme.anim_pool = self._anim_pool
+        self._waiting = self._anim_pool.waiting
 
-        self.digit_3.x = self.digit_2.x + self.tile_width
-        # append it to parent Group
-        self.append(self.digit_3)
+    def _make_digits(
+        self, digit_x: list, group_sizes: Tuple[int, ...], **digit_kwargs
+    ) -> None:
+        """
+        Create the digits and the `groups` of digits that each value is set on.
 
-        # set colon color
-        colon_palette = Palette(1)
-        colon_palette[0] = colon_color
+        :param list digit_x: x position of each digit
+        :param tuple group_sizes: Number of digits in each group
 
-        # calculate colon position
-        colon_x = self.digit_1.x + self.tile_width + 6
+        Any other keyword arguments are passed on to every `FlipDigit`.
         """
-        top_dot_y = self.tile_height * 2 // 3
-        bottom_dot_y = (self.tile_height * 2 // 3) * 2
+        digits = []
+        groups = []
+        for group, size in enumerate(group_sizes):
+            for position in range(size):
+                digit = FlipDigit(
+                    self.static_spritesheet,
+                    self.static_spritesheet_palette,
+                    self.top_anim_spritesheet,
+                    self.top_anim_palette,
+                    self.bottom_anim_spritesheet,
+                    self.bottom_anim_palette,
+                    self.tile_width,
+                    self.tile_height,
+                    anim_frame_count=self.anim_frame_count,
+                    anim_delay=self.anim_delay,
+                    dynamic_fading=self.dynamic_fading,
+                    brighter_level=self.brighter_level,
+                    darker_level=self.darker_level,
+                    medium_level=self.medium_level,
+                    h_pos=self.h_pos,
+                    v_pos=self.v_pos,
+                    tilegrids=self._group_tilegrids[group] if self.compact else None,
+                    tile_index=position if self.compact else 0,
+                    anim_pool=self._anim_pool,
+                    frame_adapter=self.frame_adapter,
+                    **digit_kwargs,
+                )
+                if not self.compact:
+                    digit.x = digit_x[len(digits)]
+                    # append it to parent Group
+                    self.append(digit)
+                digits.append(digit)
+            # the digits of each group
+            groups.append(tuple(digits[-size:]))
+
+        # all of the digits in display order
+        self.digits = tuple(digits)
+        for i, digit in enumerate(self.digits):
+            setattr(self, f"digit_{i}", digit)
+        self.groups = tuple(groups)
+        # the number of values each group can show
+        self._group_limits = tuple(10**size for size in group_sizes)
+
+    def _make_group_tilegrids(
+        self,
+        digit_x: list,
+        group_sizes: Tuple[int, ...],
+        atlas: Optional[SpriteAtlas],
+        blank_tile: Optional[int],
+    ) -> tuple:
         """
-        top_dot_y = self.v_pos + self.tile_height * 2 // 3
-        bottom_dot_y = self.v_pos + (self.tile_height * 2 // 3) * 2
+        Create the shared layer TileGrids for each group of digits in compact mode
+        and add them to the parent Group.
 
-        # create circles for colon
-        top_circle = Circle(
-            pixel_shader=colon_palette, radius=4, x=colon_x, y=top_dot_y
+        :param list digit_x: x position of each digit
+        :param tuple group_sizes: Number of digits in each group
+        :param SpriteAtlas atlas: Optional description of the spritesheet layout
+        :param int blank_tile: Index of a fully transparent animation sprite
+
+        :return: Tuple of the layer TileGrids of each group
+        """
+        if blank_tile is None:
+            raise ValueError("compact mode needs a blank_tile in the animation sheets")
+
+        # the digits start out showing the static sprites of a 0
+        top_indexes = FlipDigit.TOP_HALF_SPRITE_INDEX_MAP
+        bottom_indexes = FlipDigit.BOTTOM_HALF_SPRITE_INDEX_MAP
+        if atlas is not None:
+            top_indexes = atlas.top_static_indexes
+            bottom_indexes = atlas.bottom_static_indexes
+
+        return make_group_tilegrids(
+            self,
+            digit_x,
+            group_sizes,
+            (
+                self.static_spritesheet,
+                self.top_anim_spritesheet,
+                self.bottom_anim_spritesheet,
+            ),
+            self._theme.layer_palettes(),
+            tile_width=self.tile_width,
+            tile_height=self.tile_height,
+            y=self.v_pos,
+            static_default_tiles=(top_indexes[0], bottom_indexes[0]),
+            blank_tile=blank_tile,
+        )
+
+    def set_brightness(self, level: float) -> None:
+        """
+        Dim or brighten the whole clock, for example for a night mode. This only
+        switches every TileGrid to the palette set for the level, so it doesn't
+        reload or rebuild anything. The shading between the layers is kept.
+
+        :param float level: Overall brightness, 1.0 for full brightness. Must be
+          in ``brightness_levels`` unless ``brightness_cache_size`` is set.
+        """
+        self._theme.set_brightness(level)
+
+    def set_theme(
+        self,
+        static_spritesheet: Optional[Bitmap] = None,
+        static_spritesheet_palette: Optional[Palette] = None,
+        top_anim_spritesheet: Optional[Bitmap] = None,
+        top_anim_palette: Optional[Palette] = None,
+        bottom_anim_spritesheet: Optional[Bitmap] = None,
+        bottom_anim_palette: Optional[Palette] = None,
+        atlas: Optional[SpriteAtlas] = None,
+        colon_color: Optional[int] = None,
+    ) -> None:
+        """
+        Switch to different spritesheets and palettes, for example another font
+        or color scheme, without rebuilding the clock. The ``bitmap`` and
+        ``pixel_shader`` of the existing TileGrids are swapped in place, so the
+        positions, the values showing and any running transitions are kept.
+        Pass only palettes for a color only theme that doesn't touch any bitmaps.
+
+        The new spritesheets must have the same size and layout as the current
+        ones. The faded palettes of replaced palettes are released, and the
+        current brightness is applied to the new ones.
+
+        :param Bitmap static_spritesheet: Spritesheet image of static numbers sprites.
+        :param Palette static_spritesheet_palette: Palette to use with the static sprite
+          sheet. Set all desired transparent indexes before calling.
+        :param Bitmap top_anim_spritesheet: Spritesheet image of top half animation sprites.
+        :param Palette top_anim_palette: Palette to use with the top half animation sprites.
+        :param Bitmap bottom_anim_spritesheet: Spritesheet image of bottom half
+          animation sprites.
+        :param Palette bottom_anim_palette: Palette to use with the bottom half
+          animation sprites.
+        :param SpriteAtlas atlas: Optional description of the new spritesheets. They
+          are checked against it and its baked palettes are used.
+        :param int colon_color: New hex color value for the colon. Ignored if the
+          clock was given a shared ``colon_palette``.
+
+        Any argument that is None keeps the current value.
+        """
+        # pylint: disable=too-many-arguments
+        self._theme.set_theme(
+            (static_spritesheet, top_anim_spritesheet, bottom_anim_spritesheet),
+            (static_spritesheet_palette, top_anim_palette, bottom_anim_palette),
+            atlas=atlas,
+            colon_color=colon_color,
         )
-        bottom_circle = Circle(
-            pixel_shader=colon_palette, radius=4, x=colon_x, y=bottom_dot_y
+
+    def set_colors(
+        self,
+        static_colors: Optional[Sequence[int]] = None,
+        top_anim_colors: Optional[Sequence[int]] = None,
+        bottom_anim_colors: Optional[Sequence[int]] = None,
+        colon_color: Optional[int] = None,
+    ) -> None:
+        """
+        Change the colors of the clock by writing them into the current palettes
+        in place. No bitmaps are touched and, unlike `set_theme()`, no palettes
+        are created: the faded palettes are recomputed in place as well.
+        Transparent indexes are kept. Other clocks using the same palettes
+        change too.
+
+        :param static_colors: New colors for the static sprite palette, a Palette or
+          a sequence of 24 bit RGB ints with one color per index.
+        :param top_anim_colors: New colors for the top half animation palette.
+        :param bottom_anim_colors: New colors for the bottom half animation palette.
+        :param int colon_color: New hex color value for the colon. Ignored if the
+          clock was given a shared ``colon_palette``.
+
+        Any argument that is None keeps the current colors.
+        """
+        self._theme.set_colors(
+            static_colors, top_anim_colors, bottom_anim_colors, colon_color
         )
 
-        # add the colon circles to parent Group
-        self.append(top_circle)
-        self.append(bottom_circle)
+    def colors_changed(self) -> None:
+        """
+        Update the palettes that aren't shared through the palette cache after the
+        colors of the source palettes were changed in place, for example by
+        `set_colors()` of another clock that uses the same palettes.
+        """
+        self._theme.colors_changed()
 
-    @staticmethod
-    def _validate_new_pair(new_pair: str) -> Optional[str]:
+    @classmethod
+    def from_atlas(
+        cls,
+        atlas: SpriteAtlas,
+        static_spritesheet: Bitmap,
+        static_spritesheet_palette: Palette,
+        top_anim_spritesheet: Bitmap,
+        top_anim_palette: Palette,
+        bottom_anim_spritesheet: Bitmap,
+        bottom_anim_palette: Palette,
+        **kwargs,
+    ) -> "FlipClock":
+        """
+        Create a FlipClock using the tile size, frame count and sprite indexes
+        from a `SpriteAtlas`. Raises ValueError if the spritesheets don't match it.
+
+        :param SpriteAtlas atlas: Description of the spritesheet layout.
+        :param Bitmap static_spritesheet: Spritesheet image of static numbers sprites.
+        :param Palette static_spritesheet_palette: Palette to use with the static sprite sheet.
+        :param Bitmap top_anim_spritesheet: Spritesheet image of top half animation sprites.
+        :param Palette top_anim_palette: Palette to use with the top half animation sprites.
+        :param Bitmap bottom_anim_spritesheet: Spritesheet image of bottom half animation sprites.
+        :param Palette bottom_anim_palette: Palette to use with the bottom half animation sprites.
+
+        Any other keyword arguments are passed on to the constructor.
         """
-        Check if a new value for pair of digits is valid.
-        Validates type and length of the value.
+        return cls(
+            static_spritesheet,
+            static_spritesheet_palette,
+            top_anim_spritesheet,
+            top_anim_palette,
+            bottom_anim_spritesheet,
+            bottom_anim_palette,
+            atlas.tile_width,
+            atlas.tile_height,
+            anim_frame_count=atlas.anim_frame_count,
+            atlas=atlas,
+            **kwargs,
+        )
 
-        If the value is valid it will be returned, with a leading zero padded
-        if necessary.
+    def _group_changes(self, index: int, new_value: Union[str, int]) -> list:
+        """
+        Build the list of (digit, new value) tuples for a new group value.
 
-        :param str new_pair: The new value to validate
+        :param int index: The index of the group within `groups`
+        :param new_value: The new value, see `group_digits()`
         """
+        group = self.groups[index]
+        return list(
+            zip(group, group_digits(new_value, len(group), self._group_limits[index]))
+        )
 
-        # validate type and length
-        if not isinstance(new_pair, str) or not len(new_pair) in (1, 2):
-            raise ValueError("Pair Value must be str with length 2")
+    def _changes(self, values: tuple) -> list:
+        """
+        Build the list of (digit, new value) tuples for new group values.
 
-        # if the new value is length 1
-        if len(new_pair) == 1:
-            # single zero pad on the left
-            new_pair = f"0{new_pair}"
+        :param tuple values: The new value of each group, None leaves a group unchanged.
+        """
+        if len(values) > len(self.groups):
+            raise ValueError(f"The layout only has {len(self.groups)} groups")
+        changes = []
+        for index, new_value in enumerate(values):
+            if new_value is not None:
+                changes.extend(self._group_changes(index, new_value))
+        return changes
+
+    def _group_value(self, index: int) -> str:
+        """
+        The current value of a group of digits as a string.
 
-        return new_pair
+        :param int index: The index of the group within `groups`
+        """
+        return "".join(str(digit.value) for digit in self.groups[index])
 
     @property
     def first_pair(self) -> str:
         """
         The current value of the first pair of digits.
         """
-        return f"{str(self.digit_0.value)}{str(self.digit_1.value)}"
+        return self._group_value(0)
 
     @first_pair.setter
-    def first_pair(self, new_pair: str) -> None:
-        # validate the new value
-        new_pair = self._validate_new_pair(new_pair)
-
-        # if first digit is different
-        if self.digit_0.value != int(new_pair[0]):
-            # update first digit
-            self.digit_0.value = int(new_pair[0])
-
-        # if second digit is different
-        if self.digit_1.value != int(new_pair[1]):
-            # update second digit
-            self.digit_1.value = int(new_pair[1])
+    def first_pair(self, new_pair: Union[str, int]) -> None:
+        # validate the new value and flip both digits together
+        self._flip_digits(self._group_changes(0, new_pair))
 
     @property
     def second_pair(self) -> str:
         """
-        The current value of the second pair of digits.
+        The current value of the second pair of digits. Raises AttributeError
+        if the layout has only one group of digits.
         """
-        return f"{str(self.digit_2.value)}{str(self.digit_3.value)}"
+        self._check_second_group()
+        return self._group_value(1)
 
     @second_pair.setter
-    def second_pair(self, new_pair: str) -> None:
-        # validate new value
-        new_pair = self._validate_new_pair(new_pair)
-
-        # if first digit is different
-        if self.digit_2.value != int(new_pair[0]):
-            # update the first digit
-            self.digit_2.value = int(new_pair[0])
-
-        # if the second digit is different
-        if self.digit_3.value != int(new_pair[1]):
-            # update second digit
-            self.digit_3.value = int(new_pair[1])
+    def second_pair(self, new_pair: Union[str, int]) -> None:
+        self._check_second_group()
+        # validate new value and flip both digits together
+        self._flip_digits(self._group_changes(1, new_pair))
+
+    def _check_second_group(self) -> None:
+        """
+        Raise AttributeError if the layout has no second group of digits.
+        """
+        if len(self.groups) < 2:
+            raise AttributeError("The layout has no second group of digits")
+
+    @property
+    def values(self) -> Tuple[str, ...]:
+        """
+        The current value of each group of digits.
+        """
+        return tuple(self._group_value(index) for index in range(len(self.groups)))
+
+    def set_time(self, *values: int, now: Optional[int] = None) -> None:
+        """
+        Change every group of digits to integer values, such as hours and minutes,
+        or hours, minutes and seconds with a ``"HH:MM:SS"`` layout. This is the
+        cheapest way to update the clock from a loop: the digits are split with
+        ``divmod()`` without building any strings, digits that already show the
+        right value are skipped and the changed ones flip together. Digits that
+        are still flipping only keep the newest value, see
+        `FlipDigit.start_transition()`, so values can be set faster than the
+        flips without building up lag.
+
+        If ``non_blocking`` is enabled this only starts the transitions,
+        call `update()` to play the animation frames.
+
+        :param int values: The new value of each group of digits, in layout order.
+        :param int now: The ``time.monotonic_ns()`` value that the transitions
+          start at. It will be read if not passed in and a digit changes.
+        """
+        validate_values(values, self._group_limits)
+
+        # only read the time once a digit needs to change
+        started = False
+        for group, new_value in zip(self.groups, values):
+            for position in range(len(group) - 1, -1, -1):
+                new_value, digit_value = divmod(new_value, 10)
+                digit = group[position]
+                if digit.value != digit_value or self._waiting:
+                    if now is None:
+                        now = time.monotonic_ns()
+                    self._start_digit(digit, digit_value, now)
+                    started = True
+
+        # in blocking mode play all of the frames right away
+        if started and not self.non_blocking:
+            self._play()
+
+    def schedule_time(
+        self, *values: int, at: int, flip_duration: Optional[float] = None
+    ) -> None:
+        """
+        Change every group of digits to integer values, like `set_time()`, with
+        the flips timed to end exactly at ``at``, such as the start of the next
+        minute. The flips start as long before as they are planned to take: the
+        shorter flip of an adaptive clock, and one round of flips after another
+        when more digits change than ``anim_pool_size``. Scheduling again replaces
+        a scheduled change that hasn't started yet.
+
+        If ``non_blocking`` is enabled `update()` starts the flips when they are
+        due, call it regularly. Otherwise this sleeps until they are due and plays
+        them. If ``at`` is too close the flips skip frames to still end at ``at``.
+
+        :param int values: The new value of each group of digits, in layout order.
+        :param int at: The ``time.monotonic_ns()`` value at which the new values
+          should be complete.
+        :param float flip_duration: Time in seconds that the flips take, such as one
+          picked by `calibrate()`. Sets ``flip_duration`` of every digit. Default
+          keeps the current one.
+        """
+        validate_values(values, self._group_limits)
+        if flip_duration is not None:
+            for digit in self.digits:
+                digit.flip_duration = flip_duration
+        # digits beyond the pool size wait for a pair and flip in later rounds
+        rounds = 1
+        if self._anim_pool is not None:
+            rounds = self._anim_pool.rounds(changed_digits(self.groups, values))
+        start = at - rounds * self.digits[0].planned_duration(at)
+
+        if self.non_blocking:
+            self._scheduled = (start, values)
+            return
+
+        self._scheduled = None
+        delay = start - time.monotonic_ns()
+        if delay > 0:
+            time.sleep(delay / 1_000_000_000)
+        self.set_time(*values, now=start)
+
+    def flip_pairs(
+        self,
+        first_pair: Optional[Union[str, int]] = None,
+        second_pair: Optional[Union[str, int]] = None,
+    ) -> None:
+        """
+        Change the values of both pairs of digits at once. All of the digits
+        that change flip together in one shared frame loop, so any number of
+        changed digits takes the time of a single flip.
+
+        If ``non_blocking`` is enabled this only starts the transitions,
+        call `update()` to play the animation frames.
+
+        :param first_pair: The new value for the first pair of digits, int 0-99
+          or str. None leaves it unchanged.
+        :param second_pair: The new value for the second pair of digits, int 0-99
+          or str. None leaves it unchanged.
+        """
+        self._flip_digits(self._changes((first_pair, second_pair)))
+
+    def flip_groups(self, *values: Optional[Union[str, int]]) -> None:
+        """
+        Change the values of any number of groups of digits at once. All of the
+        digits that change flip together in one shared frame loop.
+
+        If ``non_blocking`` is enabled this only starts the transitions,
+        call `update()` to play the animation frames.
+
+        :param values: The new value of each group of digits in layout order, int
+          or str. None leaves a group unchanged.
+        """
+        self._flip_digits(self._changes(values))
+
+    async def set_pairs(
+        self,
+        first_pair: Optional[Union[str, int]] = None,
+        second_pair: Optional[Union[str, int]] = None,
+    ) -> None:
+        """
+        Coroutine that changes the values of both pairs of digits, awaiting
+        ``asyncio.sleep()`` between animation frames so other tasks can run
+        during the flips. All of the digits that change flip together.
+        Requires the ``asyncio`` library.
+
+        :param first_pair: The new value for the first pair of digits, int 0-99
+          or str. None leaves it unchanged.
+        :param second_pair: The new value for the second pair of digits, int 0-99
+          or str. None leaves it unchanged.
+        """
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        self._start_digits(self._changes((first_pair, second_pair)))
+
+        # play the frames, yielding to other tasks between each
+        while self.update():
+            await asyncio.sleep(self.time_until_next_frame())
+
+    def _start_digits(self, changes: list) -> None:
+        """
+        Start the transitions of all digits that change, using the same
+        start time so their frames stay in lockstep.
+
+        :param list changes: (digit, new value) tuples
+        """
+        now = time.monotonic_ns()
+        for digit, new_value in changes:
+            self._start_digit(digit, new_value, now)
+
+    def _start_digit(self, digit: FlipDigit, new_value: int, now: int) -> None:
+        """
+        Start the transition of one digit if its value changes.
+
+        :param FlipDigit digit: The digit to change
+        :param int new_value: The new value for the digit
+        :param int now: The ``time.monotonic_ns()`` value that the transition starts at
+        """
+        # a newer value replaces one that is still waiting
+        if self._waiting:
+            self._anim_pool.cancel(digit)
+
+        # if the digit is different
+        if digit.value != new_value:
+            # digits changed together count as one update, queued ones
+            # started later by the pool don't count again
+            if self.frame_adapter is not None:
+                self.frame_adapter.note_update(now)
+
+            # stop auto refresh while the transitions run
+            if self._refresher is not None:
+                self._refresher.begin()
+
+            # wait for a digit to finish and release its animation tilegrids
+            if self._anim_pool is not None:
+                self._anim_pool.start_transition(digit, new_value, now)
+            else:
+                digit.start_transition(new_value, now)
+
+    def _flip_digits(self, changes: list) -> None:
+        """
+        Start the transitions of all digits that change and, unless
+        ``non_blocking`` is enabled, play them together until done.
+
+        :param list changes: (digit, new value) tuples
+        """
+        self._start_digits(changes)
+
+        # in blocking mode play all of the frames right away
+        if not self.non_blocking:
+            self._play()
+
+    def _play(self) -> None:
+        """
+        Block until all of the running transitions are complete.
+        """
+        while self.update():
+            # sleep until the next frame is due
+            time.sleep(self.time_until_next_frame())
+
+    @property
+    def colon_visible(self) -> bool:
+        """
+        Whether the separators are showing, see `ClockSeparators.visible`.
+        Other clocks sharing the colon palette blink with it.
+        """
+        return self._separators.visible
+
+    @colon_visible.setter
+    def colon_visible(self, visible: bool) -> None:
+        self._separators.visible = visible
+
+    @property
+    def colon_blink(self) -> Optional[float]:
+        """
+        Blink period of the separators in seconds, None if they don't blink.
+        The separators are shown for the first half of every period.
+        """
+        return self._separators.blink
+
+    @colon_blink.setter
+    def colon_blink(self, period: Optional[float]) -> None:
+        self._separators.blink = period
+
+    @property
+    def animating(self) -> bool:
+        """
+        True while any of the digits are in a transition or waiting to start one.
+        """
+        if self._waiting:
+            return True
+        for digit in self.digits:
+            if digit.animating:
+                return True
+        return False
+
+    def update(self, now: Optional[int] = None) -> bool:
+        """
+        Show the frames that are due for all digits in a transition.
+        Digits started together share frame deadlines so they are all
+        updated in the same call. Call this regularly from the main loop
+        when using ``non_blocking``.
+
+        :param int now: The current ``time.monotonic_ns()`` value. It will be
+          read if not passed in.
+
+        :return: True if any digit is still in a transition.
+        """
+        if now is None:
+            now = time.monotonic_ns()
+        if self.frame_adapter is not None:
+            frame_start = time.monotonic_ns()
+
+        self._start_scheduled(now)
+        self._separators.update(now)
+
+        animating = False
+        changed = False
+        for digit in self.digits:
+            if digit.update(now):
+                animating = True
+            if digit.needs_refresh:
+                digit.needs_refresh = False
+                changed = True
+
+        # hand the released animation tilegrids to the next waiting digits
+        if self._waiting and self._anim_pool.start_waiting(now):
+            animating = True
+            changed = True
+
+        # one refresh for all of the digits that changed in this frame
+        if changed:
+            if self._refresher is None:
+                # left for a parent that refreshes the display
+                self.needs_refresh = True
+            elif animating:
+                self._refresher.refresh()
+            else:
+                self._refresher.end()
+
+            # time taken to show this frame of every flipping digit
+            if self.frame_adapter is not None:
+                self.frame_adapter.note_frame(time.monotonic_ns() - frame_start)
+        return animating
+
+    def _start_scheduled(self, now: int) -> None:
+        """
+        Start the change waiting for `schedule_time()` if it is due. It starts
+        from its planned start time, so it still ends on time if this call is late.
+
+        :param int now: The current ``time.monotonic_ns()`` value
+        """
+        if self._scheduled is not None and now >= self._scheduled[0]:
+            start, values = self._scheduled
+            self._scheduled = None
+            self.set_time(*values, now=start)
+
+    def next_frame_time(self) -> Optional[int]:
+        """
+        The ``time.monotonic_ns()`` value at which `update()` will have
+        something new to show for any digit or a scheduled change is due to
+        start, None if neither is coming.
+        """
+        next_frame = None if self._scheduled is None else self._scheduled[0]
+        for digit in self.digits:
+            if digit.animating:
+                digit_next_frame = digit.next_frame_time()
+                if next_frame is None or digit_next_frame < next_frame:
+                    next_frame = digit_next_frame
+        return next_frame
+
+    def time_until_next_frame(self, now: Optional[int] = None) -> float:
+        """
+        Seconds remaining until the next frame of any digit or a scheduled
+        change is due, 0 if one is already due or neither is coming.
+
+        :param int now: The current ``time.monotonic_ns()`` value. It will be
+          read if not passed in.
+        """
+        if now is None:
+            now = time.monotonic_ns()
+
+        next_frame = self.next_frame_time()
+        if next_frame is None or next_frame <= now:
+            return 0
+        return (next_frame - now) / 1_000_000_000
+
+    def calibrate(
+        self,
+        display: Optional["BusDisplay"] = None,
+        target_flip_duration: Optional[float] = None,
+        show_flips: bool = False,
+    ) -> dict:
+        """
+        Measure how long a frame takes on this board and display, and pick the
+        animation timing to match. Call it once at startup, with the clock at its
+        final position and scale. Every digit plays one flip to the value it shows
+        while the clock is hidden, the tile writes of each frame and the refresh
+        that shows the clock again are timed, and the frame delay and stride are
+        chosen so a flip takes ``target_flip_duration``, skipping frames if needed.
+
+        :param BusDisplay display: The display the clock is shown on. Defaults to
+          the ``display`` passed to the constructor.
+        :param float target_flip_duration: Total time in seconds that a flip should
+          take. Defaults to the current ``flip_duration`` of the digits.
+        :param bool show_flips: Play the measured flips visibly and time the refresh of
+          every frame instead, exact rather than an upper bound. Default is False.
+
+        :return: The measurements and chosen settings, also stored as ``calibration``.
+          A dict with ``write_time``, ``refresh_time`` and ``frame_time`` in seconds
+          per frame, and the chosen ``anim_delay``, ``frame_stride`` and
+          ``flip_duration``.
+        """
+        if self.animating:
+            raise RuntimeError("Can't calibrate while digits are flipping")
+        if target_flip_duration is None:
+            target_flip_duration = self.digits[0].flip_duration
+        if display is None and self._refresher is not None:
+            display = self._refresher.display
+
+        # a shared pool only has tilegrids for some of the digits at once
+        measured = self.digits
+        if self._anim_pool is not None:
+            measured = measured[: self._anim_pool.available]
+
+        self.calibration = calibrate_digits(
+            self.digits,
+            measured,
+            display,
+            target_flip_duration,
+            self.frame_adapter,
+            None if show_flips else self,
+        )
+        self.anim_delay = self.calibration["anim_delay"]
+        if display is None:
+            # left for a parent that refreshes the display
+            self.needs_refresh = True
+        return self.calibration
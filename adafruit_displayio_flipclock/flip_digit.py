@@ -24,15 +24,28 @@ Implementation Notes
   https://circuitpython.org/downloads
 """
 
-import gc
 try:
-    from typing import Optional  # pylint: disable=unused-import
+    from typing import Optional, Sequence, Tuple, Union
     from displayio import Bitmap
+    from adafruit_displayio_flipclock.sprite_atlas import SpriteAtlas
+    from adafruit_displayio_flipclock.anim_pool import AnimationTileGridPool
+    from busdisplay import BusDisplay
 except ImportError:
     pass
 import time
 from adafruit_displayio_layout.widgets.widget import Widget
 from displayio import TileGrid, Palette  # pylint: disable=ungrouped-imports
+from adafruit_displayio_flipclock.display_refresh import (  # pylint: disable=ungrouped-imports
+    DisplayRefresher,
+)
+from adafruit_displayio_flipclock.flip_timing import FlipTiming
+from adafruit_displayio_flipclock.frame_adapter import FrameAdapter
+from adafruit_displayio_flipclock.frame_tables import (
+    anim_frame_table,
+    static_index_table,
+)
+from adafruit_displayio_flipclock.layer_tilegrids import make_layer_tilegrids
+
 
 class FlipDigit(Widget):
     """
@@ -58,13 +71,61 @@ class FlipDigit(Widget):
       which is the number contained in the example spritesheets.
     :param float anim_delay: Time in seconds to wait between animation frames.
       Default value is 0.02 seconds
-    :param bool dynamic_fading: Whether to use PaleteFadder to dynamically adjust brightness.
+    :param bool dynamic_fading: Whether to use faded palettes to dynamically adjust brightness.
     :param float brighter_level: Brightness modifier value to use for the brightest
       portion of the aniatmions. Valid range is 0.0 - 1.0.
     :param float medium_level: Brightness modifier value to use for the standard
       portion of the aniatmions. And the static digit sprites. Valid range is 0.0 - 1.0.
     :param float darker_level: Brightness modifier value to use for the
       darkest "shadow" portion of the aniatmions. Valid range is 0.0 - 1.0.
+    :param bool non_blocking: When True setting ``value`` only starts the transition
+      and `update()` or `advance()` must be called to play the animation frames.
+      Default is False which plays the whole animation before returning.
+    :param float flip_duration: Total time in seconds for a transition, both halves
+      included. Frames are shown at deadlines spread evenly over this time and frames
+      are skipped when rendering falls behind. Default is
+      ``anim_delay * anim_frame_count * 2``.
+    :param SpriteAtlas atlas: Optional description of the spritesheet layout written by
+      the spritesheet generator. The sheets are checked against it and its sprite index
+      tables are used. See `from_atlas()`.
+    :param int blank_tile: Index of a fully transparent sprite in the animation sheets.
+      If set it is shown instead of hiding the animation tilegrids. Defaults to the
+      blank tile of the atlas if there is one.
+    :param tuple tilegrids: Optional (top static, bottom static, top animation,
+      bottom animation) TileGrids owned by a parent widget and shared with other digits.
+      The digit draws into tile ``tile_index`` of each and doesn't create its own.
+      Requires ``blank_tile``. The bottom static half is not shaded in this mode.
+    :param int tile_index: The tile of the shared ``tilegrids`` that this digit uses.
+    :param BusDisplay display: Optional display to refresh explicitly. Auto refresh is
+      turned off during transitions and the display is refreshed exactly once per
+      animation frame, after all layers have been updated.
+    :param int target_frames_per_second: Frame rate cap for the explicit refreshes.
+      Only used with ``display``.
+    :param AnimationTileGridPool anim_pool: Optional pool to borrow the animation
+      TileGrids from while flipping instead of creating them. The pool TileGrids must
+      be in the same Group as this digit.
+    :param int shading_steps: Number of brightness levels in an optional shading ramp
+      for each animation half. The top half flap fades from ``medium_level`` to
+      ``darker_level`` as it turns and the bottom half flap from ``darker_level`` to
+      ``brighter_level``. The palettes are created up front and each frame only
+      swaps the palette of the animation TileGrid. Requires ``dynamic_fading``.
+      Default is None, which uses one palette per half.
+    :param bool adaptive: Watch how often new values arrive and how long frames take,
+      and show fewer frames, or swap instantly, when the next value would arrive
+      before a full flip ends. Full animations come back when updates slow down.
+      See `FrameAdapter`. Default is False.
+    :param FrameAdapter frame_adapter: Optional adapter shared with other digits, instead
+      of one of the digit's own. Its owner measures the frame times and notes each
+      update once, with `FrameAdapter.note_update()`.
+    :param easing: Timing of the frames within ``flip_duration``. The name of a curve
+      in ``frame_tables.EASINGS``, such as ``"gravity"`` for a flap that falls faster
+      and faster or ``"bounce"`` for one that bounces back up after landing, or a
+      list with the relative time to show each frame of both halves for, top
+      half first. The frame times are computed once, `update()` only compares
+      integers against them. Default is None, which spaces the frames evenly.
+
+    Values set while a transition is running don't queue up, only the newest one
+    is kept, see `start_transition()`.
     """
 
     # pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
@@ -117,244 +178,804 @@ class FlipDigit(Widget):
         medium_level: float = 0.8,
         h_pos: int = 0,
         v_pos: int = 0,
+        non_blocking: bool = False,
+        flip_duration: Optional[float] = None,
+        atlas: Optional[SpriteAtlas] = None,
+        blank_tile: Optional[int] = None,
+        tilegrids: Optional[Tuple[TileGrid, TileGrid, TileGrid, TileGrid]] = None,
+        tile_index: int = 0,
+        display: Optional["BusDisplay"] = None,
+        target_frames_per_second: Optional[int] = None,
+        anim_pool: Optional[AnimationTileGridPool] = None,
+        shading_steps: Optional[int] = None,
+        adaptive: bool = False,
+        frame_adapter: Optional[FrameAdapter] = None,
+        easing: Optional[Union[str, Sequence[float]]] = None,
     ) -> None:
 
         # initialize parent Widget object
         super().__init__(width=tile_width, height=tile_height * 2)
 
-        # setup for dynamic fading (or not if it's disabled)
-        self.dynamic_fading = dynamic_fading
-        static_palette = None
-        bottom_palette = None
-        top_palette = None
-        if dynamic_fading:
-            # pylint: disable=import-outside-toplevel
-            from cedargrove_palettefader import (
-                PaletteFader,
-            )
-            gc.collect()
-
-            self.static_fader = PaletteFader(
-                static_spritesheet_palette, medium_level, 1.0
-            )
-            gc.collect()
-            
-            self.darker_static_fader = PaletteFader(
-                static_spritesheet_palette, darker_level, 1.0
-            )
-            gc.collect()
-            
-            self.bottom_anim_fader = PaletteFader(
-                bottom_anim_palette, brighter_level, 1.0
-            )
-            gc.collect()
-            
-            self.top_anim_fader = PaletteFader(top_anim_palette, darker_level, 1.0)
-            gc.collect()
-            
-            static_palette = self.static_fader.palette
-            bottom_palette = self.bottom_anim_fader.palette
-            top_palette = self.top_anim_fader.palette
-        else:
-            static_palette = static_spritesheet_palette
-            bottom_palette = bottom_anim_palette
-            top_palette = top_anim_palette
-
         # store animation variables on self for access in other functions
         self.anim_delay = anim_delay
         self.anim_frame_count = anim_frame_count
-        self.max_val = (self.anim_frame_count//2) * 10
-        self.h_pos = h_pos
-        self.v_pos = v_pos
-
-        # top static tilegrid init
-        self.top_static_tilegrid = TileGrid(
+        spritesheets = (
             static_spritesheet,
-            pixel_shader=static_palette,
-            height=1,
-            width=1,
-            tile_width=tile_width,
-            tile_height=tile_height,
-            #x = self.h_pos,
-            y = self.v_pos,
+            top_anim_spritesheet,
+            bottom_anim_spritesheet,
         )
 
-        # bottom static tilegrid init
-        self.bottom_static_tilegrid = TileGrid(
-            static_spritesheet,
-            pixel_shader=static_palette,
-            height=1,
-            default_tile=3,
-            width=1,
-            tile_width=tile_width,
-            tile_height=tile_height,
-            #x = self.h_pos,
-            y = self.v_pos + tile_height,
+        # setup for dynamic fading (or not if it's disabled)
+        self.dynamic_fading = dynamic_fading
+        palettes = self._setup_palettes(
+            (static_spritesheet_palette, top_anim_palette, bottom_anim_palette),
+            (brighter_level, darker_level, medium_level),
+            atlas,
+            shading_steps,
         )
+        self._setup_sprite_tables(atlas, spritesheets, tile_width, tile_height)
 
-        # top animation tilegrid init
-        self.top_anim_tilegrid = TileGrid(
-            top_anim_spritesheet,
-            pixel_shader=top_palette,
-            height=1,
-            width=1,
-            tile_width=tile_width,
-            tile_height=tile_height,
-            #x = self.h_pos,
-            y = self.v_pos,
+        # offsets into the animation table for the running transition
+        self._top_frames_base = 0
+        self._bottom_frames_base = 0
+        self.h_pos = h_pos
+        self.v_pos = v_pos
+        self.non_blocking = non_blocking
+        self.flip_duration = flip_duration
+
+        # blank animation sprite used instead of hiding the animation tilegrids
+        if blank_tile is None and atlas is not None:
+            blank_tile = atlas.blank_tile
+        self.blank_tile = blank_tile
+        self.tile_index = tile_index
+
+        # animation tilegrids are borrowed from the pool while flipping
+        self._anim_pool = anim_pool
+        if anim_pool is not None:
+            if tilegrids is not None:
+                raise ValueError("anim_pool can't be used with shared tilegrids")
+            if anim_pool.blank_tile != blank_tile:
+                raise ValueError("anim_pool must use the same blank_tile as the digit")
+
+        self._setup_tilegrids(
+            tilegrids, spritesheets, palettes, (tile_width, tile_height)
+        )
+
+        # variable to hold current value
+        self._value = 0
+        # newest value set during the bottom half, flipped to next
+        self._pending = None
 
+        # variables used during animation frames
+        self.current_animation_frame = 0
+        self.top_animating_value = None
+        self.bottom_animating_value = None
+        # frames advanced per step when there is no adapter, see FlipClock.calibrate()
+        self.frame_stride = 1
+        # steps and deadlines of the running transition
+        self._timing = FlipTiming(anim_frame_count, easing)
+
+        # plans shorter flips when values arrive faster than they flip
+        self._own_adapter = False
+        if adaptive and frame_adapter is None:
+            frame_adapter = FrameAdapter()
+            # nobody else notes the updates and frames of our own adapter
+            self._own_adapter = True
+        self.frame_adapter = frame_adapter
+
+        # explicit display refreshes, one per animation frame
+        self._refresher = (
+            DisplayRefresher(display, target_frames_per_second)
+            if display is not None
+            else None
         )
+        # True when tiles have changed since the display was last refreshed
+        self.needs_refresh = False
 
-        # bottom animation tilegrid init
-        self.bottom_anim_tilegrid = TileGrid(
-            bottom_anim_spritesheet,
-            pixel_shader=bottom_palette,
-            height=1,
-            width=1,
-            tile_width=tile_width,
-            tile_height=tile_height,
-            #x = self.h_pos,
-            y = self.v_pos + tile_height,
+    def _setup_palettes(
+        self,
+        source_palettes: Tuple[Palette, Palette, Palette],
+        levels: Tuple[float, float, float],
+        atlas: Optional[SpriteAtlas],
+        shading_steps: Optional[int],
+    ) -> Tuple[Palette, Palette, Palette]:
+        """
+        Get the faded palettes, and the shading ramps, when dynamic fading is on.
+
+        :param tuple source_palettes: The static, top and bottom animation palettes
+        :param tuple levels: The brighter, darker and medium brightness levels
+        :param SpriteAtlas atlas: Optional atlas with baked faded palettes
+        :param int shading_steps: Optional number of levels in each shading ramp
+
+        :return: The static, top animation and bottom animation palettes to draw with
+        """
+        # palette of the animation tilegrids for each frame of the halves
+        self._top_ramp = None
+        self._bottom_ramp = None
+        if not self.dynamic_fading:
+            if shading_steps is not None:
+                raise ValueError("shading_steps requires dynamic_fading")
+            return source_palettes
+
+        # pylint: disable=import-outside-toplevel
+        from adafruit_displayio_flipclock.palette_cache import (
+            digit_palettes,
+            ramp_palettes,
         )
 
-        # add static tilegrids to parent Group
-        self.append(self.top_static_tilegrid)
-        self.append(self.bottom_static_tilegrid)
+        # use the faded palettes baked by the spritesheet generator
+        if atlas is not None:
+            atlas.load_baked_palettes(*source_palettes)
+
+        # faded palettes are shared with all other digits using
+        # the same source palettes and levels
+        (
+            self.static_palette,
+            self.darker_static_palette,
+            top_palette,
+            bottom_palette,
+        ) = digit_palettes(*source_palettes, *levels)
+
+        if shading_steps is not None:
+            brighter_level, darker_level, medium_level = levels
+            self._top_ramp = ramp_palettes(
+                source_palettes[1],
+                medium_level,
+                darker_level,
+                self.anim_frame_count,
+                shading_steps,
+            )
+            self._bottom_ramp = ramp_palettes(
+                source_palettes[2],
+                darker_level,
+                brighter_level,
+                self.anim_frame_count,
+                shading_steps,
+            )
+        return self.static_palette, top_palette, bottom_palette
 
-        # set y position of bottom static tilegrid
-        #self.bottom_static_tilegrid.y = self.v_pos + tile_height
+    def _setup_sprite_tables(
+        self,
+        atlas: Optional[SpriteAtlas],
+        spritesheets: Tuple[Bitmap, Bitmap, Bitmap],
+        tile_width: int,
+        tile_height: int,
+    ) -> None:
+        """
+        Look up the sprite index tables, from the atlas if there is one.
 
-        # hide the animation tilegrids
-        self.top_anim_tilegrid.hidden = True
-        self.bottom_anim_tilegrid.hidden = True
+        :param SpriteAtlas atlas: Optional description of the spritesheet layout
+        :param tuple spritesheets: The static, top and bottom animation spritesheets
+        :param int tile_width: Width in pixels of the animation sprite tiles
+        :param int tile_height: Height in pixels of the animation sprite tiles
+        """
+        if atlas is not None:
+            if (tile_width, tile_height, self.anim_frame_count) != (
+                atlas.tile_width,
+                atlas.tile_height,
+                atlas.anim_frame_count,
+            ):
+                raise ValueError(
+                    "tile_width, tile_height and anim_frame_count "
+                    "must match the sprite atlas"
+                )
+            # reject sheets that don't match the layout up front
+            atlas.validate(*spritesheets)
+            self.max_val = atlas.anim_tile_count
+            # sprite index lookup tables computed when the atlas was loaded
+            self._anim_frames = atlas.anim_frames
+            self._top_static_indexes = atlas.top_static_indexes
+            self._bottom_static_indexes = atlas.bottom_static_indexes
+        else:
+            self.max_val = (self.anim_frame_count // 2) * 10
+            # sprite index lookup tables shared by all digits with the same layout
+            self._anim_frames = anim_frame_table(self.anim_frame_count, self.max_val)
+            self._top_static_indexes = static_index_table(
+                FlipDigit.TOP_HALF_SPRITE_INDEX_MAP
+            )
+            self._bottom_static_indexes = static_index_table(
+                FlipDigit.BOTTOM_HALF_SPRITE_INDEX_MAP
+            )
 
-        # add the animation tilegrids to parent Group
-        self.append(self.top_anim_tilegrid)
-        self.append(self.bottom_anim_tilegrid)
+    def _setup_tilegrids(
+        self,
+        tilegrids: Optional[Tuple[TileGrid, TileGrid, TileGrid, TileGrid]],
+        spritesheets: Tuple[Bitmap, Bitmap, Bitmap],
+        palettes: Tuple[Palette, Palette, Palette],
+        tile_size: Tuple[int, int],
+    ) -> None:
+        """
+        Use the shared layer TileGrids, or create the digit's own and add them.
 
-        # set y position of bottom animation tilegrid
-        #self.bottom_anim_tilegrid.y = self.v_pos + tile_height
+        :param tuple tilegrids: Optional layer TileGrids owned by a parent widget
+        :param tuple spritesheets: The static, top and bottom animation spritesheets
+        :param tuple palettes: The static, top and bottom animation palettes
+        :param tuple tile_size: Width and height in pixels of the animation sprite tiles
+        """
+        self._shared_tilegrids = tilegrids is not None
+        if tilegrids is not None:
+            # shared layer mode, the tilegrids belong to the parent
+            # and this digit only updates its own tile in each of them
+            if self.blank_tile is None:
+                raise ValueError("Shared tilegrids need a blank_tile")
+            (
+                self.top_static_tilegrid,
+                self.bottom_static_tilegrid,
+                self.top_anim_tilegrid,
+                self.bottom_anim_tilegrid,
+            ) = tilegrids
+            # the static palette is shared by every digit in the layer so
+            # the bottom half can't be shaded for just this digit
+            self._shade_bottom_static = False
+            return
+
+        (
+            self.top_static_tilegrid,
+            self.bottom_static_tilegrid,
+            self.top_anim_tilegrid,
+            self.bottom_anim_tilegrid,
+        ) = make_layer_tilegrids(
+            spritesheets[0],
+            palettes[0],
+            spritesheets[1],
+            palettes[1],
+            spritesheets[2],
+            palettes[2],
+            *tile_size,
+            y=self.v_pos,
+            static_default_tiles=(
+                self._top_static_indexes[0],
+                self._bottom_static_indexes[0],
+            ),
+            blank_tile=self.blank_tile,
+            anim_layers=self._anim_pool is None,
+        )
+        self._shade_bottom_static = self.dynamic_fading
 
-        # variable to hold current value
-        self._value = 0
+        # add static tilegrids to parent Group
+        self.append(self.top_static_tilegrid)
+        self.append(self.bottom_static_tilegrid)
 
-        # variables used during animation frames
-        self.current_animation_frame = 0
-        self.top_animating_value = None
-        self.bottom_animating_value = None
+        # add the animation tilegrids to parent Group
+        if self._anim_pool is None:
+            self.append(self.top_anim_tilegrid)
+            self.append(self.bottom_anim_tilegrid)
+
+    @classmethod
+    def from_atlas(
+        cls,
+        atlas: SpriteAtlas,
+        static_spritesheet: Bitmap,
+        static_spritesheet_palette: Palette,
+        top_anim_spritesheet: Bitmap,
+        top_anim_palette: Palette,
+        bottom_anim_spritesheet: Bitmap,
+        bottom_anim_palette: Palette,
+        **kwargs,
+    ) -> "FlipDigit":
+        """
+        Create a FlipDigit using the tile size, frame count and sprite indexes
+        from a `SpriteAtlas`. Raises ValueError if the spritesheets don't match it.
+
+        :param SpriteAtlas atlas: Description of the spritesheet layout.
+        :param Bitmap static_spritesheet: Spritesheet image of static numbers sprites.
+        :param Palette static_spritesheet_palette: Palette to use with the static sprite sheet.
+        :param Bitmap top_anim_spritesheet: Spritesheet image of top half animation sprites.
+        :param Palette top_anim_palette: Palette to use with the top half animation sprites.
+        :param Bitmap bottom_anim_spritesheet: Spritesheet image of bottom half animation sprites.
+        :param Palette bottom_anim_palette: Palette to use with the bottom half animation sprites.
+
+        Any other keyword arguments are passed on to the constructor.
+        """
+        return cls(
+            static_spritesheet,
+            static_spritesheet_palette,
+            top_anim_spritesheet,
+            top_anim_palette,
+            bottom_anim_spritesheet,
+            bottom_anim_palette,
+            atlas.tile_width,
+            atlas.tile_height,
+            anim_frame_count=atlas.anim_frame_count,
+            atlas=atlas,
+            **kwargs,
+        )
 
     @property
     def value(self) -> int:
         """
-        The current value of the digit as an integer.
+        The current value of the digit as an integer. During a transition
+        this is the newest value that was set.
         """
+        if self._pending is not None:
+            return self._pending
         return self._value
-    
+
     @value.setter
     def value(self, new_value: int) -> None:
         """
         Set a new value to show on the flip digit,
         animating as necessary to change to the
         new value.
+
+        If ``non_blocking`` is enabled this only starts the transition,
+        call `update()` or `advance()` to play the animation frames.
         """
         # ignore new_value if it's the same as current
         if new_value != self.value:
+            # set up the transition to the new value
+            self.start_transition(new_value)
 
-            # if the new value is valid
-            if (
-                isinstance(new_value, int)
-                and 0 <= new_value <= 9
-                and new_value in FlipDigit.VALID_CHARACTERS
-            ):
+            # in blocking mode play all of the frames right away
+            if not self.non_blocking:
+                while self.update():
+                    # sleep until the next frame is due
+                    time.sleep(self.time_until_next_frame())
 
-                # store current value to use later
-                _old_value = self.value
+    async def set_value(self, new_value: int) -> None:
+        """
+        Coroutine that changes to a new value, awaiting
+        ``asyncio.sleep()`` between animation frames so other
+        tasks can run during the flip. Requires the ``asyncio`` library.
 
-                # update the value variable
-                self._value = new_value
+        :param int new_value: The new value to show, int 0-9
+        """
+        # pylint: disable=import-outside-toplevel
+        import asyncio
 
-                # set the first frame of the animation spritesheet into
-                # top animation tilegrid
-                #self.top_anim_tilegrid[0] = self.bounds_check(_old_value * self.anim_frame_count)
-                n = _old_value * self.anim_frame_count
-                self.top_anim_tilegrid[0] = n if n < self.max_val else self.max_val -1
+        # ignore new_value if it's the same as current
+        if new_value != self.value:
+            # set up the transition to the new value
+            self.start_transition(new_value)
 
-                # show the top animation tilegrid
-                self.top_anim_tilegrid.hidden = False
+            # play the frames, yielding to other tasks between each
+            while self.update():
+                await asyncio.sleep(self.time_until_next_frame())
 
-                # set the top static tilegrid to its new value
-                # This is hidden behind the top animation tilegrid initially
-                self.top_static_tilegrid[0] = FlipDigit.TOP_HALF_SPRITE_INDEX_MAP[
-                    new_value
-                ]
+    def set_palettes(
+        self,
+        static_palette: Palette,
+        darker_static_palette: Palette,
+        top_palette: Palette,
+        bottom_palette: Palette,
+        top_ramp: Optional[Tuple[Palette, ...]] = None,
+        bottom_ramp: Optional[Tuple[Palette, ...]] = None,
+    ) -> None:
+        """
+        Switch to a different set of palettes, for example a dimmed one, by
+        reassigning the ``pixel_shader`` of the digit's TileGrids. Shared and
+        pooled TileGrids are left to their owner.
+
+        :param Palette static_palette: Palette for the static sprites.
+        :param Palette darker_static_palette: Palette for the shadowed bottom static
+          half during transitions.
+        :param Palette top_palette: Palette for the top half animation sprites.
+        :param Palette bottom_palette: Palette for the bottom half animation sprites.
+        :param tuple top_ramp: Optional top half shading ramp, one palette per frame.
+        :param tuple bottom_ramp: Optional bottom half shading ramp, one palette per frame.
+        """
+        # pylint: disable=too-many-arguments
+        self.static_palette = static_palette
+        self.darker_static_palette = darker_static_palette
+        self._top_ramp = top_ramp
+        self._bottom_ramp = bottom_ramp
+
+        if self._shared_tilegrids:
+            return
+
+        self.top_static_tilegrid.pixel_shader = static_palette
+        if self._shade_bottom_static and self.animating:
+            self.bottom_static_tilegrid.pixel_shader = darker_static_palette
+        else:
+            self.bottom_static_tilegrid.pixel_shader = static_palette
+        if self._anim_pool is None:
+            self.top_anim_tilegrid.pixel_shader = top_palette
+            self.bottom_anim_tilegrid.pixel_shader = bottom_palette
 
-                # if dynamic fading is enabled
-                if self.dynamic_fading:
-                    # set the bottom static tilegrid to use the darker color palette
-                    self.bottom_static_tilegrid.pixel_shader = (
-                        self.darker_static_fader.palette
-                    )
+    def set_bitmaps(
+        self,
+        static_spritesheet: Optional[Bitmap] = None,
+        top_anim_spritesheet: Optional[Bitmap] = None,
+        bottom_anim_spritesheet: Optional[Bitmap] = None,
+    ) -> None:
+        """
+        Switch to different spritesheets with the same layout, for example
+        for another font, by reassigning the ``bitmap`` of the digit's TileGrids.
+        The value and any running transition are kept. Shared and pooled
+        TileGrids are left to their owner.
+
+        :param Bitmap static_spritesheet: Spritesheet for the static sprites.
+          None keeps the current one.
+        :param Bitmap top_anim_spritesheet: Spritesheet for the top half animation
+          sprites. None keeps the current one.
+        :param Bitmap bottom_anim_spritesheet: Spritesheet for the bottom half
+          animation sprites. None keeps the current one.
+        """
+        if self._shared_tilegrids:
+            return
+
+        if static_spritesheet is not None:
+            self.top_static_tilegrid.bitmap = static_spritesheet
+            self.bottom_static_tilegrid.bitmap = static_spritesheet
+        if self._anim_pool is None:
+            if top_anim_spritesheet is not None:
+                self.top_anim_tilegrid.bitmap = top_anim_spritesheet
+            if bottom_anim_spritesheet is not None:
+                self.bottom_anim_tilegrid.bitmap = bottom_anim_spritesheet
 
-                # Run the top half flip animation
-                self.top_flip_animate(value=_old_value)
+    @property
+    def animating(self) -> bool:
+        """
+        True while a transition is in progress.
+        """
+        return self.bottom_animating_value is not None
 
-                # hide the top animation tilegrid
-                self.top_anim_tilegrid.hidden = True
+    @property
+    def flip_duration(self) -> float:
+        """
+        Total time in seconds that a transition takes, covering both
+        the top and bottom half animations. Defaults to
+        ``anim_delay * anim_frame_count * 2`` if it was not set.
+        """
+        return self._flip_duration_ns / 1_000_000_000
 
-                # set the bottom animation tilegrid to it's new value
-                #self.top_anim_tilegrid[0] = self.bounds_check(new_value * self.anim_frame_count)
-                n = new_value * self.anim_frame_count
-                self.top_anim_tilegrid[0] = n if n < self.max_val else self.max_val -1
+    @flip_duration.setter
+    def flip_duration(self, new_duration: Optional[float]) -> None:
+        if new_duration is None:
+            new_duration = self.anim_delay * self.anim_frame_count * 2
+        if new_duration < 0:
+            raise ValueError("flip_duration must not be negative")
+        self._flip_duration_ns = int(new_duration * 1_000_000_000)
 
-                # show the bottom animation tilegrid
-                self.bottom_anim_tilegrid.hidden = False
+    def planned_duration(self, end_time: int) -> int:
+        """
+        Nanoseconds that a flip ending at ``end_time`` is planned to take. That is
+        ``flip_duration``, or the shorter flip that the ``frame_adapter`` would
+        plan for a value arriving at the start of the flip.
 
-                # run the bottom half flip animation
-                self.bottom_flip_animate(value=new_value)
+        :param int end_time: The ``time.monotonic_ns()`` value the flip should end at
+        """
+        adapter = self.frame_adapter
+        if adapter is None:
+            return self._flip_duration_ns
+        # the start depends on the plan, begin from the latest one
+        duration = (
+            self._flip_duration_ns if adapter.duration is None else adapter.duration
+        )
+        return adapter.expected_plan(
+            self.anim_frame_count, self._flip_duration_ns, end_time - duration
+        )[1]
 
-                # set the bottom static tilegrid to new value sprite index
-                self.bottom_static_tilegrid[0] = FlipDigit.BOTTOM_HALF_SPRITE_INDEX_MAP[
-                    new_value
-                ]
+    def start_transition(self, new_value: int, now: Optional[int] = None) -> None:
+        """
+        Begin changing to a new value without playing any animation frames.
+        The animation is played by calling `advance()` or `update()`.
+
+        If a transition is already in progress only the newest value is kept.
+        During the top half the running transition is retargeted to it, the
+        falling flap keeps moving and the new value is shown behind it. During
+        the bottom half the flap finishes falling and then one transition to
+        the newest value starts. Values are never flipped through one by one.
+
+        :param int new_value: The new value to show, int 0-9
+        :param int now: The ``time.monotonic_ns()`` value that the transition
+          starts at. It will be read if not passed in.
+        """
+        # if the new value is invalid
+        if not (
+            isinstance(new_value, int)
+            and 0 <= new_value <= 9
+            and new_value in FlipDigit.VALID_CHARACTERS
+        ):
+            raise ValueError(
+                f"Invalid new value: {type(new_value)}: {new_value}. Must be int 0-9"
+            )
 
-                # hide the bottom animation tilegrid
-                # which reveals the bottom static tilegrid
-                self.bottom_anim_tilegrid.hidden = True
+        if now is None:
+            now = time.monotonic_ns()
+        if self._own_adapter:
+            self.frame_adapter.note_update(now)
 
-                # if dynamic faiding is enabled
-                if self.dynamic_fading:
-                    # set the bottom static tilegrid back to the medium brightness palette
-                    self.bottom_static_tilegrid.pixel_shader = self.static_fader.palette
+        # a transition is still running, keep only the newest value
+        if self.bottom_animating_value is not None:
+            self._retarget(new_value, now)
+            return
 
-            else:  # new_value was invalid
-                raise ValueError(
-                    f"Invalid new value: {type(new_value)}: {new_value}. Must be int 0-9"
-                )
+        self._start(new_value, now)
 
-    def top_flip_animate(self, value: int) -> None:
+    def _start(self, new_value: int, now: int) -> None:
         """
-        Blocking function that displays the top animation sprites sequentially
-        sleeping for anim_delay between each.
+        Set up the transition to a new value.
+
+        :param int new_value: The new value to show, int 0-9
+        :param int now: The ``time.monotonic_ns()`` value that the transition starts at
         """
-        # loop over frame count
-        for i in range(self.anim_frame_count):
-            # set the top animation sprite to current animation frame sprite index
-            #self.top_anim_tilegrid[0] = self.bounds_check(i + (value * self.anim_frame_count))
-            n = i + (value * self.anim_frame_count)
-            self.top_anim_tilegrid[0] = n if n < self.max_val else self.max_val -1
-            # sleep for delay
-            time.sleep(self.anim_delay)
+        # borrow a pair of animation tilegrids and move it over this digit
+        if self._anim_pool is not None:
+            pair = self._anim_pool.acquire(self.x, self.y + self.v_pos)
+            if pair is None:
+                raise RuntimeError("No free animation TileGrids in the pool")
+            self.top_anim_tilegrid, self.bottom_anim_tilegrid = pair
+
+        # store current value to use later
+        _old_value = self.value
+
+        # update the value variable
+        self._value = new_value
+
+        # stop auto refresh while the transition runs
+        if self._refresher is not None:
+            self._refresher.begin()
+
+        # set the animation state
+        self.top_animating_value = _old_value
+        self.bottom_animating_value = new_value
+        self.current_animation_frame = 0
+        self.needs_refresh = True
+
+        # the configured frames unless the adapter plans a shorter flip
+        self._timing.begin(
+            now, self._flip_duration_ns, self.frame_stride, self.frame_adapter
+        )
+        self._top_frames_base = _old_value * self.anim_frame_count
+        # bottom half frames are numbered after the top half frames
+        self._bottom_frames_base = (new_value - 1) * self.anim_frame_count
+
+        # set the first frame of the animation spritesheet into
+        # top animation tilegrid
+        self.top_anim_tilegrid[self.tile_index] = self._anim_frames[
+            self._top_frames_base
+        ]
+        if self._top_ramp is not None:
+            self.top_anim_tilegrid.pixel_shader = self._top_ramp[0]
+
+        # show the top animation tilegrid
+        if self.blank_tile is None:
+            self.top_anim_tilegrid.hidden = False
+
+        # set the top static tilegrid to its new value
+        # This is hidden behind the top animation tilegrid initially
+        self.top_static_tilegrid[self.tile_index] = self._top_static_indexes[new_value]
+
+        # if dynamic fading is enabled
+        if self._shade_bottom_static:
+            # set the bottom static tilegrid to use the darker color palette
+            self.bottom_static_tilegrid.pixel_shader = self.darker_static_palette
+
+    def _retarget(self, new_value: int, now: int) -> None:
+        """
+        Change the target of the running transition to a newer value.
 
-    def bottom_flip_animate(self, value: int) -> None:
+        :param int new_value: The new value to show, int 0-9
+        :param int now: The ``time.monotonic_ns()`` value of the change
         """
-        Blocking function that displays the bottom animation sprites sequentially
-        sleeping for anim_delay between each.
+        self._pending = None
+        if self.top_animating_value is None:
+            # the bottom flap already shows the old target, flip again after it
+            if new_value != self._value:
+                self._pending = new_value
+            return
+
+        if new_value == self.top_animating_value:
+            # back to the value the flip started from, cancel it
+            self.top_static_tilegrid[self.tile_index] = self._top_static_indexes[
+                new_value
+            ]
+            self._value = new_value
+            self.bottom_animating_value = new_value
+            self._finish_transition()
+            self._refresh_display()
+            return
+
+        # the top flap keeps falling and reveals the new value
+        self._value = new_value
+        self.bottom_animating_value = new_value
+        self._bottom_frames_base = (new_value - 1) * self.anim_frame_count
+        self.top_static_tilegrid[self.tile_index] = self._top_static_indexes[new_value]
+        self.needs_refresh = True
+
+        # values arrive faster than the old plan assumed, plan the rest again
+        if self.frame_adapter is not None:
+            self._timing.replan(
+                now, self._flip_duration_ns, self.frame_stride, self.frame_adapter
+            )
+
+    def _start_pending(self, now: Optional[int] = None) -> bool:
         """
-        # loop over frame count
-        for i in range(self.anim_frame_count):
+        Start the transition to the value that was set during the bottom
+        half of the one that just finished.
+
+        :param int now: The ``time.monotonic_ns()`` value that the transition starts at.
+          It will be read if not passed in.
+
+        :return: True if a transition was started
+        """
+        if self._pending is None:
+            return False
+        new_value = self._pending
+        self._pending = None
+        self._start(new_value, time.monotonic_ns() if now is None else now)
+        return True
+
+    def advance(self) -> bool:
+        """
+        Show the next frame of the current transition, ignoring timing.
+        The call after the last frame has been shown completes the transition.
+
+        :return: True if the transition is still in progress, False once it
+          is complete or if there was nothing to animate.
+        """
+        # nothing to do if no transition is running
+        if self.bottom_animating_value is None:
+            return False
+
+        # all frames have been shown already
+        timing = self._timing
+        if timing.next_step >= timing.step_count:
+            self._finish_transition()
+            started = self._start_pending()
+            self._refresh_display()
+            return started
+
+        self._show_frame(timing.step_frame(timing.next_step))
+        timing.next_step += 1
+        self._refresh_display()
+        return True
+
+    def update(self, now: Optional[int] = None) -> bool:
+        """
+        Show the animation frame that is due according to the time elapsed
+        since the transition started. If rendering has fallen behind, the
+        frames in between are skipped so the transition always completes
+        in ``flip_duration``, or the shorter duration planned by an adaptive
+        digit. Call this regularly from the main loop when using ``non_blocking``.
+
+        :param int now: The current ``time.monotonic_ns()`` value. It will be
+          read if not passed in.
+
+        :return: True if the transition is still in progress.
+        """
+        if self.bottom_animating_value is None:
+            return False
+
+        if now is None:
+            now = time.monotonic_ns()
+
+        # latest step whose deadline has passed
+        timing = self._timing
+        step = timing.due_step(now)
+
+        # the whole duration has passed, show the new value
+        if step is None:
+            self._finish_transition()
+            # flip on to a value that was set during the bottom half
+            started = self._start_pending(now)
+            self._refresh_display()
+            return started
+
+        # not time for the next frame yet
+        if step < timing.next_step:
+            return True
+
+        if self._own_adapter:
+            frame_start = time.monotonic_ns()
+        self._show_frame(timing.step_frame(step))
+        timing.next_step = step + 1
+        self._refresh_display()
+        if self._own_adapter:
+            self.frame_adapter.note_frame(time.monotonic_ns() - frame_start)
+        return True
+
+    def next_frame_time(self) -> int:
+        """
+        The ``time.monotonic_ns()`` value at which `update()` will have
+        something new to show. Only meaningful while `animating`.
+        """
+        return self._timing.next_frame_time()
+
+    def time_until_next_frame(self, now: Optional[int] = None) -> float:
+        """
+        Seconds remaining until the next frame is due, 0 if it is already due.
+
+        :param int now: The current ``time.monotonic_ns()`` value. It will be
+          read if not passed in.
+        """
+        if now is None:
+            now = time.monotonic_ns()
+        remaining = self.next_frame_time() - now
+        return remaining / 1_000_000_000 if remaining > 0 else 0
+
+    def _show_frame(self, frame: int) -> None:
+        """
+        Put an animation frame into the animation tilegrids. Frames
+        0 to anim_frame_count - 1 are the top half, the rest are the
+        bottom half.
+
+        :param int frame: The frame within the whole transition to show
+        """
+        if frame < self.anim_frame_count:
+            # set the top animation sprite to current animation frame sprite index
+            self.top_anim_tilegrid[self.tile_index] = self._anim_frames[
+                self._top_frames_base + frame
+            ]
+            # swap in the precomputed shading for this frame
+            if self._top_ramp is not None:
+                self.top_anim_tilegrid.pixel_shader = self._top_ramp[frame]
+        else:
+            # first frame shown of the bottom half
+            if self.top_animating_value is not None:
+                # hide the top animation tilegrid
+                self._hide_anim_tile(self.top_anim_tilegrid)
+                self.top_animating_value = None
+
+                # show the bottom animation tilegrid
+                if self.blank_tile is None:
+                    self.bottom_anim_tilegrid.hidden = False
+
             # set the bottom animation sprite to current animation frame sprite index
-            #self.bottom_anim_tilegrid[0] = self.bounds_check(i + (value * self.anim_frame_count))
-            n = i + (value * self.anim_frame_count)
-            self.bottom_anim_tilegrid[0] = n if n < self.max_val else self.max_val -1
-            # sleep for delay
-            time.sleep(self.anim_delay)
+            self.bottom_anim_tilegrid[self.tile_index] = self._anim_frames[
+                self._bottom_frames_base + frame
+            ]
+            # swap in the precomputed shading for this frame
+            if self._bottom_ramp is not None:
+                self.bottom_anim_tilegrid.pixel_shader = self._bottom_ramp[
+                    frame - self.anim_frame_count
+                ]
+
+        self.current_animation_frame = frame + 1
+        self.needs_refresh = True
+
+    def _refresh_display(self) -> None:
+        """
+        Refresh the display once if tiles changed and a display was given.
+        Restores auto refresh once the transition is complete.
+        """
+        if self._refresher is not None and self.needs_refresh:
+            self.needs_refresh = False
+            if self.bottom_animating_value is None:
+                self._refresher.end()
+            else:
+                self._refresher.refresh()
+
+    def _finish_transition(self) -> None:
+        """
+        Show the new value in the static tilegrids and hide the animations.
+        """
+        # set the bottom static tilegrid to new value sprite index
+        self.bottom_static_tilegrid[self.tile_index] = self._bottom_static_indexes[
+            self.bottom_animating_value
+        ]
+
+        # hide the animation tilegrids
+        # which reveals the static tilegrids
+        self._hide_anim_tile(self.top_anim_tilegrid)
+        self._hide_anim_tile(self.bottom_anim_tilegrid)
+
+        # give the animation tilegrids back to the pool
+        if self._anim_pool is not None:
+            self._anim_pool.release((self.top_anim_tilegrid, self.bottom_anim_tilegrid))
+            self.top_anim_tilegrid = None
+            self.bottom_anim_tilegrid = None
+
+        # if dynamic faiding is enabled
+        if self._shade_bottom_static:
+            # set the bottom static tilegrid back to the medium brightness palette
+            self.bottom_static_tilegrid.pixel_shader = self.static_palette
+
+        # clear the animation state
+        self.top_animating_value = None
+        self.bottom_animating_value = None
+        self.current_animation_frame = 0
+        self.needs_refresh = True
+
+    def _hide_anim_tile(self, tilegrid: TileGrid) -> None:
+        """
+        Hide this digit in an animation tilegrid, by showing the blank
+        sprite if there is one or else hiding the whole tilegrid.
+
+        :param TileGrid tilegrid: The top or bottom animation tilegrid
+        """
+        if self.blank_tile is None:
+            tilegrid.hidden = True
+        else:
+            tilegrid[self.tile_index] = self.blank_tile
@@ -0,0 +1,202 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.flip_timing`
+================================================================================
+
+Steps and deadlines of a flip transition. Decides which animation frame is due
+at a point in time, from the planned duration, frame stride and easing.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+try:
+    from typing import Optional, Sequence, Union
+    from adafruit_displayio_flipclock.frame_adapter import FrameAdapter
+except ImportError:
+    pass
+
+from adafruit_displayio_flipclock.frame_tables import (
+    BOUNCE_FRAMES,
+    SCHEDULE_SHIFT,
+    frame_schedule,
+)
+
+
+class FlipTiming:
+    """
+    The timing of the running transition of a `FlipDigit`. A transition is split
+    into steps, one per animation frame shown. With a frame stride above 1 each
+    step skips ``frame_stride - 1`` frames, and each half always ends on its last
+    frame. Step deadlines are spread evenly over the duration, or follow the
+    easing curve. The ``"bounce"`` easing adds steps after the last frame that
+    replay the `frame_tables.BOUNCE_FRAMES`.
+
+    :param int anim_frame_count: The number of frames in each animation half.
+    :param easing: Timing of the frames within the duration, the name of a curve in
+      ``frame_tables.EASINGS`` or a list with the relative time to show each frame
+      of both halves for. Default is None, which spaces the steps evenly.
+    """
+
+    def __init__(
+        self,
+        anim_frame_count: int,
+        easing: Optional[Union[str, Sequence[float]]] = None,
+    ) -> None:
+        self.anim_frame_count = anim_frame_count
+
+        # time.monotonic_ns() value the transition started at
+        self.start = 0
+        # duration of the transition in nanoseconds
+        self.duration = 0
+        # frames advanced per step and steps in each half and in total
+        self.frame_stride = 1
+        self.half_steps = anim_frame_count
+        self.step_count = anim_frame_count * 2
+        # the step shown next
+        self.next_step = 0
+
+        # start time of each step, None for evenly spaced steps
+        if easing is not None and not isinstance(easing, str):
+            easing = tuple(easing)
+        # steps of the bottom flap bouncing after it lands
+        self._bounce_steps = len(BOUNCE_FRAMES) if easing == "bounce" else 0
+        self._easing = easing
+        self._schedule = (
+            None if easing is None else frame_schedule(easing, anim_frame_count)
+        )
+
+    def begin(
+        self,
+        now: int,
+        flip_duration: int,
+        frame_stride: int = 1,
+        frame_adapter: Optional[FrameAdapter] = None,
+    ) -> None:
+        """
+        Plan the steps of a new transition.
+
+        :param int now: The ``time.monotonic_ns()`` value that the transition starts at
+        :param int flip_duration: The configured duration in nanoseconds
+        :param int frame_stride: Frames to advance per step
+        :param FrameAdapter frame_adapter: Optional adapter that plans the stride and
+          duration instead, such as a shorter flip when values arrive quickly.
+        """
+        if frame_adapter is not None:
+            frame_stride, flip_duration = frame_adapter.plan(
+                self.anim_frame_count, flip_duration
+            )
+        self.start = now
+        self.duration = flip_duration
+        self.frame_stride = frame_stride
+        self.half_steps = (self.anim_frame_count + frame_stride - 1) // frame_stride
+        self.step_count = self.half_steps * 2 + self._bounce_steps
+        self.next_step = 0
+        if self._easing is not None:
+            self._schedule = frame_schedule(
+                self._easing, self.anim_frame_count, frame_stride
+            )
+
+    def replan(
+        self,
+        now: int,
+        flip_duration: int,
+        frame_stride: int = 1,
+        frame_adapter: Optional[FrameAdapter] = None,
+    ) -> None:
+        """
+        Plan the rest of the running transition again, for example after its
+        target changed. The frames already shown are kept, the remaining ones
+        follow the new stride and duration as if the new plan had been used
+        from the start.
+
+        :param int now: The current ``time.monotonic_ns()`` value
+        :param int flip_duration: The configured duration in nanoseconds
+        :param int frame_stride: Frames to advance per step
+        :param FrameAdapter frame_adapter: Optional adapter that plans the stride and
+          duration instead.
+        """
+        # frames of both halves that were shown already
+        shown = self.step_frame(self.next_step - 1) + 1 if self.next_step else 0
+
+        self.begin(now, flip_duration, frame_stride, frame_adapter)
+
+        # skip the steps of the new plan up to the frames already shown
+        step = 0
+        while step < self.step_count and self.step_frame(step) < shown:
+            step += 1
+        self.next_step = step
+
+        # move the start back so that this step is due now
+        self.start = now - self._step_offset(step)
+
+    def due_step(self, now: int) -> Optional[int]:
+        """
+        The latest step whose deadline has passed.
+
+        :param int now: The current ``time.monotonic_ns()`` value
+
+        :return: The step, less than `next_step` if no new step is due yet, or None
+          once the whole duration has passed.
+        """
+        elapsed = now - self.start
+        if elapsed >= self.duration:
+            return None
+
+        if self._schedule is None:
+            return elapsed * self.step_count // self.duration
+
+        step = self.next_step
+        while (
+            step < self.step_count
+            and self._schedule[step] * self.duration >> SCHEDULE_SHIFT <= elapsed
+        ):
+            step += 1
+        return step - 1
+
+    def step_frame(self, step: int) -> int:
+        """
+        The animation frame shown at a step. Frames 0 to ``anim_frame_count - 1``
+        are the top half, the rest are the bottom half.
+
+        :param int step: The step within the whole transition
+        """
+        half, index = divmod(step, self.half_steps)
+        if half > 1:
+            # bouncing back up from the last frame
+            return (
+                self.anim_frame_count * 2
+                - 1
+                - BOUNCE_FRAMES[step - self.half_steps * 2]
+            )
+        return (
+            half * self.anim_frame_count
+            + min((index + 1) * self.frame_stride, self.anim_frame_count)
+            - 1
+        )
+
+    def next_frame_time(self) -> int:
+        """
+        The ``time.monotonic_ns()`` value at which `next_step` is due.
+        """
+        return self.start + self._step_offset(self.next_step)
+
+    def _step_offset(self, step: int) -> int:
+        """
+        Nanoseconds from the start of the transition until a step is due.
+
+        :param int step: The step within the whole transition
+        """
+        if self._schedule is None or step >= self.step_count:
+            return step * self.duration // self.step_count
+        return self._schedule[step] * self.duration >> SCHEDULE_SHIFT
@@ -0,0 +1,159 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.frame_adapter`
+================================================================================
+
+Picks how many frames of each flip to show, and how long the flip may take,
+from how often new values arrive and how long a frame takes to show.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+try:
+    from typing import Optional, Tuple
+except ImportError:
+    pass
+
+
+class FrameAdapter:
+    """
+    Keeps running averages of the time between updates and of the time it
+    takes to show one animation frame, and plans each flip so that it ends
+    before the next update is expected. The plan steps down from every frame
+    to every 2nd frame, to only the last frame of each half and finally to an
+    instant swap, and goes back up as soon as updates slow down again.
+
+    Digits that are started together with the same start time get the same
+    plan, so one adapter can be shared by all of the digits of a clock.
+
+    :param float headroom: Fraction of the time between updates that a flip may
+      take. Default is 0.8.
+    :param int min_stride: Frame stride that plans never go below, such as the one
+      picked by `FlipClock.calibrate()`. Default is 1, every frame.
+    """
+
+    def __init__(self, headroom: float = 0.8, min_stride: int = 1) -> None:
+        self.headroom = headroom
+        self.min_stride = min_stride
+
+        # running averages in nanoseconds, None until measured
+        self.update_interval = None
+        self.frame_time = None
+        self._last_update = None
+
+        # the most recent plan
+        self.frame_stride = 1
+        self.duration = None
+
+    def note_update(self, now: int) -> None:
+        """
+        Record that a new value arrived. Calls with the same time, such as
+        for several digits changing together, count once.
+
+        :param int now: The ``time.monotonic_ns()`` value of the update
+        """
+        if self._last_update is not None and now != self._last_update:
+            self.update_interval = self._next_interval(now)
+        self._last_update = now
+
+    def _next_interval(self, now: int) -> int:
+        """
+        The average time between updates after one more update.
+
+        :param int now: The ``time.monotonic_ns()`` value of the update
+        """
+        interval = now - self._last_update
+        if self.update_interval is None:
+            return interval
+        return (self.update_interval * 3 + interval) // 4
+
+    def note_frame(self, frame_time: int) -> None:
+        """
+        Record how long showing one animation frame took, including the
+        display refresh if there is one.
+
+        :param int frame_time: The time taken in nanoseconds
+        """
+        if self.frame_time is None:
+            self.frame_time = frame_time
+        else:
+            self.frame_time = (self.frame_time * 3 + frame_time) // 4
+
+    def plan(self, frame_count: int, flip_duration: int) -> Tuple[int, int]:
+        """
+        Choose the frames and duration for the next flip.
+
+        :param int frame_count: The number of frames in each half of the flip.
+        :param int flip_duration: The configured duration of a whole flip in
+          nanoseconds.
+
+        :return: Tuple of (frame stride, duration in nanoseconds). The stride is the
+          number of frames to advance per step, the last frame of each half is always
+          shown. A duration of 0 swaps to the new value at once.
+        """
+        self.frame_stride, self.duration = self._choose(
+            frame_count, flip_duration, self.update_interval
+        )
+        return self.frame_stride, self.duration
+
+    def expected_plan(
+        self, frame_count: int, flip_duration: int, now: int
+    ) -> Tuple[int, int]:
+        """
+        The plan that `plan()` would choose for an update at a later time, without
+        recording anything. Used to time flips that are scheduled ahead.
+
+        :param int frame_count: The number of frames in each half of the flip.
+        :param int flip_duration: The configured duration of a whole flip in
+          nanoseconds.
+        :param int now: The ``time.monotonic_ns()`` value the update will arrive at
+
+        :return: Tuple of (frame stride, duration in nanoseconds), like `plan()`.
+        """
+        update_interval = self.update_interval
+        if self._last_update is not None and now != self._last_update:
+            update_interval = self._next_interval(now)
+        return self._choose(frame_count, flip_duration, update_interval)
+
+    def _choose(
+        self, frame_count: int, flip_duration: int, update_interval: Optional[int]
+    ) -> Tuple[int, int]:
+        """
+        The stride and duration that fit between updates.
+
+        :param int frame_count: The number of frames in each half of the flip.
+        :param int flip_duration: The configured duration in nanoseconds.
+        :param int update_interval: Average time between updates in nanoseconds,
+          None if not known yet.
+        """
+        duration = flip_duration
+        if update_interval is not None:
+            duration = min(duration, int(update_interval * self.headroom))
+
+        for stride in (1, 2, frame_count):
+            stride = min(max(stride, self.min_stride), frame_count)
+            steps = 2 * ((frame_count + stride - 1) // stride)
+            if self.frame_time is None or steps * self.frame_time <= duration:
+                return stride, duration
+
+        # not even two frames fit before the next update
+        return frame_count, 0
+
+    def reset(self) -> None:
+        """
+        Forget the measurements, for example after a long pause.
+        """
+        self.update_interval = None
+        self.frame_time = None
+        self._last_update = None
@@ -0,0 +1,185 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.frame_tables`
+================================================================================
+
+Precomputed sprite index lookup tables and frame timing schedules for the flip
+animations. Tables are built once per spritesheet layout or easing curve and shared
+by every digit that uses the same one, so the animation frame loop only has to
+index a buffer.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+from array import array
+
+try:
+    from typing import Dict, Optional, Sequence, Tuple, Union
+except ImportError:
+    pass
+
+# schedule times are fractions of the flip duration in 1/2**16 units
+SCHEDULE_SHIFT = 16
+
+# with the "bounce" easing the bottom flap falls like "gravity" in this fraction
+# of the flip, then bounces back up through these frames, counted back from its
+# last frame, and lands again in the rest of the time
+BOUNCE_FALL = 0.8
+BOUNCE_FRAMES = (1, 2, 1, 0)
+
+# time fraction at which each easing curve reaches a fraction of the flip
+EASINGS = {
+    "linear": lambda progress: progress,
+    # the flap falls faster and faster
+    "gravity": lambda progress: progress**0.5,
+    "bounce": lambda progress: BOUNCE_FALL * progress**0.5,
+    "ease_out": lambda progress: 1 - (1 - progress) ** 0.5,
+    "ease_in_out": lambda progress: (
+        (progress / 2) ** 0.5 if progress < 0.5 else 1 - ((1 - progress) / 2) ** 0.5
+    ),
+}
+
+# tables keyed by the layout values they were built from
+_anim_frame_tables = {}
+_static_index_tables = {}
+_frame_schedules = {}
+
+
+def _index_buffer(values: list) -> Union[bytes, array]:
+    """
+    Pack sprite indexes into the smallest buffer type that can hold them.
+
+    :param list values: The sprite indexes
+    """
+    if max(values) < 256:
+        return bytes(values)
+    return array("H", values)
+
+
+def anim_frame_table(
+    frame_count: int, tile_limit: int, digit_offsets: Optional[Tuple[int]] = None
+) -> Union[bytes, array]:
+    """
+    Get the table of animation sprite indexes for the digits 0-9.
+    The sprite index for frame ``i`` of digit ``d`` is at ``d * frame_count + i``.
+
+    :param int frame_count: The number of frames in the flip animations.
+    :param int tile_limit: Number of usable sprites in the animation sheet.
+      Indexes past the end are clamped to the last sprite.
+    :param tuple digit_offsets: Sprite index of the first animation frame of
+      each digit 0-9. Default is ``digit * frame_count``.
+    """
+    key = (frame_count, tile_limit, digit_offsets)
+    table = _anim_frame_tables.get(key)
+    if table is None:
+        values = []
+        for digit in range(10):
+            offset = (
+                digit * frame_count if digit_offsets is None else digit_offsets[digit]
+            )
+            for frame in range(frame_count):
+                n = offset + frame
+                values.append(n if n < tile_limit else tile_limit - 1)
+        table = _index_buffer(values)
+        _anim_frame_tables[key] = table
+    return table
+
+
+def static_index_table(index_map: Dict[int, int]) -> Union[bytes, array]:
+    """
+    Get a static half sprite index map as a table indexed by digit 0-9.
+
+    :param dict index_map: Map of digit to sprite index within the static sheet.
+    """
+    key = tuple(index_map[digit] for digit in range(10))
+    table = _static_index_tables.get(key)
+    if table is None:
+        table = _index_buffer(list(key))
+        _static_index_tables[key] = table
+    return table
+
+
+def _frame_times(easing: Union[str, Tuple[float, ...]], frame_count: int) -> list:
+    """
+    The start time of every frame of both halves as a fraction of the
+    flip duration in 1/2**16 units.
+
+    :param easing: Name of an easing curve in `EASINGS`, or the relative time
+      to show each frame of both halves for.
+    :param int frame_count: The number of frames in each half of the flip.
+    """
+    total_frames = frame_count * 2
+    if isinstance(easing, str):
+        if easing not in EASINGS:
+            raise ValueError(
+                f"Unknown easing {easing}, must be one of {', '.join(EASINGS)}"
+            )
+        curve = EASINGS[easing]
+        return [
+            int(curve(frame / total_frames) * (1 << SCHEDULE_SHIFT))
+            for frame in range(total_frames)
+        ]
+
+    if len(easing) != total_frames:
+        raise ValueError(f"easing needs a frame time for each of {total_frames} frames")
+    if min(easing) < 0 or sum(easing) <= 0:
+        raise ValueError("easing frame times must not be negative or all 0")
+    total = sum(easing)
+    times = []
+    elapsed = 0
+    for frame_time in easing:
+        times.append(int(elapsed * (1 << SCHEDULE_SHIFT) / total))
+        elapsed += frame_time
+    return times
+
+
+def frame_schedule(
+    easing: Union[str, Sequence[float]], frame_count: int, frame_stride: int = 1
+) -> array:
+    """
+    Get the time at which each step of a flip is shown, as a fraction of the
+    flip duration in 1/2**16 units. A step that skips frames starts when the
+    first of its frames would have. The ``"bounce"`` easing adds a step for each
+    of the `BOUNCE_FRAMES` after the last frame, spread evenly over the end of
+    the flip.
+
+    :param easing: Name of an easing curve in `EASINGS`, or the relative time
+      to show each frame of both halves for, top half first.
+    :param int frame_count: The number of frames in each half of the flip.
+    :param int frame_stride: The number of frames to advance per step.
+    """
+    if not isinstance(easing, str):
+        easing = tuple(easing)
+    key = (easing, frame_count, frame_stride)
+    schedule = _frame_schedules.get(key)
+    if schedule is None:
+        times = _frame_times(easing, frame_count)
+        schedule = array(
+            "H",
+            (
+                times[half * frame_count + frame]
+                for half in (0, 1)
+                for frame in range(0, frame_count, frame_stride)
+            ),
+        )
+        if easing == "bounce":
+            for step in range(len(BOUNCE_FRAMES)):
+                schedule.append(
+                    int(
+                        (BOUNCE_FALL + (1 - BOUNCE_FALL) * step / len(BOUNCE_FRAMES))
+                        * (1 << SCHEDULE_SHIFT)
+                    )
+                )
+        _frame_schedules[key] = schedule
+    return schedule
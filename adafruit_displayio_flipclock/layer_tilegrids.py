@@ -0,0 +1,155 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.layer_tilegrids`
+================================================================================
+
+The layers of TileGrids that flip digits are drawn with, for a single digit
+or for a group of digits sharing multi-tile TileGrids.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+try:
+    from typing import Optional, Sequence, Tuple
+    from displayio import Bitmap, Group, Palette
+except ImportError:
+    pass
+
+from displayio import TileGrid  # pylint: disable=ungrouped-imports
+
+
+def make_layer_tilegrids(
+    static_spritesheet: Bitmap,
+    static_palette: Palette,
+    top_anim_spritesheet: Bitmap,
+    top_anim_palette: Palette,
+    bottom_anim_spritesheet: Bitmap,
+    bottom_anim_palette: Palette,
+    tile_width: int,
+    tile_height: int,
+    width: int = 1,
+    x: int = 0,
+    y: int = 0,
+    static_default_tiles: Tuple[int, int] = (0, 3),
+    blank_tile: Optional[int] = None,
+    anim_layers: bool = True,
+) -> Tuple[TileGrid, TileGrid, Optional[TileGrid], Optional[TileGrid]]:
+    """
+    Create the four layers of TileGrids that flip digits are drawn with,
+    ``width`` digits wide.
+
+    :param Bitmap static_spritesheet: Spritesheet image of static numbers sprites.
+    :param Palette static_palette: Palette to use with the static sprite sheet.
+    :param Bitmap top_anim_spritesheet: Spritesheet image of top half animation sprites.
+    :param Palette top_anim_palette: Palette to use with the top half animation sprites.
+    :param Bitmap bottom_anim_spritesheet: Spritesheet image of bottom half animation sprites.
+    :param Palette bottom_anim_palette: Palette to use with the bottom half animation sprites.
+    :param int tile_width: Width in pixels of the sprite tiles.
+    :param int tile_height: Height in pixels of the sprite tiles.
+    :param int width: Number of digits in each TileGrid.
+    :param int x: x position of the TileGrids.
+    :param int y: y position of the top half TileGrids.
+    :param tuple static_default_tiles: Top and bottom static sprite indexes to start with.
+    :param int blank_tile: Index of a fully transparent animation sprite. If set the
+      animation TileGrids start out showing it, otherwise they start out hidden.
+    :param bool anim_layers: Whether to create the animation TileGrids. If False they
+      are None in the returned tuple, for digits that borrow them from an
+      `AnimationTileGridPool`.
+
+    :return: Tuple of (top static, bottom static, top animation, bottom animation) TileGrids
+    """
+    # pylint: disable=too-many-arguments, too-many-locals
+    layers = [
+        (static_spritesheet, static_palette, static_default_tiles[0], y),
+        (static_spritesheet, static_palette, static_default_tiles[1], y + tile_height),
+    ]
+    if anim_layers:
+        layers.append((top_anim_spritesheet, top_anim_palette, blank_tile, y))
+        layers.append(
+            (bottom_anim_spritesheet, bottom_anim_palette, blank_tile, y + tile_height)
+        )
+
+    tilegrids = []
+    for spritesheet, palette, default_tile, tile_y in layers:
+        tilegrid = TileGrid(
+            spritesheet,
+            pixel_shader=palette,
+            height=1,
+            width=width,
+            tile_width=tile_width,
+            tile_height=tile_height,
+            default_tile=default_tile if default_tile is not None else 0,
+            x=x,
+            y=tile_y,
+        )
+        tilegrids.append(tilegrid)
+
+    if not anim_layers:
+        return tilegrids[0], tilegrids[1], None, None
+
+    # hide the animation tilegrids if there is no blank sprite to show
+    if blank_tile is None:
+        tilegrids[2].hidden = True
+        tilegrids[3].hidden = True
+
+    return tuple(tilegrids)
+
+
+def make_group_tilegrids(
+    parent: Group,
+    digit_x: Sequence[int],
+    group_sizes: Sequence[int],
+    spritesheets: Tuple[Bitmap, Bitmap, Bitmap],
+    palettes: Tuple[Palette, Palette, Palette],
+    **kwargs,
+) -> tuple:
+    """
+    Create the layer TileGrids of each group of digits, one tile per digit, and
+    add them to the parent Group. The static layers of every group are added
+    first so the animation layers are drawn over them.
+
+    :param Group parent: The Group to add the TileGrids to.
+    :param Sequence[int] digit_x: x position of each digit.
+    :param Sequence[int] group_sizes: Number of digits in each group.
+    :param tuple spritesheets: The static, top and bottom animation spritesheets.
+    :param tuple palettes: The static, top and bottom animation palettes.
+
+    Any other keyword arguments, such as ``tile_width``, ``tile_height`` and ``y``,
+    are passed on to `make_layer_tilegrids()`.
+
+    :return: Tuple of the layer TileGrids of each group
+    """
+    group_tilegrids = []
+    start = 0
+    for size in group_sizes:
+        group_tilegrids.append(
+            make_layer_tilegrids(
+                spritesheets[0],
+                palettes[0],
+                spritesheets[1],
+                palettes[1],
+                spritesheets[2],
+                palettes[2],
+                width=size,
+                x=digit_x[start],
+                **kwargs,
+            )
+        )
+        start += size
+
+    # static layers first so the animation layers are drawn over them
+    for layer in range(4):
+        for tilegrids in group_tilegrids:
+            parent.append(tilegrids[layer])
+    return tuple(group_tilegrids)
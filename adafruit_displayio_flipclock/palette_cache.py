@@ -0,0 +1,326 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.palette_cache`
+================================================================================
+
+Module level cache of brightness adjusted palettes. Every FlipDigit and FlipClock
+that fades the same source palette to the same level shares one faded Palette.
+It is only imported when dynamic fading is enabled. Palettes baked by the
+spritesheet generator can be added to it so they are never computed on the device.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+import gc
+
+try:
+    from typing import Callable, Optional, Sequence, Tuple
+except ImportError:
+    pass
+
+from displayio import Palette
+
+# faded palettes keyed by (id of source palette, level). Values are
+# (source palette, faded palette) tuples. Holding a reference to the source
+# palette keeps its id from being reused by another object.
+_faded_palettes = {}
+
+# number of widgets holding each source palette, keyed by id of the palette.
+# A held palette is alive, so its id can't be reused by another object.
+_holders = {}
+
+
+def faded_palette(source_palette: Palette, level: float) -> Palette:
+    """
+    Get the faded version of a palette, creating it on first use.
+    The returned Palette is shared and must not be modified.
+
+    :param Palette source_palette: The palette to fade. Set all desired
+      transparent indexes before the first call.
+    :param float level: Brightness modifier value. Valid range is 0.0 - 1.0.
+
+    :return: The shared faded Palette
+    """
+    key = (id(source_palette), level)
+    entry = _faded_palettes.get(key)
+    if entry is None:
+        # the fader is only loaded if a palette wasn't baked
+        # pylint: disable=import-outside-toplevel
+        from adafruit_displayio_flipclock.palette_fade import fade_palette
+
+        entry = (source_palette, fade_palette(source_palette, level))
+        _faded_palettes[key] = entry
+    return entry[1]
+
+
+def add_baked_palette(
+    source_palette: Palette, level: float, colors: Sequence[int]
+) -> None:
+    """
+    Add a faded palette that was computed ahead of time, such as by the
+    spritesheet generator, so that `faded_palette()` returns it instead of
+    fading the source palette. Transparent indexes are copied from the source
+    palette. Does nothing if the level is already cached.
+
+    :param Palette source_palette: The palette that was faded.
+    :param float level: The brightness level it was faded to.
+    :param Sequence[int] colors: The faded 24 bit RGB colors, one per index of the
+      source palette.
+    """
+    key = (id(source_palette), level)
+    if key in _faded_palettes:
+        return
+    if len(colors) != len(source_palette):
+        raise ValueError("Baked palette doesn't match the size of the source palette")
+
+    palette = Palette(len(colors))
+    for index, color in enumerate(colors):
+        palette[index] = color
+        if source_palette.is_transparent(index):
+            palette.make_transparent(index)
+    _faded_palettes[key] = (source_palette, palette)
+
+
+def digit_palettes(
+    static_spritesheet_palette: Palette,
+    top_anim_palette: Palette,
+    bottom_anim_palette: Palette,
+    brighter_level: float,
+    darker_level: float,
+    medium_level: float,
+) -> Tuple[Palette, Palette, Palette, Palette]:
+    """
+    Get the shared faded palettes used by the layers of a flip digit.
+
+    :param Palette static_spritesheet_palette: Palette of the static sprite sheet.
+    :param Palette top_anim_palette: Palette of the top half animation sprites.
+    :param Palette bottom_anim_palette: Palette of the bottom half animation sprites.
+    :param float brighter_level: Brightness modifier for the bottom half animation.
+    :param float darker_level: Brightness modifier for the top half animation
+      and the shadowed bottom static half.
+    :param float medium_level: Brightness modifier for the static digit sprites.
+
+    :return: Tuple of (static, darker static, top animation, bottom animation) palettes
+    """
+    # pylint: disable=too-many-arguments
+    return (
+        faded_palette(static_spritesheet_palette, medium_level),
+        faded_palette(static_spritesheet_palette, darker_level),
+        faded_palette(top_anim_palette, darker_level),
+        faded_palette(bottom_anim_palette, brighter_level),
+    )
+
+
+def ramp_palettes(
+    source_palette: Palette,
+    start_level: float,
+    end_level: float,
+    frame_count: int,
+    steps: int,
+    fade: Optional[Callable[[Palette, float], Palette]] = None,
+) -> Tuple[Palette, ...]:
+    """
+    Get a shading ramp for one half of a flip animation: the palette to show
+    with each animation frame, fading from ``start_level`` to ``end_level``
+    in ``steps`` steps. Consecutive frames share a palette when there are more
+    frames than steps, and every palette is shared through the cache.
+
+    :param Palette source_palette: The palette to fade.
+    :param float start_level: Brightness modifier for the first frame.
+    :param float end_level: Brightness modifier for the last frame.
+    :param int frame_count: Number of frames in the animation half.
+    :param int steps: Number of different brightness levels in the ramp.
+    :param fade: Function that creates a faded palette from a source palette and
+      a level. Default is `faded_palette()`, which shares them through the cache.
+
+    :return: Tuple with the Palette for each frame
+    """
+    # pylint: disable=too-many-arguments
+    if fade is None:
+        fade = faded_palette
+    if steps < 1:
+        raise ValueError("steps must be at least 1")
+    steps = min(steps, frame_count)
+
+    palettes = []
+    for step in range(steps):
+        level = start_level
+        if steps > 1:
+            level += (end_level - start_level) * step / (steps - 1)
+        palettes.append(fade(source_palette, round(level, 3)))
+
+    return tuple(palettes[frame * steps // frame_count] for frame in range(frame_count))
+
+
+def brightness_palettes(
+    static_spritesheet_palette: Palette,
+    top_anim_palette: Palette,
+    bottom_anim_palette: Palette,
+    brighter_level: float,
+    darker_level: float,
+    medium_level: float,
+    brightness: float,
+    dynamic_fading: bool = True,
+    frame_count: int = 10,
+    shading_steps: Optional[int] = None,
+    cached: bool = True,
+) -> tuple:
+    """
+    Get the full set of palettes that a flip digit uses, dimmed to an overall
+    brightness. The brightness is multiplied into every fading level, so the
+    shading between the layers is kept.
+
+    :param Palette static_spritesheet_palette: Palette of the static sprite sheet.
+    :param Palette top_anim_palette: Palette of the top half animation sprites.
+    :param Palette bottom_anim_palette: Palette of the bottom half animation sprites.
+    :param float brighter_level: Brightness modifier for the bottom half animation.
+    :param float darker_level: Brightness modifier for the top half animation
+      and the shadowed bottom static half.
+    :param float medium_level: Brightness modifier for the static digit sprites.
+    :param float brightness: Overall brightness. Valid range is 0.0 - 1.0.
+    :param bool dynamic_fading: Whether the layers are shaded with the levels. If False
+      only the brightness is applied to the source palettes.
+    :param int frame_count: Number of frames in each animation half.
+    :param int shading_steps: Number of levels in the shading ramps, None for no ramps.
+    :param bool cached: Whether to share the palettes through the cache. If False
+      new palettes are created that are released with the returned set.
+
+    :return: Tuple of (static, darker static, top animation, bottom animation,
+      top shading ramp, bottom shading ramp) palettes. The ramps are None if not used.
+    """
+    # pylint: disable=too-many-arguments, too-many-locals
+    if cached:
+        fade = faded_palette
+    else:
+        # palettes only shared within this set
+        created = {}
+
+        # pylint: disable=import-outside-toplevel
+        from adafruit_displayio_flipclock.palette_fade import fade_palette
+
+        def fade(source_palette: Palette, level: float) -> Palette:
+            key = (id(source_palette), level)
+            if key not in created:
+                created[key] = fade_palette(source_palette, level)
+            return created[key]
+
+    def level(base: float) -> float:
+        return round(min(1.0, base * brightness), 3)
+
+    if not dynamic_fading:
+        if brightness == 1.0:
+            static_palette = static_spritesheet_palette
+            top_palette = top_anim_palette
+            bottom_palette = bottom_anim_palette
+        else:
+            static_palette = fade(static_spritesheet_palette, level(1.0))
+            top_palette = fade(top_anim_palette, level(1.0))
+            bottom_palette = fade(bottom_anim_palette, level(1.0))
+        return static_palette, static_palette, top_palette, bottom_palette, None, None
+
+    top_ramp = None
+    bottom_ramp = None
+    if shading_steps is not None:
+        top_ramp = ramp_palettes(
+            top_anim_palette,
+            level(medium_level),
+            level(darker_level),
+            frame_count,
+            shading_steps,
+            fade,
+        )
+        bottom_ramp = ramp_palettes(
+            bottom_anim_palette,
+            level(darker_level),
+            level(brighter_level),
+            frame_count,
+            shading_steps,
+            fade,
+        )
+    return (
+        fade(static_spritesheet_palette, level(medium_level)),
+        fade(static_spritesheet_palette, level(darker_level)),
+        fade(top_anim_palette, level(darker_level)),
+        fade(bottom_anim_palette, level(brighter_level)),
+        top_ramp,
+        bottom_ramp,
+    )
+
+
+def update_faded_palettes(source_palette: Palette) -> None:
+    """
+    Recompute the colors of every cached faded palette of a source palette
+    in place, after colors of the source palette have been changed. No new
+    palettes are created, so widgets using them show the new colors.
+
+    :param Palette source_palette: The palette whose colors changed.
+    """
+    # pylint: disable=import-outside-toplevel
+    from adafruit_displayio_flipclock.palette_fade import fade_color
+
+    for (_, level), (palette, faded) in _faded_palettes.items():
+        if palette is source_palette:
+            for index, color in enumerate(source_palette):
+                faded[index] = fade_color(color, level)
+
+
+def retain_palette(source_palette: Palette) -> None:
+    """
+    Mark a source palette as held by one more widget. Its cached faded palettes
+    are kept until every widget holding it has called `release_palette()`.
+
+    :param Palette source_palette: The palette that is faded.
+    """
+    key = id(source_palette)
+    _holders[key] = _holders.get(key, 0) + 1
+
+
+def release_palette(source_palette: Palette) -> None:
+    """
+    Release a source palette held with `retain_palette()`, such as the palette
+    of a replaced theme. Its cached faded palettes are dropped once no other
+    widget holds it. Widgets that are still using them keep their references.
+
+    :param Palette source_palette: The palette that was faded.
+    """
+    key = id(source_palette)
+    count = _holders.get(key, 0) - 1
+    if count > 0:
+        _holders[key] = count
+        return
+    _holders.pop(key, None)
+    discard_palette(source_palette)
+
+
+def discard_palette(source_palette: Palette) -> None:
+    """
+    Drop the cached faded palettes of a source palette that is no longer
+    used, such as one evicted from an `AssetRegistry`. Nothing is dropped
+    while a widget holds the palette.
+
+    :param Palette source_palette: The palette that was faded.
+    """
+    if id(source_palette) in _holders:
+        return
+    for key in [key for key in _faded_palettes if key[0] == id(source_palette)]:
+        del _faded_palettes[key]
+
+
+def clear_cache() -> None:
+    """
+    Release all of the cached faded palettes. Widgets that are still
+    using them keep their references.
+    """
+    _faded_palettes.clear()
+    gc.collect()
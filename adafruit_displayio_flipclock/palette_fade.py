@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.palette_fade`
+================================================================================
+
+Minimal brightness scaled palette builder used for dynamic fading. It only
+creates the new Palette, with no reference copy of the source palette.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+from displayio import Palette
+
+
+def fade_palette(source_palette: Palette, level: float) -> Palette:
+    """
+    Create a copy of a palette with every color scaled to a brightness level.
+    The level is turned into an integer factor once and the colors are scaled
+    with integer math in one pass. Transparent indexes stay transparent.
+
+    :param Palette source_palette: The palette to fade. Set all desired
+      transparent indexes before calling.
+    :param float level: Brightness modifier value. Valid range is 0.0 - 1.0.
+
+    :return: The new faded Palette
+    """
+    if not 0.0 <= level <= 1.0:
+        raise ValueError("level must be in the range 0.0 - 1.0")
+
+    # brightness as a fraction of 256
+    scale = int(level * 256)
+
+    color_count = len(source_palette)
+    faded = Palette(color_count)
+    for index in range(color_count):
+        color = source_palette[index]
+        faded[index] = (
+            ((color >> 16 & 0xFF) * scale >> 8) << 16
+            | ((color >> 8 & 0xFF) * scale >> 8) << 8
+            | (color & 0xFF) * scale >> 8
+        )
+        if source_palette.is_transparent(index):
+            faded.make_transparent(index)
+    return faded
+
+
+def fade_color(color: int, level: float) -> int:
+    """
+    Scale a single color to a brightness level with the same integer math
+    as `fade_palette()`.
+
+    :param int color: The color as a 24 bit RGB integer.
+    :param float level: Brightness modifier value. Valid range is 0.0 - 1.0.
+
+    :return: The faded color
+    """
+    scale = int(level * 256)
+    return (
+        ((color >> 16 & 0xFF) * scale >> 8) << 16
+        | ((color >> 8 & 0xFF) * scale >> 8) << 8
+        | (color & 0xFF) * scale >> 8
+    )
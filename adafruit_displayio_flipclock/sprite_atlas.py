@@ -0,0 +1,270 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+`adafruit_displayio_flipclock.sprite_atlas`
+================================================================================
+
+Description of the layout of a set of flip clock spritesheets. The spritesheet
+generator script writes it as a JSON file next to the BMP files it creates.
+FlipDigit and FlipClock use it to check the sheets and to look up sprite indexes.
+
+
+* Author(s): Tim Cocks
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+import json
+
+try:
+    from typing import Optional, Sequence
+    from displayio import Bitmap, Palette
+except ImportError:
+    pass
+
+from adafruit_displayio_flipclock.frame_tables import (
+    anim_frame_table,
+    static_index_table,
+)
+
+
+class SpriteAtlas:
+    """
+    Layout of the static, top half animation and bottom half animation
+    spritesheets used by FlipDigit. All of the sprite index tables are
+    computed once when the atlas is created.
+
+    :param int tile_width: Width in pixels of the sprite tiles.
+    :param int tile_height: Height in pixels of the sprite tiles. This is half
+      the height of a full static digit.
+    :param int anim_frame_count: The number of frames in the flip animation of each digit.
+    :param int static_columns: Number of full digits in each row of the static sheet.
+    :param int static_rows: Number of full digit rows in the static sheet.
+    :param int anim_columns: Number of tiles in each row of the animation sheets.
+    :param int anim_rows: Number of tile rows in the animation sheets.
+    :param Sequence[int] digit_frame_offsets: Sprite index of the first animation frame
+      of each digit 0-9. Default is ``digit * anim_frame_count``.
+    :param Sequence[int] static_transparent_indexes: Palette indexes to make transparent
+      in the static sheet palette.
+    :param Sequence[int] top_transparent_indexes: Palette indexes to make transparent
+      in the top half animation sheet palette.
+    :param Sequence[int] bottom_transparent_indexes: Palette indexes to make transparent
+      in the bottom half animation sheet palette.
+    :param int blank_tile: Optional index of a fully transparent sprite in the
+      animation sheets.
+    :param dict files: Optional filenames of the sheets keyed by
+      ``"static"``, ``"top"`` and ``"bottom"``, and ``"colon"`` for the separator
+      sprites that can be passed to FlipClock as ``colon_spritesheet``.
+    :param dict baked_palettes: Optional faded palettes computed by the spritesheet
+      generator, keyed by ``"static"``, ``"top"`` and ``"bottom"``. Each is a dict
+      of color lists keyed by brightness level. See `load_baked_palettes()`.
+    """
+
+    # pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
+
+    def __init__(
+        self,
+        tile_width: int,
+        tile_height: int,
+        anim_frame_count: int,
+        static_columns: int,
+        static_rows: int,
+        anim_columns: int,
+        anim_rows: int,
+        digit_frame_offsets: Optional[Sequence[int]] = None,
+        static_transparent_indexes: Sequence[int] = (0,),
+        top_transparent_indexes: Sequence[int] = (0,),
+        bottom_transparent_indexes: Sequence[int] = (0,),
+        blank_tile: Optional[int] = None,
+        files: Optional[dict] = None,
+        baked_palettes: Optional[dict] = None,
+    ) -> None:
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.anim_frame_count = anim_frame_count
+        self.static_columns = static_columns
+        self.static_rows = static_rows
+        self.anim_columns = anim_columns
+        self.anim_rows = anim_rows
+        self.static_transparent_indexes = tuple(static_transparent_indexes)
+        self.top_transparent_indexes = tuple(top_transparent_indexes)
+        self.bottom_transparent_indexes = tuple(bottom_transparent_indexes)
+        self.files = files if files is not None else {}
+        self.baked_palettes = baked_palettes if baked_palettes is not None else {}
+
+        if digit_frame_offsets is None:
+            digit_frame_offsets = [digit * anim_frame_count for digit in range(10)]
+        digit_frame_offsets = tuple(digit_frame_offsets)
+
+        # check that the layout itself is consistent
+        if len(digit_frame_offsets) != 10:
+            raise ValueError("digit_frame_offsets must have one entry per digit 0-9")
+        if static_columns * static_rows < 10:
+            raise ValueError("Static sheet layout has room for fewer than 10 digits")
+        self.anim_tile_count = anim_columns * anim_rows
+        if max(digit_frame_offsets) + anim_frame_count > self.anim_tile_count:
+            raise ValueError(
+                f"Animation frames need {max(digit_frame_offsets) + anim_frame_count} "
+                f"tiles but the sheet layout only has {self.anim_tile_count}"
+            )
+        if blank_tile is not None and not 0 <= blank_tile < self.anim_tile_count:
+            raise ValueError("blank_tile is outside of the animation sheet layout")
+        self.digit_frame_offsets = digit_frame_offsets
+        self.blank_tile = blank_tile
+
+        # each full static digit is two tiles stacked vertically
+        top_map = {}
+        bottom_map = {}
+        for digit in range(10):
+            top_map[digit] = (digit // static_columns) * static_columns * 2 + (
+                digit % static_columns
+            )
+            bottom_map[digit] = top_map[digit] + static_columns
+
+        # sprite index lookup tables
+        self.top_static_indexes = static_index_table(top_map)
+        self.bottom_static_indexes = static_index_table(bottom_map)
+        self.anim_frames = anim_frame_table(
+            anim_frame_count, self.anim_tile_count, digit_frame_offsets
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SpriteAtlas":
+        """
+        Create a SpriteAtlas from the dictionary format written by the
+        spritesheet generator.
+
+        :param dict data: The descriptor dictionary
+        """
+        return cls(
+            data["tile_width"],
+            data["tile_height"],
+            data["anim_frame_count"],
+            data["static"]["columns"],
+            data["static"]["rows"],
+            data["anim"]["columns"],
+            data["anim"]["rows"],
+            digit_frame_offsets=data.get("digit_frame_offsets"),
+            static_transparent_indexes=data["static"].get("transparent_indexes", (0,)),
+            top_transparent_indexes=data["top"].get("transparent_indexes", (0,)),
+            bottom_transparent_indexes=data["bottom"].get("transparent_indexes", (0,)),
+            blank_tile=data.get("blank_tile"),
+            files=data.get("files"),
+            baked_palettes={
+                sheet: {
+                    float(level): colors
+                    for level, colors in data[sheet].get("palettes", {}).items()
+                }
+                for sheet in ("static", "top", "bottom")
+            },
+        )
+
+    @classmethod
+    def from_file(cls, filename: str) -> "SpriteAtlas":
+        """
+        Load a SpriteAtlas from a JSON descriptor file.
+
+        :param str filename: Path to the JSON file
+        """
+        with open(filename, "r") as descriptor_file:
+            return cls.from_dict(json.load(descriptor_file))
+
+    def validate(
+        self,
+        static_spritesheet: Bitmap,
+        top_anim_spritesheet: Bitmap,
+        bottom_anim_spritesheet: Bitmap,
+    ) -> None:
+        """
+        Check that spritesheet Bitmaps match this layout. Raises ValueError
+        if any of them doesn't, instead of showing the wrong frames later.
+
+        :param Bitmap static_spritesheet: Spritesheet image of static numbers sprites.
+        :param Bitmap top_anim_spritesheet: Spritesheet image of top half animation sprites.
+        :param Bitmap bottom_anim_spritesheet: Spritesheet image of bottom
+          half animation sprites.
+        """
+        expected = (
+            (
+                "static",
+                static_spritesheet,
+                self.static_columns * self.tile_width,
+                self.static_rows * self.tile_height * 2,
+            ),
+            (
+                "top animation",
+                top_anim_spritesheet,
+                self.anim_columns * self.tile_width,
+                self.anim_rows * self.tile_height,
+            ),
+            (
+                "bottom animation",
+                bottom_anim_spritesheet,
+                self.anim_columns * self.tile_width,
+                self.anim_rows * self.tile_height,
+            ),
+        )
+        for name, sheet, width, height in expected:
+            if sheet.width != width or sheet.height != height:
+                raise ValueError(
+                    f"The {name} spritesheet is {sheet.width}x{sheet.height} "
+                    f"but the sprite atlas expects {width}x{height}"
+                )
+
+    def apply_transparency(
+        self,
+        static_spritesheet_palette: Palette,
+        top_anim_palette: Palette,
+        bottom_anim_palette: Palette,
+    ) -> None:
+        """
+        Make the transparent indexes listed in the atlas transparent in
+        the spritesheet palettes.
+
+        :param Palette static_spritesheet_palette: Palette of the static sprite sheet.
+        :param Palette top_anim_palette: Palette of the top half animation sprites.
+        :param Palette bottom_anim_palette: Palette of the bottom half animation sprites.
+        """
+        for index in self.static_transparent_indexes:
+            static_spritesheet_palette.make_transparent(index)
+        for index in self.top_transparent_indexes:
+            top_anim_palette.make_transparent(index)
+        for index in self.bottom_transparent_indexes:
+            bottom_anim_palette.make_transparent(index)
+
+    def load_baked_palettes(
+        self,
+        static_spritesheet_palette: Palette,
+        top_anim_palette: Palette,
+        bottom_anim_palette: Palette,
+    ) -> None:
+        """
+        Add the faded palettes baked into the atlas to the shared palette cache,
+        so dynamic fading uses them instead of computing faded palettes on the
+        device. Levels that were not baked are still computed when needed.
+        Call it after the transparent indexes have been set.
+
+        :param Palette static_spritesheet_palette: Palette of the static sprite sheet.
+        :param Palette top_anim_palette: Palette of the top half animation sprites.
+        :param Palette bottom_anim_palette: Palette of the bottom half animation sprites.
+        """
+        if not self.baked_palettes:
+            return
+
+        # pylint: disable=import-outside-toplevel
+        from adafruit_displayio_flipclock.palette_cache import add_baked_palette
+
+        for sheet, source_palette in (
+            ("static", static_spritesheet_palette),
+            ("top", top_anim_palette),
+            ("bottom", bottom_anim_palette),
+        ):
+            for level, colors in self.baked_palettes.get(sheet, {}).items():
+                add_baked_palette(source_palette, level, colors)
@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+Benchmark for FlipClockDashboard. It builds dashboards with 1 to MAX_CLOCKS
+clocks and prints the heap used and the time taken to flip every clock
+to the next minute.
+
+All of the clocks share the spritesheets, faded palettes and colon palette,
+and their flips are played in the same frames with one display refresh per
+frame. So both numbers grow much slower than the number of clocks.
+Run it on the device, it needs ``gc.mem_free()`` from CircuitPython.
+"""
+import gc
+import time
+import board
+from displayio import Group
+import adafruit_imageload
+from adafruit_displayio_flipclock.dashboard import FlipClockDashboard
+from adafruit_displayio_flipclock.palette_cache import clear_cache
+
+#  == Configuration Variables ==
+
+# seconds per animation frame
+ANIMATION_DELAY = 0.02
+
+# number of frames in the animation
+ANIMATION_FRAME_COUNT = 10
+
+# color indexes that will be made transparent in the palette
+TRANSPARENT_INDEXES = range(11)
+
+# Brightness modifier for top half during animation
+BRIGHTER_LEVEL = 0.99
+
+# Brightness modifier for bottom half in the shadow during animation
+DARKER_LEVEL = 0.5
+
+# Brightness modifier to use by default for static sprites
+MEDIUM_LEVEL = 0.9
+
+# largest number of clocks to measure
+MAX_CLOCKS = 4
+
+# == END configuration variables ==
+
+# access built-in display
+display = board.DISPLAY
+
+gc.collect()
+mem_start = gc.mem_free()  # pylint: disable=no-member
+
+# load the static sprite sheet
+static_spritesheet, static_palette = adafruit_imageload.load("static_sheet.bmp")
+static_palette.make_transparent(0)
+
+# load the animation sprite sheets
+top_animation_spritesheet, top_animation_palette = adafruit_imageload.load(
+    "grey_top_animation_sheet.bmp"
+)
+bottom_animation_spritesheet, bottom_animation_palette = adafruit_imageload.load(
+    "grey_bottom_animation_sheet.bmp"
+)
+
+# set the transparent color indexes in respective palettes
+for i in TRANSPARENT_INDEXES:
+    top_animation_palette.make_transparent(i)
+    bottom_animation_palette.make_transparent(i)
+
+# calculate sprite size by dividing total sheet
+SPRITE_WIDTH = static_spritesheet.width // 3
+SPRITE_HEIGHT = (static_spritesheet.height // 4) // 2
+
+# group to hold the dashboard being measured
+main_group = Group()
+board.DISPLAY.show(main_group)
+
+# heap used by the shared spritesheets only
+gc.collect()
+sheets_used = mem_start - gc.mem_free()  # pylint: disable=no-member
+print(f"spritesheets: {sheets_used} bytes")
+print("clocks, heap used (bytes), minute update (ms)")
+
+for clock_count in range(1, MAX_CLOCKS + 1):
+    gc.collect()
+    mem_before = gc.mem_free()  # pylint: disable=no-member
+
+    dashboard = FlipClockDashboard(
+        static_spritesheet,
+        static_palette,
+        top_animation_spritesheet,
+        top_animation_palette,
+        bottom_animation_spritesheet,
+        bottom_animation_palette,
+        SPRITE_WIDTH,
+        SPRITE_HEIGHT,
+        display=display,
+        anim_delay=ANIMATION_DELAY,
+        dynamic_fading=True,
+        brighter_level=BRIGHTER_LEVEL,
+        darker_level=DARKER_LEVEL,
+        medium_level=MEDIUM_LEVEL,
+    )
+    for i in range(clock_count):
+        dashboard.add_clock(y=i * SPRITE_HEIGHT * 2)
+    main_group.append(dashboard)
+
+    gc.collect()
+    heap_used = sheets_used + mem_before - gc.mem_free()  # pylint: disable=no-member
+
+    # flip every clock from 09:59 to 10:00, which changes all four digits
+    dashboard.set_times([(9, 59)] * clock_count)
+    start = time.monotonic_ns()
+    dashboard.set_times([(10, 0)] * clock_count)
+    update_ms = (time.monotonic_ns() - start) // 1_000_000
+
+    print(f"{clock_count}, {heap_used}, {update_ms}")
+
+    main_group.remove(dashboard)
+    dashboard = None
+    # measure the shared faded palettes again with the next dashboard
+    clear_cache()
@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+Benchmark that compares the built-in palette fader used for dynamic fading
+with the CedarGrove PaletteFader that the library used before. It builds the
+four faded palettes that flip digits use both ways and prints the time taken
+and the heap used.
+
+The PaletteFader is only needed for this comparison, install it with
+``circup install cedargrove_palettefader``. Run it on the device, it needs
+``gc.mem_free()`` from CircuitPython.
+"""
+import gc
+import time
+import adafruit_imageload
+from adafruit_displayio_flipclock.palette_fade import fade_palette
+
+#  == Configuration Variables ==
+
+# color indexes that will be made transparent in the palette
+TRANSPARENT_INDEXES = range(11)
+
+# Brightness modifier for top half during animation
+BRIGHTER_LEVEL = 0.99
+
+# Brightness modifier for bottom half in the shadow during animation
+DARKER_LEVEL = 0.5
+
+# Brightness modifier to use by default for static sprites
+MEDIUM_LEVEL = 0.9
+
+# number of times each way of fading is repeated
+ROUNDS = 5
+
+# == END configuration variables ==
+
+# load the static sprite sheet
+static_spritesheet, static_palette = adafruit_imageload.load("static_sheet.bmp")
+static_palette.make_transparent(0)
+
+# load the animation sprite sheets
+top_animation_spritesheet, top_animation_palette = adafruit_imageload.load(
+    "grey_top_animation_sheet.bmp"
+)
+bottom_animation_spritesheet, bottom_animation_palette = adafruit_imageload.load(
+    "grey_bottom_animation_sheet.bmp"
+)
+
+# set the transparent color indexes in respective palettes
+for i in TRANSPARENT_INDEXES:
+    top_animation_palette.make_transparent(i)
+    bottom_animation_palette.make_transparent(i)
+
+
+def palette_fader_palettes():
+    """
+    Build the faded palettes with PaletteFader, the way FlipDigit used to.
+    """
+    # pylint: disable=import-outside-toplevel
+    from cedargrove_palettefader import PaletteFader
+
+    palettes = []
+    for source, level in (
+        (static_palette, MEDIUM_LEVEL),
+        (static_palette, DARKER_LEVEL),
+        (top_animation_palette, DARKER_LEVEL),
+        (bottom_animation_palette, BRIGHTER_LEVEL),
+    ):
+        palettes.append(PaletteFader(source, level, 1.0).palette)
+    return palettes
+
+
+def built_in_palettes():
+    """
+    Build the faded palettes with the built-in fader.
+    """
+    return [
+        fade_palette(static_palette, MEDIUM_LEVEL),
+        fade_palette(static_palette, DARKER_LEVEL),
+        fade_palette(top_animation_palette, DARKER_LEVEL),
+        fade_palette(bottom_animation_palette, BRIGHTER_LEVEL),
+    ]
+
+
+print("fader, time (ms), heap used (bytes)")
+for name, build in (
+    ("PaletteFader", palette_fader_palettes),
+    ("built-in", built_in_palettes),
+):
+    for _ in range(ROUNDS):
+        # collect outside of the timed region for both faders
+        gc.collect()
+        mem_before = gc.mem_free()  # pylint: disable=no-member
+        start = time.monotonic_ns()
+        faded_palettes = build()
+        elapsed_ms = (time.monotonic_ns() - start) / 1_000_000
+        gc.collect()
+        heap_used = mem_before - gc.mem_free()  # pylint: disable=no-member
+        print(f"{name}, {elapsed_ms:.1f}, {heap_used}")
+        faded_palettes = None
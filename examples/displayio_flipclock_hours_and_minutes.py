@@ -17,9 +17,12 @@ from adafruit_displayio_flipclock.flip_clock import FlipClock
 
 #  == Configuration Variables ==
 
-# seconds per animation frame
+# seconds per animation frame, replaced by the calibration below
 ANIMATION_DELAY = 0.02
 
+# seconds that each flip should take on any board and display
+FLIP_DURATION = 0.4
+
 # number of frames in the animation
 ANIMATION_FRAME_COUNT = 10
 
@@ -90,6 +93,9 @@ main_group.append(clock)
 # show the group on the display
 board.DISPLAY.show(main_group)
 
+# time the frames on this board and pick the frame delay and stride to match
+print(clock.calibrate(display, FLIP_DURATION))
+
 # variables to store hours and minutes values
 cur_hour = clock.first_pair
 cur_minute = clock.second_pair
@@ -0,0 +1,90 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+An example that shows how to use the layout option of the FlipClock
+to show hours, minutes and seconds.
+
+Only the digits that change flip, and all of them share one frame loop,
+so the seconds don't make the minute and hour changes any slower.
+Note that it doesn't know the current time, it counts from 00:00:00.
+"""
+import time
+import board
+from displayio import Group
+from adafruit_displayio_flipclock.asset_registry import AssetRegistry
+from adafruit_displayio_flipclock.flip_clock import FlipClock
+
+#  == Configuration Variables ==
+
+# seconds per animation frame
+ANIMATION_DELAY = 0.02
+
+# number of frames in the animation
+ANIMATION_FRAME_COUNT = 10
+
+# color indexes that will be made transparent in the palette
+TRANSPARENT_INDEXES = range(11)
+
+# Brightness modifier for top half during animation
+BRIGHTER_LEVEL = 0.99
+
+# Brightness modifier for bottom half in the shadow during animation
+DARKER_LEVEL = 0.5
+
+# Brightness modifier to use by default for static sprites
+MEDIUM_LEVEL = 0.9
+
+# == END configuration variables ==
+
+# access built-in display
+display = board.DISPLAY
+
+# load the sprite sheets once, other widgets asking for "grey" share them.
+# The size of the sprite tiles is taken from the static sheet.
+assets = AssetRegistry()
+assets.register(
+    "grey",
+    "static_sheet.bmp",
+    "grey_top_animation_sheet.bmp",
+    "grey_bottom_animation_sheet.bmp",
+    top_transparent_indexes=TRANSPARENT_INDEXES,
+    bottom_transparent_indexes=TRANSPARENT_INDEXES,
+)
+sprites = assets.get("grey")
+
+# initialize FlipClock widget object with three groups of digits
+clock = FlipClock(
+    *sprites.sheets,
+    sprites.tile_width,
+    sprites.tile_height,
+    anim_delay=ANIMATION_DELAY,
+    brighter_level=BRIGHTER_LEVEL,
+    darker_level=DARKER_LEVEL,
+    medium_level=MEDIUM_LEVEL,
+    layout="HH:MM:SS",
+)
+
+# position it in the center of the display
+clock.anchor_point = (0.5, 0.5)
+clock.anchored_position = (display.width // 2, display.height // 2)
+
+# group to hold our flip clock
+main_group = Group()
+
+# append the clock to the group
+main_group.append(clock)
+
+# show the group on the display
+board.DISPLAY.show(main_group)
+
+start_time = time.monotonic()
+while True:
+    # seconds counted since the start
+    elapsed = int(time.monotonic() - start_time)
+    minutes, seconds = divmod(elapsed, 60)
+    hours, minutes = divmod(minutes, 60)
+
+    # flip the digits that changed
+    clock.set_time(hours % 24, minutes, seconds)
+    time.sleep(0.05)
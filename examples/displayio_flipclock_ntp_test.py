@@ -9,6 +9,7 @@ to show and update the current time with a FlipClock on a display.
 
 import time
 import board
+import rtc
 import socketpool
 import wifi
 from displayio import Group
@@ -73,12 +74,36 @@ main_group = Group()
 main_group.append(clock)
 board.DISPLAY.show(main_group)
 
+
+def second_edge():
+    """
+    Wait for the seconds of the real time clock to tick over.
+
+    :return: Tuple of the new time and the time.monotonic_ns() value it began at
+    """
+    start_sec = time.localtime().tm_sec
+    while True:
+        new_time = time.localtime()
+        if new_time.tm_sec != start_sec:
+            return new_time, time.monotonic_ns()
+
+
 while True:
     try:
-        cur_time = ntp.datetime
-        clock.first_pair = str(cur_time.tm_hour)
-        clock.second_pair = str(cur_time.tm_min)
+        # set the real time clock from NTP, its seconds tick over in step with NTP
+        rtc.RTC().datetime = ntp.datetime
+        # the whole seconds of the time only tell where in the second it is
+        # to within a second, so anchor to the moment the seconds change
+        cur_time, second_start = second_edge()
+        clock.set_time(cur_time.tm_hour, cur_time.tm_min)
+
+        # the time.monotonic_ns() value at which the next minute starts
+        next_minute_start = second_start + (60 - cur_time.tm_sec) * 1_000_000_000
+        next_minute = (cur_time.tm_min + 1) % 60
+        next_hour = (cur_time.tm_hour + (next_minute == 0)) % 24
+
+        # sleeps until the flip is due and lands it right on the minute
+        clock.schedule_time(next_hour, next_minute, at=next_minute_start)
     except (OSError, ValueError):
         # no problem, try again next time.
-        pass
-    time.sleep(10)
+        time.sleep(10)
@@ -145,6 +145,7 @@ def make_clock():
                     (static_ss.height // 4) // 2,
                     anim_frame_count=5,
                     anim_delay=0.02,
+                    flip_duration=0.2,  # frames are skipped if the display can't keep up
                     colon_color=0x00FF00,
                     dynamic_fading=use_dynamic_fading,
                     brighter_level=0.99,
@@ -154,7 +155,7 @@ def make_clock():
                     v_pos=54)
             main_group = Group()
             main_group.append(clock)
-            main_group.scale = 2  # don't go higher than 2. Then the 'flipping' will be very slow
+            main_group.scale = 2  # flip_duration keeps the flip time fixed at higher scales
             board.DISPLAY.show(main_group)
         except MemoryError as e:
             #print("setup(): Error: ", e)
@@ -263,24 +264,13 @@ def upd_tm():
         if my_debug:
             print(TAG+"default_dt[{}]={:02d} , default_dt[{}]={:02d}".format(tm_hour, default_dt[tm_hour], tm_min, default_dt[tm_min]))
         if use_flipclock:
-            wait = 1
             try:
-                fp = "{:02d}".format(default_dt[tm_hour])
                 if my_debug:
-                    print(TAG+"setting clock.first_pair:", fp)
-                clock.first_pair = fp
+                    print(TAG+"setting clock pairs:", hh, mm)
+                # all changed digits flip together, no strings are built
+                clock.set_time(hh, mm)
                 fp2 = clock.first_pair
-                time.sleep(wait)
-                if my_debug:
-                    print(TAG+"clock.first_pair=", fp2)
-                sp = "{:02d}".format(default_dt[tm_min])
-                if my_debug:
-                    print(TAG+"setting clock.second_pair:", sp)
-                clock.second_pair = sp
-                sp2  = clock.second_pair
-                time.sleep(wait)
-                if my_debug:
-                    print(TAG+"clock.second_pair=", sp2)
+                sp2 = clock.second_pair
                 print(TAG+"Time = {}:{}".format(fp2, sp2))
             except ValueError as e:
                 print(TAG)
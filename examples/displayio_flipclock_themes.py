@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+An example that changes the colors of a FlipClock at runtime without
+rebuilding it. The colors are written into the existing palettes, so the
+free memory stays the same no matter how often the theme changes.
+"""
+import gc
+import time
+import board
+from displayio import Group
+import adafruit_imageload
+from adafruit_displayio_flipclock.flip_clock import FlipClock
+
+#  == Configuration Variables ==
+
+# seconds per animation frame
+ANIMATION_DELAY = 0.01
+
+# color indexes that will be made transparent in the palette
+TRANSPARENT_INDEXES = range(11)
+
+# color multipliers (red, green, blue) for each theme, out of 256
+THEMES = ((256, 256, 256), (256, 160, 40), (60, 200, 256))
+
+# seconds to show each theme for
+THEME_TIME = 10
+
+# == END configuration variables ==
+
+# access built-in display
+display = board.DISPLAY
+
+# load the static sprite sheet
+static_spritesheet, static_palette = adafruit_imageload.load("static_sheet.bmp")
+static_palette.make_transparent(0)
+
+# load the animation sprite sheets
+top_animation_spritesheet, top_animation_palette = adafruit_imageload.load(
+    "grey_top_animation_sheet.bmp"
+)
+bottom_animation_spritesheet, bottom_animation_palette = adafruit_imageload.load(
+    "grey_bottom_animation_sheet.bmp"
+)
+
+# set the transparent color indexes in respective palettes
+for i in TRANSPARENT_INDEXES:
+    top_animation_palette.make_transparent(i)
+    bottom_animation_palette.make_transparent(i)
+
+# calculate sprite size by dividing total sheet
+SPRITE_WIDTH = static_spritesheet.width // 3
+SPRITE_HEIGHT = (static_spritesheet.height // 4) // 2
+
+# initialize FlipClock widget object
+clock = FlipClock(
+    static_spritesheet,
+    static_palette,
+    top_animation_spritesheet,
+    top_animation_palette,
+    bottom_animation_spritesheet,
+    bottom_animation_palette,
+    SPRITE_WIDTH,
+    SPRITE_HEIGHT,
+    anim_delay=ANIMATION_DELAY,
+    dynamic_fading=True,
+)
+
+# keep the original colors to tint for each theme
+original_colors = tuple(
+    tuple(palette[index] for index in range(len(palette)))
+    for palette in (static_palette, top_animation_palette, bottom_animation_palette)
+)
+
+
+def tint(colors, multipliers):
+    """Scale each channel of the colors by the theme multipliers."""
+    red, green, blue = multipliers
+    return [
+        min(255, (color >> 16 & 0xFF) * red >> 8) << 16
+        | min(255, (color >> 8 & 0xFF) * green >> 8) << 8
+        | min(255, (color & 0xFF) * blue >> 8)
+        for color in colors
+    ]
+
+
+# position it in the center of the display
+clock.anchor_point = (0.5, 0.5)
+clock.anchored_position = (display.width // 2, display.height // 2)
+
+# group to hold our flip clock
+main_group = Group()
+
+# append the clock to the group
+main_group.append(clock)
+
+# show the group on the display
+board.DISPLAY.show(main_group)
+
+theme_index = 0
+theme_start = time.monotonic()
+value = 0
+while True:
+    # count up in the second pair
+    value = (value + 1) % 100
+    clock.set_time(theme_index, value)
+
+    # time for the next theme
+    if time.monotonic() - theme_start >= THEME_TIME:
+        theme_index = (theme_index + 1) % len(THEMES)
+        clock.set_colors(
+            *(tint(colors, THEMES[theme_index]) for colors in original_colors),
+            colon_color=tint((0xFFFFFF,), THEMES[theme_index])[0],
+        )
+        theme_start = time.monotonic()
+        gc.collect()
+        free_memory = gc.mem_free()  # pylint: disable=no-member
+        print(f"theme {theme_index} free memory: {free_memory}")
+
+    time.sleep(0.5)
@@ -7,6 +7,7 @@ Command line script to generate flip clock spritesheet Bitmap image files.
 
 """
 
+import json
 import math
 
 from typing import Tuple, List
@@ -22,6 +23,15 @@ TILE_COLOR = (90, 90, 90)
 FONT_COLOR = (255, 255, 255)
 PADDING_SIZE = 8
 TRANSPARENCY_COLOR = (0, 255, 0)
+STATIC_COLUMNS, STATIC_ROWS = (3, 4)
+SPRITE_ATLAS_FILE = "sprite_atlas.json"
+COLON_SHEET_FILE = "colon_sheet.bmp"
+# separator size used by FlipClock
+COLON_SPACE, COLON_RADIUS = (12, 4)
+# default brightness levels of FlipDigit dynamic fading
+BRIGHTER_LEVEL = 0.85
+DARKER_LEVEL = 0.6
+MEDIUM_LEVEL = 0.8
 
 # pylint: disable=too-many-arguments, too-many-locals
 
@@ -259,7 +269,9 @@ def make_static_sheet(
 
     """
     full_sheet_img = Image.new(
-        "RGBA", (width * 3, height * 4), color=transparency_color
+        "RGBA",
+        (width * STATIC_COLUMNS, height * STATIC_ROWS),
+        color=transparency_color,
     )
 
     for i in range(10):
@@ -274,7 +286,7 @@ def make_static_sheet(
             tile_color=tile_color,
         )
         # img.save(f'char_sprites/pil_text_{i}.png')
-        coords = (((i % 3) * width), ((i // 3) * height))
+        coords = (((i % STATIC_COLUMNS) * width), ((i // STATIC_COLUMNS) * height))
         # print(coords)
         full_sheet_img.paste(img, coords)
 
@@ -286,6 +298,37 @@ def make_static_sheet(
     full_sheet_img.save("static_sheet.bmp")
 
 
+def make_colon_sheet(height: int = TILE_HEIGHT) -> None:
+    """
+    Generate the 1 bit spritesheet that FlipClock draws its separators with.
+    Tile 0 is a colon and tile 1 a dot, each ``COLON_SPACE`` wide. The dots
+    are index 0 and the background index 1, FlipClock colors them with its
+    colon palette. Outputs the sprite sheet file as "colon_sheet.bmp"
+
+    :param int height: The height in pixels of a full static digit
+    """
+    sheet_img = Image.new("1", (COLON_SPACE * 2, height), color=1)
+    draw = ImageDraw.Draw(sheet_img)
+
+    top_dot_y = height // 2 * 2 // 3
+    center_x = COLON_SPACE // 2
+    # the colon has both dots, the dot only the bottom one
+    for tile, dot_ys in ((0, (top_dot_y, top_dot_y * 2)), (1, (top_dot_y * 2,))):
+        for dot_y in dot_ys:
+            dot_x = tile * COLON_SPACE + center_x
+            draw.ellipse(
+                (
+                    dot_x - COLON_RADIUS,
+                    dot_y - COLON_RADIUS,
+                    dot_x + COLON_RADIUS,
+                    dot_y + COLON_RADIUS,
+                ),
+                fill=0,
+            )
+
+    sheet_img.save(COLON_SHEET_FILE)
+
+
 def pack_images_to_sheet(
     images: List[Image.Image],
     width: int,
@@ -333,7 +376,7 @@ def make_animations_sheets(
     tile_color: Tuple[int, int, int] = TILE_COLOR,
     transparency_color: Tuple[int, int, int] = TRANSPARENCY_COLOR,
     animation_frames: int = 10,
-) -> None:
+) -> int:
     """
     Generate and save the top and bottom animation sprite sheets for the digits 0-9.
     Outputs the two spritesheets as "bottom_animation_sheet.bmp" and "top_animation_sheet.bmp"
@@ -355,6 +398,10 @@ def make_animations_sheets(
       must call make_transparent() with the indexes represented by this color.
       Tuple containing RGB color values 0-255 for each color.
     :param animation_frames: The number of frames to use for the flip animations.
+
+    :returns int: The number of frames actually generated for each digit.
+      It can differ slightly from animation_frames. The sheets also hold one
+      blank sprite after the last frame of digit 9.
     """
     bottom_sprites = []
     top_sprites = []
@@ -384,6 +431,14 @@ def make_animations_sheets(
         bottom_sprites.extend(bottom_angled_sprites)
         top_sprites.extend(top_angled_sprites)
 
+    # a fully transparent sprite after all of the digits, shown
+    # in place of hiding the animation tilegrids
+    blank_sprite = Image.new(
+        "RGBA", top_sprites[0].size, color=(*transparency_color, 0)
+    )
+    bottom_sprites.append(blank_sprite)
+    top_sprites.append(blank_sprite)
+
     bottom_sheet = pack_images_to_sheet(
         images=bottom_sprites,
         width=animation_frames,
@@ -404,6 +459,190 @@ def make_animations_sheets(
     top_sheet = top_sheet.convert(mode="P", palette=Palette.WEB)
     top_sheet.save("top_animation_sheet.bmp")
 
+    return len(top_angled_sprites)
+
+
+def transparent_indexes(
+    filename: str,
+    text_color: Tuple[int, int, int] = FONT_COLOR,
+    tile_color: Tuple[int, int, int] = TILE_COLOR,
+    transparency_color: Tuple[int, int, int] = TRANSPARENCY_COLOR,
+) -> List[int]:
+    """
+    Find the palette indexes of a saved sheet that should be made transparent.
+    Resampling the animation frames blends the transparency color into the
+    edges, so every used palette color that is closer to the transparency color
+    than to the text and tile colors is included.
+
+    :param str filename: The BMP file to check. The file is read back because the
+      palette order can change when it is saved.
+    :param tuple text_color: The color of the digit text in each tile.
+      Tuple containing RGB color values 0-255 for each color.
+    :param tuple tile_color: The color of the tile the digit is on.
+      Tuple containing RGB color values 0-255 for each color.
+    :param tuple transparency_color: The color used for transparency.
+      Tuple containing RGB color values 0-255 for each color.
+
+    :returns List[int]: The palette indexes to make transparent
+    """
+
+    def distance(first: Tuple[int, int, int], second: Tuple[int, int, int]) -> int:
+        return sum((first[i] - second[i]) ** 2 for i in range(3))
+
+    with Image.open(filename) as img:
+        palette = img.getpalette()
+        used = img.histogram()
+
+    indexes = []
+    for i in range(len(palette) // 3):
+        if not used[i]:
+            continue
+        color = palette[i * 3 : i * 3 + 3]
+        if distance(color, transparency_color) < min(
+            distance(color, text_color), distance(color, tile_color)
+        ):
+            indexes.append(i)
+    return indexes
+
+
+def ramp_levels(
+    start_level: float, end_level: float, frame_count: int, steps: int
+) -> List[float]:
+    """
+    The brightness levels of a shading ramp, computed the same way as
+    ``adafruit_displayio_flipclock.palette_cache.ramp_palettes()`` so that the
+    baked palettes are found under the same levels on the device.
+
+    :param float start_level: Brightness modifier for the first frame
+    :param float end_level: Brightness modifier for the last frame
+    :param int frame_count: The number of animation frames for each digit
+    :param int steps: The number of different levels in the ramp
+
+    :returns List[float]: The levels of the ramp
+    """
+    steps = min(steps, frame_count)
+    levels = []
+    for step in range(steps):
+        level = start_level
+        if steps > 1:
+            level += (end_level - start_level) * step / (steps - 1)
+        levels.append(round(level, 3))
+    return levels
+
+
+def baked_palettes(filename: str, levels: List[float]) -> dict:
+    """
+    Fade the palette of a saved sheet to each of the brightness levels with
+    the same integer math as ``adafruit_displayio_flipclock.palette_fade``.
+
+    :param str filename: The BMP file to read the palette from. The file is read
+      back because the palette order can change when it is saved.
+    :param List[float] levels: The brightness levels to bake
+
+    :returns dict: Lists of 24 bit RGB colors keyed by the level as a string
+    """
+    with Image.open(filename) as img:
+        palette = img.getpalette()
+
+    palettes = {}
+    for level in levels:
+        scale = int(level * 256)
+        palettes[str(level)] = [
+            (palette[i] * scale >> 8) << 16
+            | (palette[i + 1] * scale >> 8) << 8
+            | palette[i + 2] * scale >> 8
+            for i in range(0, len(palette), 3)
+        ]
+    return palettes
+
+
+def write_sprite_atlas(
+    frame_count: int,
+    width: int = TILE_WIDTH,
+    height: int = TILE_HEIGHT,
+    text_color: Tuple[int, int, int] = FONT_COLOR,
+    tile_color: Tuple[int, int, int] = TILE_COLOR,
+    transparency_color: Tuple[int, int, int] = TRANSPARENCY_COLOR,
+    brighter_level: float = BRIGHTER_LEVEL,
+    darker_level: float = DARKER_LEVEL,
+    medium_level: float = MEDIUM_LEVEL,
+    shading_steps: int = 0,
+) -> None:
+    """
+    Write the sprite atlas descriptor for the generated sheets as
+    "sprite_atlas.json". It is loaded on the device with
+    ``adafruit_displayio_flipclock.sprite_atlas.SpriteAtlas.from_file()``.
+
+    The faded palettes that dynamic fading uses are baked into it, so the
+    device can load them instead of computing them.
+
+    :param int frame_count: The number of animation frames for each digit
+    :param int width: The width in pixels of each tile
+    :param int height: The height in pixels of each full static digit
+    :param tuple text_color: The color of the digit text in each tile.
+      Tuple containing RGB color values 0-255 for each color.
+    :param tuple tile_color: The color of the tile the digit is on.
+      Tuple containing RGB color values 0-255 for each color.
+    :param tuple transparency_color: The color used for transparency.
+      Tuple containing RGB color values 0-255 for each color.
+    :param float brighter_level: Brightness of the bottom half animation
+    :param float darker_level: Brightness of the top half animation and
+      the shadowed bottom static half
+    :param float medium_level: Brightness of the static digits
+    :param int shading_steps: Number of levels in the shading ramps to bake,
+      0 for none. Must match ``shading_steps`` used on the device.
+    """
+    files = {
+        "static": "static_sheet.bmp",
+        "top": "top_animation_sheet.bmp",
+        "bottom": "bottom_animation_sheet.bmp",
+    }
+    with Image.open(files["top"]) as anim_sheet:
+        anim_size = anim_sheet.size
+
+    atlas = {
+        "tile_width": width,
+        "tile_height": height // 2,
+        "anim_frame_count": frame_count,
+        # animation sprites are packed one after another
+        "digit_frame_offsets": [digit * frame_count for digit in range(10)],
+        "blank_tile": frame_count * 10,
+        "static": {"columns": STATIC_COLUMNS, "rows": STATIC_ROWS},
+        "anim": {
+            "columns": anim_size[0] // width,
+            "rows": anim_size[1] // (height // 2),
+        },
+        "top": {},
+        "bottom": {},
+        "files": files,
+    }
+    # brightness levels that FlipDigit fades each sheet to
+    levels = {
+        "static": [medium_level, darker_level],
+        "top": [darker_level],
+        "bottom": [brighter_level],
+    }
+    if shading_steps:
+        levels["top"] += ramp_levels(
+            medium_level, darker_level, frame_count, shading_steps
+        )
+        levels["bottom"] += ramp_levels(
+            darker_level, brighter_level, frame_count, shading_steps
+        )
+
+    # each sheet has its own palette order
+    for sheet, filename in files.items():
+        atlas[sheet]["transparent_indexes"] = transparent_indexes(
+            filename, text_color, tile_color, transparency_color
+        )
+        atlas[sheet]["palettes"] = baked_palettes(filename, sorted(set(levels[sheet])))
+
+    # separator sprites, colored on the device
+    files["colon"] = COLON_SHEET_FILE
+
+    with open(SPRITE_ATLAS_FILE, "w") as atlas_file:
+        json.dump(atlas, atlas_file)
+
 
 def main(
     width: int = TILE_WIDTH,
@@ -415,6 +654,10 @@ def main(
     font: str = DEFAULT_FONT,
     font_size: int = DEFAULT_FONT_SIZE,
     animation_frames: int = 10,
+    brighter_level: float = BRIGHTER_LEVEL,
+    darker_level: float = DARKER_LEVEL,
+    medium_level: float = MEDIUM_LEVEL,
+    shading_steps: int = 0,
 ) -> None:
     make_static_sheet(
         font_size=font_size,
@@ -427,7 +670,7 @@ def main(
         transparency_color=transparent_color,
     )
 
-    make_animations_sheets(
+    frame_count = make_animations_sheets(
         font_size=font_size,
         font=font,
         padding=padding,
@@ -439,6 +682,21 @@ def main(
         animation_frames=animation_frames,
     )
 
+    make_colon_sheet(height=height)
+
+    write_sprite_atlas(
+        frame_count,
+        width=width,
+        height=height,
+        text_color=text_color,
+        tile_color=tile_color,
+        transparency_color=transparent_color,
+        brighter_level=brighter_level,
+        darker_level=darker_level,
+        medium_level=medium_level,
+        shading_steps=shading_steps,
+    )
+
 
 if __name__ == "__main__":
     typer.run(main)
@@ -0,0 +1,179 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+"""
+Test setup. The widgets need ``displayio`` and ``adafruit_displayio_layout``,
+which are only available on CircuitPython boards or with Blinka. When they can't
+be imported, small stand-ins that keep the tiles, colors and positions in lists
+are installed instead, so the tests can run on a plain CPython.
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self._values = [0] * (width * height)
+
+    def _index(self, key):
+        if isinstance(key, tuple):
+            return key[1] * self.width + key[0]
+        return key
+
+    def __getitem__(self, key):
+        return self._values[self._index(key)]
+
+    def __setitem__(self, key, value):
+        self._values[self._index(key)] = value
+
+    def fill(self, value):
+        self._values = [value] * len(self._values)
+
+
+class Palette:
+    def __init__(self, color_count):
+        self._colors = [0] * color_count
+        self._transparent = [False] * color_count
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, color):
+        self._colors[index] = color
+
+    def make_transparent(self, index):
+        self._transparent[index] = True
+
+    def make_opaque(self, index):
+        self._transparent[index] = False
+
+    def is_transparent(self, index):
+        return self._transparent[index]
+
+
+class Group(list):
+    def __init__(self, x=0, y=0, scale=1):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.scale = scale
+        self.hidden = False
+
+
+class TileGrid:
+    # pylint: disable=too-many-instance-attributes, too-many-arguments
+    def __init__(
+        self,
+        bitmap,
+        pixel_shader=None,
+        width=1,
+        height=1,
+        tile_width=None,
+        tile_height=None,
+        default_tile=0,
+        x=0,
+        y=0,
+    ):
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width or bitmap.width
+        self.tile_height = tile_height or bitmap.height
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self._tiles = [default_tile] * (width * height)
+
+    def _index(self, key):
+        if isinstance(key, tuple):
+            return key[1] * self.width + key[0]
+        return key
+
+    def __getitem__(self, key):
+        return self._tiles[self._index(key)]
+
+    def __setitem__(self, key, tile):
+        tile_count = (self.bitmap.width // self.tile_width) * (
+            self.bitmap.height // self.tile_height
+        )
+        if not 0 <= tile < tile_count:
+            raise ValueError(f"Tile index {tile} out of range")
+        self._tiles[self._index(key)] = tile
+
+
+class Widget(Group):
+    def __init__(self, width=None, height=None, **kwargs):
+        super().__init__(**kwargs)
+        self.width = width
+        self.height = height
+
+
+def _install_stubs():
+    try:
+        # pylint: disable=import-outside-toplevel, unused-import
+        import displayio
+        import adafruit_displayio_layout.widgets.widget
+    except ImportError:
+        pass
+    else:
+        return
+
+    displayio = types.ModuleType("displayio")
+    displayio.Bitmap = Bitmap
+    displayio.Palette = Palette
+    displayio.Group = Group
+    displayio.TileGrid = TileGrid
+    sys.modules["displayio"] = displayio
+
+    layout = types.ModuleType("adafruit_displayio_layout")
+    widgets = types.ModuleType("adafruit_displayio_layout.widgets")
+    widget = types.ModuleType("adafruit_displayio_layout.widgets.widget")
+    widget.Widget = Widget
+    layout.widgets = widgets
+    widgets.widget = widget
+    sys.modules["adafruit_displayio_layout"] = layout
+    sys.modules["adafruit_displayio_layout.widgets"] = widgets
+    sys.modules["adafruit_displayio_layout.widgets.widget"] = widget
+
+
+_install_stubs()
+
+
+def make_sheet(width, height):
+    """
+    A spritesheet and a grey ramp palette with index 0 transparent.
+    """
+    # pylint: disable=import-outside-toplevel
+    from displayio import Bitmap as SheetBitmap, Palette as SheetPalette
+
+    palette = SheetPalette(256)
+    for index in range(256):
+        palette[index] = index << 16 | index << 8 | index
+    palette.make_transparent(0)
+    return SheetBitmap(width, height, 256), palette
+
+
+@pytest.fixture
+def sheets():
+    """
+    Spritesheets with 48x50 tiles and 10 animation frames per digit, in the
+    argument order of `FlipDigit` and `FlipClock`.
+    """
+    return (
+        *make_sheet(48 * 3, 50 * 2 * 4),
+        *make_sheet(48 * 10, 50 * 10),
+        *make_sheet(48 * 10, 50 * 10),
+    )
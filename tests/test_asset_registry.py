@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+from conftest import make_sheet
+
+from adafruit_displayio_flipclock.asset_registry import AssetRegistry
+
+
+class Loader:
+    """
+    Loads every file as a small sheet and counts the loads.
+    """
+
+    def __init__(self):
+        self.loads = []
+
+    def __call__(self, filename):
+        self.loads.append(filename)
+        if filename.startswith("static"):
+            return make_sheet(48 * 3, 50 * 2 * 4)
+        return make_sheet(48 * 10, 50 * 10)
+
+
+def make_registry(memory_budget=None, names=("a", "b", "c")):
+    loader = Loader()
+    registry = AssetRegistry(memory_budget=memory_budget, loader=loader)
+    for name in names:
+        registry.register(
+            name, f"static_{name}.bmp", f"top_{name}.bmp", f"bottom_{name}.bmp"
+        )
+    return registry, loader
+
+
+def set_size():
+    registry, _ = make_registry()
+    return registry.get("a").size
+
+
+def test_sets_are_shared():
+    registry, loader = make_registry()
+    first = registry.get("a")
+    assert registry.get("a") is first
+    assert len(loader.loads) == 3
+    assert first.users == 2
+
+
+def test_tile_size_from_sheet():
+    registry, _ = make_registry()
+    sprite_set = registry.get("a")
+    assert (sprite_set.tile_width, sprite_set.tile_height) == (48, 50)
+
+
+def test_transparent_indexes():
+    registry, _ = make_registry(names=())
+    registry.register(
+        "a", "static.bmp", "top.bmp", "bottom.bmp", static_transparent_indexes=(0, 5)
+    )
+    sprite_set = registry.get("a")
+    assert sprite_set.static_spritesheet_palette.is_transparent(5)
+    assert not sprite_set.top_anim_palette.is_transparent(5)
+
+
+def test_unknown_set():
+    registry, _ = make_registry()
+    with pytest.raises(ValueError):
+        registry.get("d")
+
+
+def test_budget_evicts_lru():
+    registry, loader = make_registry(memory_budget=set_size() * 2)
+    registry.release(registry.get("a"))
+    registry.release(registry.get("b"))
+    # "a" is used again, so "b" is the least recently used
+    registry.release(registry.get("a"))
+    registry.release(registry.get("c"))
+
+    assert registry.loaded("a")
+    assert not registry.loaded("b")
+    assert registry.loaded("c")
+    assert registry.memory_used <= registry.memory_budget
+    assert len(loader.loads) == 9
+
+
+def test_budget_keeps_sets_in_use():
+    registry, _ = make_registry(memory_budget=set_size())
+    registry.get("a")
+    registry.get("b")
+    assert registry.loaded("a")
+    assert registry.loaded("b")
+    assert registry.memory_used > registry.memory_budget
+
+    registry.release("a")
+    assert not registry.loaded("a")
+    assert registry.loaded("b")
+
+
+def test_clear_keeps_sets_in_use():
+    registry, _ = make_registry()
+    registry.get("a")
+    registry.release(registry.get("b"))
+    registry.clear()
+    assert registry.loaded("a")
+    assert not registry.loaded("b")
@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from adafruit_displayio_flipclock.clock_layout import (
+    group_digits,
+    parse_layout,
+    validate_values,
+)
+
+
+def test_parse_layout():
+    assert parse_layout("HH:MM") == ((2, 2), ((2, ":"),))
+    assert parse_layout("HH:MM:SS") == ((2, 2, 2), ((2, ":"), (4, ":")))
+    assert parse_layout("DD.MM HH:MM") == (
+        (2, 2, 2, 2),
+        ((2, "."), (4, " "), (6, ":")),
+    )
+
+
+def test_parse_layout_separators():
+    assert parse_layout(":H") == ((1,), ((0, ":"),))
+    assert parse_layout("H::H") == ((1, 1), ((1, ":"), (1, ":")))
+
+
+@pytest.mark.parametrize("layout", ["", ":", ": .", "::"])
+def test_parse_layout_needs_a_digit(layout):
+    with pytest.raises(ValueError):
+        parse_layout(layout)
+
+
+def test_validate_values():
+    validate_values((0, 99), (100, 100))
+    validate_values((99, 0, 59), (100, 100, 100))
+
+
+@pytest.mark.parametrize(
+    "values",
+    [(1,), (1, 2, 3), (100, 0), (-1, 0), (1.0, 0), ("12", 0), (None, 0)],
+)
+def test_validate_values_errors(values):
+    with pytest.raises(ValueError):
+        validate_values(values, (100, 100))
+
+
+def test_group_digits():
+    assert group_digits(7, 2, 100) == [0, 7]
+    assert group_digits("7", 2, 100) == [0, 7]
+    assert group_digits("42", 2, 100) == [4, 2]
+
+
+@pytest.mark.parametrize("new_value", [100, -1, "123", "", 4.0])
+def test_group_digits_errors(new_value):
+    with pytest.raises(ValueError):
+        group_digits(new_value, 2, 100)
@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from adafruit_displayio_flipclock.flip_clock import FlipClock
+
+# flip_duration of the clocks in nanoseconds
+FLIP = 1_000_000_000
+
+
+def make_clock(sheets, **kwargs):
+    return FlipClock(*sheets, 48, 50, non_blocking=True, flip_duration=1.0, **kwargs)
+
+
+def play(clock):
+    """
+    Call update() at every frame deadline, returning the time the flips ended.
+    """
+    now = clock.next_frame_time()
+    while clock.update(now):
+        now = clock.next_frame_time()
+    return now
+
+
+class Display:
+    """
+    Records whether the clock was hidden at every refresh.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.auto_refresh = True
+        self.hidden = []
+
+    def refresh(self, target_frames_per_second=None):
+        # pylint: disable=unused-argument
+        self.hidden.append(self.clock.hidden)
+
+
+def test_set_time(sheets):
+    clock = make_clock(sheets)
+    clock.set_time(12, 34, now=0)
+    play(clock)
+    assert clock.values == ("12", "34")
+
+
+def test_set_time_validates(sheets):
+    clock = make_clock(sheets)
+    with pytest.raises(ValueError):
+        clock.set_time(12, 100)
+    with pytest.raises(ValueError):
+        clock.set_time(12)
+
+
+def test_schedule_time_ends_at(sheets):
+    clock = make_clock(sheets)
+    clock.schedule_time(0, 1, at=5 * FLIP)
+    assert clock.next_frame_time() == 4 * FLIP
+    assert play(clock) == 5 * FLIP
+    assert clock.values == ("00", "01")
+
+
+def test_schedule_time_pool(sheets):
+    clock = make_clock(sheets, anim_pool_size=1)
+    # two digits change and flip one after the other
+    clock.schedule_time(0, 11, at=5 * FLIP)
+    assert clock.next_frame_time() == 3 * FLIP
+    assert play(clock) == 5 * FLIP
+    assert clock.values == ("00", "11")
+
+
+def test_schedule_time_adaptive(sheets):
+    clock = make_clock(sheets, adaptive=True)
+    clock.set_time(0, 1, now=0)
+    play(clock)
+    # a value every 500ms plans flips of 400ms
+    clock.set_time(0, 2, now=500_000_000)
+    play(clock)
+    clock.schedule_time(0, 3, at=1_400_000_000)
+    assert clock.next_frame_time() == FLIP
+    assert play(clock) == 1_400_000_000
+    assert clock.values == ("00", "03")
+
+
+def test_calibrate_hides_the_flips(sheets):
+    clock = make_clock(sheets)
+    clock.set_time(12, 34, now=0)
+    play(clock)
+    display = Display(clock)
+
+    calibration = clock.calibrate(display, 1.0)
+    assert display.hidden[:-2] == [True] * (len(display.hidden) - 2)
+    assert display.hidden[-2:] == [False, False]
+    assert not clock.hidden
+    assert clock.values == ("12", "34")
+    assert calibration["flip_duration"] == 1.0
+    assert display.auto_refresh
+
+
+def test_calibrate_show_flips(sheets):
+    clock = make_clock(sheets)
+    display = Display(clock)
+    clock.calibrate(display, 1.0, show_flips=True)
+    # one refresh per frame and the final one
+    assert display.hidden == [False] * 21
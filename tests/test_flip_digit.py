@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+# pylint: disable=protected-access
+
+import pytest
+
+from adafruit_displayio_flipclock.flip_digit import FlipDigit
+
+# flip_duration of the digits in nanoseconds
+FLIP = 1_000_000_000
+
+
+@pytest.fixture(name="digit")
+def digit_fixture(sheets):
+    return FlipDigit(*sheets, 48, 50, non_blocking=True, flip_duration=1.0)
+
+
+def shows(digit, value):
+    return (
+        digit.top_static_tilegrid[0] == digit._top_static_indexes[value]
+        and digit.bottom_static_tilegrid[0] == digit._bottom_static_indexes[value]
+    )
+
+
+def finish(digit, now):
+    while digit.update(now):
+        now += FLIP
+    return now
+
+
+def test_flip(digit):
+    digit.start_transition(4, now=0)
+    assert digit.animating
+    assert digit.update(FLIP // 2)
+    assert not digit.update(FLIP)
+    assert shows(digit, 4)
+
+
+def test_invalid_value(digit):
+    with pytest.raises(ValueError):
+        digit.start_transition(10, now=0)
+
+
+def test_retarget_top_half(digit):
+    digit.start_transition(1, now=0)
+    digit.update(FLIP // 10)
+    assert digit.top_animating_value == 0
+
+    digit.start_transition(2, now=FLIP // 10)
+    digit.start_transition(3, now=FLIP // 10)
+    # the running flip reveals the newest value and ends on time
+    assert digit.value == 3
+    assert digit.top_static_tilegrid[0] == digit._top_static_indexes[3]
+    assert not digit.update(FLIP)
+    assert shows(digit, 3)
+
+
+def test_retarget_bottom_half(digit):
+    digit.start_transition(1, now=0)
+    digit.update(FLIP * 6 // 10)
+    assert digit.top_animating_value is None
+
+    digit.start_transition(7, now=FLIP * 6 // 10)
+    digit.start_transition(8, now=FLIP * 6 // 10)
+    assert digit.value == 8
+
+    # the running flip lands on its value and one flip to the newest follows
+    assert digit.update(FLIP)
+    assert digit.bottom_static_tilegrid[0] == digit._bottom_static_indexes[1]
+    assert digit.animating
+    finish(digit, FLIP)
+    assert shows(digit, 8)
+
+
+def test_retarget_bottom_same(digit):
+    digit.start_transition(1, now=0)
+    digit.update(FLIP * 6 // 10)
+    digit.start_transition(5, now=FLIP * 6 // 10)
+    digit.start_transition(1, now=FLIP * 6 // 10)
+    assert not digit.update(FLIP)
+    assert shows(digit, 1)
+
+
+def test_retarget_to_start_value(digit):
+    digit.start_transition(9, now=0)
+    digit.update(FLIP // 10)
+    digit.start_transition(0, now=FLIP // 10)
+    # the flip is cancelled right away
+    assert not digit.animating
+    assert digit.value == 0
+    assert shows(digit, 0)
@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+from adafruit_displayio_flipclock.flip_timing import FlipTiming
+from adafruit_displayio_flipclock.frame_adapter import FrameAdapter
+from adafruit_displayio_flipclock.frame_tables import BOUNCE_FRAMES
+
+MS = 1_000_000
+
+
+def test_steps_are_spread_evenly():
+    timing = FlipTiming(10)
+    timing.begin(1000 * MS, 1000 * MS)
+    assert timing.step_count == 20
+    assert timing.due_step(1000 * MS) == 0
+    assert timing.due_step(1075 * MS) == 1
+    assert timing.due_step(1999 * MS) == 19
+    assert timing.due_step(2000 * MS) is None
+
+
+def test_late_updates_skip_steps():
+    timing = FlipTiming(10)
+    timing.begin(0, 1000 * MS)
+    timing.next_step = 1
+    assert timing.due_step(500 * MS) == 10
+    assert timing.next_frame_time() == 50 * MS
+
+
+def test_frame_stride():
+    timing = FlipTiming(10)
+    timing.begin(0, 1000 * MS, frame_stride=3)
+    assert timing.step_count == 8
+    frames = [timing.step_frame(step) for step in range(timing.step_count)]
+    assert frames == [2, 5, 8, 9, 12, 15, 18, 19]
+
+
+def test_frame_adapter_plan():
+    adapter = FrameAdapter()
+    adapter.note_update(0)
+    adapter.note_update(200 * MS)
+    adapter.note_frame(45 * MS)
+    timing = FlipTiming(10)
+    timing.begin(200 * MS, 1000 * MS, frame_adapter=adapter)
+    assert (timing.frame_stride, timing.duration) == (10, 160 * MS)
+
+
+def test_replan_keeps_frames():
+    adapter = FrameAdapter()
+    timing = FlipTiming(10)
+    timing.begin(0, 1000 * MS, frame_adapter=adapter)
+    timing.next_step = 5
+
+    adapter.note_update(0)
+    adapter.note_update(500 * MS)
+    timing.replan(500 * MS, 1000 * MS, frame_adapter=adapter)
+    assert timing.duration == 400 * MS
+    assert timing.step_frame(timing.next_step) == 5
+    assert timing.next_frame_time() == 500 * MS
+    # the rest of the flip takes the same share of the new duration
+    assert timing.start + timing.duration == 500 * MS + 300 * MS
+
+
+def test_bounce():
+    timing = FlipTiming(10, "bounce")
+    timing.begin(0, 1000 * MS)
+    assert timing.step_count == 20 + len(BOUNCE_FRAMES)
+    frames = [timing.step_frame(step) for step in range(timing.step_count)]
+    assert frames[:20] == list(range(20))
+    assert frames[20:] == [19 - frame for frame in BOUNCE_FRAMES]
+    # the bounce takes the end of the flip
+    assert timing.due_step(790 * MS) < 20 <= timing.due_step(810 * MS)
+
+
+def test_easing_list():
+    timing = FlipTiming(2, [1, 1, 2, 4])
+    timing.begin(0, 800 * MS)
+    assert [timing.due_step(now * MS) for now in (0, 100, 200, 399, 400)] == [
+        0,
+        1,
+        2,
+        2,
+        3,
+    ]
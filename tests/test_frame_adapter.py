@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+from adafruit_displayio_flipclock.flip_digit import FlipDigit
+from adafruit_displayio_flipclock.frame_adapter import FrameAdapter
+
+MS = 1_000_000
+
+
+def updates(adapter, interval, start=0, count=8):
+    """
+    Note updates at a steady interval, returning the time of the last one.
+    """
+    for update in range(count):
+        adapter.note_update(start + update * interval)
+    return start + (count - 1) * interval
+
+
+def test_plan_without_measurements():
+    adapter = FrameAdapter()
+    assert adapter.plan(10, 1000 * MS) == (1, 1000 * MS)
+
+
+def test_plan_steps_down():
+    adapter = FrameAdapter()
+    adapter.note_frame(45 * MS)
+    assert adapter.plan(10, 1000 * MS) == (1, 1000 * MS)
+
+    # 20 frames of 45ms don't fit in 80% of 1s, 10 do
+    now = updates(adapter, 1000 * MS)
+    assert adapter.plan(10, 1000 * MS) == (2, 800 * MS)
+
+    # only the last frame of each half fits
+    now = updates(adapter, 200 * MS, now, count=20)
+    stride, duration = adapter.plan(10, 1000 * MS)
+    assert stride == 10
+    # the running average is still coming down from 1s
+    assert 160 * MS <= duration < 170 * MS
+
+    # not even that, swap at once
+    updates(adapter, 50 * MS, now, count=20)
+    assert adapter.plan(10, 1000 * MS) == (10, 0)
+
+
+def test_plan_recovers():
+    adapter = FrameAdapter()
+    adapter.note_frame(45 * MS)
+    now = updates(adapter, 50 * MS)
+    assert adapter.plan(10, 1000 * MS) == (10, 0)
+
+    # the average follows slower updates back up to full flips
+    updates(adapter, 5000 * MS, now + 5000 * MS, count=20)
+    assert adapter.plan(10, 1000 * MS) == (1, 1000 * MS)
+
+
+def test_plan_min_stride():
+    adapter = FrameAdapter(min_stride=3)
+    assert adapter.plan(10, 1000 * MS) == (3, 1000 * MS)
+
+
+def test_same_time_counts_once():
+    adapter = FrameAdapter()
+    adapter.note_update(0)
+    adapter.note_update(0)
+    adapter.note_update(100 * MS)
+    adapter.note_update(100 * MS)
+    assert adapter.update_interval == 100 * MS
+
+
+def test_expected_plan():
+    adapter = FrameAdapter()
+    updates(adapter, 200 * MS, count=2)
+    assert adapter.expected_plan(10, 1000 * MS, 400 * MS) == (1, 160 * MS)
+    assert adapter.update_interval == 200 * MS
+    assert adapter.duration is None
+
+
+def test_reset():
+    adapter = FrameAdapter()
+    adapter.note_frame(45 * MS)
+    updates(adapter, 50 * MS)
+    adapter.reset()
+    assert adapter.plan(10, 1000 * MS) == (1, 1000 * MS)
+
+
+def test_retarget_follows_new_plan(sheets):
+    digit = FlipDigit(
+        *sheets, 48, 50, non_blocking=True, flip_duration=1.0, adaptive=True
+    )
+    digit.frame_adapter.note_frame(10 * MS)
+    digit.start_transition(1, now=0)
+    assert digit.update(100 * MS)
+
+    # values now arrive every 200ms, the rest of the flip is shortened to fit
+    digit.start_transition(2, now=200 * MS)
+    timing = digit._timing  # pylint: disable=protected-access
+    assert timing.duration == 160 * MS
+    assert timing.start + timing.duration < 1000 * MS
+    assert not digit.update(timing.start + timing.duration)
+    assert digit.value == 2
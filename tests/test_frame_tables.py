@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from adafruit_displayio_flipclock.frame_tables import (
+    BOUNCE_FRAMES,
+    SCHEDULE_SHIFT,
+    anim_frame_table,
+    frame_schedule,
+    static_index_table,
+)
+
+
+def test_anim_frame_table_layout():
+    table = anim_frame_table(10, 100)
+    assert len(table) == 100
+    assert table[7 * 10 + 3] == 73
+    assert anim_frame_table(10, 100) is table
+
+
+def test_anim_frame_table_clamps():
+    table = anim_frame_table(10, 95)
+    assert max(table) == 94
+    assert list(table[90:]) == [90, 91, 92, 93, 94, 94, 94, 94, 94, 94]
+
+
+def test_anim_frame_table_offsets():
+    offsets = tuple(range(0, 200, 20))
+    table = anim_frame_table(10, 200, offsets)
+    assert table[3 * 10] == 60
+    assert table[9 * 10 + 9] == 189
+
+
+def test_anim_frame_table_wide():
+    table = anim_frame_table(30, 300)
+    assert table[-1] == 299
+
+
+def test_static_index_table():
+    table = static_index_table({digit: digit * 2 for digit in range(10)})
+    assert list(table) == [digit * 2 for digit in range(10)]
+
+
+@pytest.mark.parametrize("easing", ["linear", "gravity", "ease_out", "ease_in_out"])
+@pytest.mark.parametrize("frame_stride", [1, 2, 3, 10])
+def test_frame_schedule_bounds(easing, frame_stride):
+    schedule = frame_schedule(easing, 10, frame_stride)
+    assert len(schedule) == 2 * len(range(0, 10, frame_stride))
+    assert schedule[0] == 0
+    assert all(step_time < 1 << SCHEDULE_SHIFT for step_time in schedule)
+    assert list(schedule) == sorted(schedule)
+
+
+def test_frame_schedule_times():
+    schedule = frame_schedule([1] * 10 + [3] * 10, 10)
+    assert schedule[10] == 1 << SCHEDULE_SHIFT >> 2
+    assert schedule[-1] < 1 << SCHEDULE_SHIFT
+
+
+def test_frame_schedule_bounce():
+    schedule = frame_schedule("bounce", 10, 2)
+    assert len(schedule) == 2 * 5 + len(BOUNCE_FRAMES)
+    assert list(schedule) == sorted(schedule)
+    assert schedule[-1] < 1 << SCHEDULE_SHIFT
+
+
+@pytest.mark.parametrize("easing", ["bouncy", [1] * 19, [1] * 19 + [-1], [0] * 20])
+def test_frame_schedule_errors(easing):
+    with pytest.raises(ValueError):
+        frame_schedule(easing, 10)
@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+from conftest import make_sheet
+
+from adafruit_displayio_flipclock import palette_cache
+
+
+def setup_function():
+    palette_cache.clear_cache()
+    palette_cache._holders.clear()  # pylint: disable=protected-access
+
+
+def test_faded_palette_is_shared():
+    _, palette = make_sheet(1, 1)
+    faded = palette_cache.faded_palette(palette, 0.5)
+    assert palette_cache.faded_palette(palette, 0.5) is faded
+    assert palette_cache.faded_palette(palette, 0.25) is not faded
+
+
+def test_release_last_holder():
+    _, palette = make_sheet(1, 1)
+    palette_cache.retain_palette(palette)
+    palette_cache.retain_palette(palette)
+    faded = palette_cache.faded_palette(palette, 0.5)
+
+    palette_cache.release_palette(palette)
+    assert palette_cache.faded_palette(palette, 0.5) is faded
+
+    palette_cache.release_palette(palette)
+    assert palette_cache.faded_palette(palette, 0.5) is not faded
+
+
+def test_discard_skips_held():
+    _, palette = make_sheet(1, 1)
+    palette_cache.retain_palette(palette)
+    faded = palette_cache.faded_palette(palette, 0.5)
+
+    palette_cache.discard_palette(palette)
+    assert palette_cache.faded_palette(palette, 0.5) is faded
+
+    palette_cache.release_palette(palette)
+    faded = palette_cache.faded_palette(palette, 0.5)
+    palette_cache.discard_palette(palette)
+    assert palette_cache.faded_palette(palette, 0.5) is not faded
+
+
+def test_release_unheld():
+    _, palette = make_sheet(1, 1)
+    faded = palette_cache.faded_palette(palette, 0.5)
+    palette_cache.release_palette(palette)
+    assert palette_cache.faded_palette(palette, 0.5) is not faded
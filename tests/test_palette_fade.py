@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 Tim Cocks for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+from conftest import make_sheet
+
+from adafruit_displayio_flipclock.palette_fade import fade_color, fade_palette
+
+
+def palette_fader_color(color, level):
+    # each channel scaled in floating point, as PaletteFader did
+    return (
+        int((color >> 16 & 0xFF) * level) << 16
+        | int((color >> 8 & 0xFF) * level) << 8
+        | int((color & 0xFF) * level)
+    )
+
+
+@pytest.mark.parametrize("level", [0.0, 0.25, 0.5, 0.7, 0.9, 0.99, 1.0])
+@pytest.mark.parametrize("color", [0x000000, 0xFFFFFF, 0x123456, 0xFF8000, 0x7F7F7F])
+def test_fade_color(color, level):
+    faded = fade_color(color, level)
+    expected = palette_fader_color(color, level)
+    for shift in (16, 8, 0):
+        assert abs((faded >> shift & 0xFF) - (expected >> shift & 0xFF)) <= 1
+
+
+def test_fade_palette():
+    _, palette = make_sheet(1, 1)
+    faded = fade_palette(palette, 0.5)
+    assert faded.is_transparent(0)
+    assert not faded.is_transparent(1)
+    assert faded[200] == fade_color(palette[200], 0.5)
+
+
+def test_fade_palette_level():
+    _, palette = make_sheet(1, 1)
+    with pytest.raises(ValueError):
+        fade_palette(palette, 1.5)